@@ -0,0 +1,69 @@
+import json
+import argparse
+import tracemalloc
+import polygon.data_fetcher as data_fetcher
+from benchmarks.common import aggregate_results, best_time, report
+from benchmarks.legacy import results_to_frame_per_row
+
+
+def _whole_page(body):
+    """
+    Decodes the whole page body and then converts its bars, as pages were parsed before reading in chunks.
+    """
+    return data_fetcher._results_to_frame(data_fetcher._loads(body)["results"])
+
+
+def _chunked_page(body):
+    """
+    Parses the page body in chunks of AGGREGATES_READ_BYTES, as iter_aggregate_pages reads it.
+    """
+    size = data_fetcher.AGGREGATES_READ_BYTES
+    return data_fetcher._parse_aggregates(body[start:start + size] for start in range(0, len(body), size))
+
+
+def _peak_bytes(function, *args):
+    """
+    Returns the peak memory allocated while the function runs, not counting its arguments.
+    """
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    """
+    Times the parse of Polygon aggregate pages, the previous per-row path against the columnar
+    _results_to_frame, the JSON decode of the page body with json and orjson, and the whole page
+    decoded at once against the page parsed in chunks with the peak memory of each, e.g.:
+    python -m benchmarks.bench_aggregates_parse --bars 1000 100000 1000000
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the parse of Polygon aggregate pages.")
+    parser.add_argument("--bars", type=int, nargs="+", default=[1_000, 100_000, 1_000_000],
+                        help="Page sizes in bars (default is 1,000, 100,000 and 1,000,000)")
+    args = parser.parse_args()
+
+    for bars in args.bars:
+        results = aggregate_results(bars)
+        body = json.dumps({"ticker": "BENCH", "status": "OK", "resultsCount": bars, "results": results}).encode()
+        repeat = 3 if bars <= 100_000 else 1
+
+        print(f"{bars:,} bars, {len(body) / 1e6:.1f} MB page")
+        report("json.loads", bars, best_time(json.loads, body, repeat=repeat))
+        if data_fetcher.orjson is not None:
+            report("orjson.loads", bars, best_time(data_fetcher.orjson.loads, body, repeat=repeat))
+        else:
+            print("orjson.loads                             not installed")
+        report("per-row parse (previous)", bars, best_time(results_to_frame_per_row, results, repeat=repeat))
+        report("_results_to_frame", bars, best_time(data_fetcher._results_to_frame, results, repeat=repeat))
+        report("whole page decode + _results_to_frame", bars, best_time(_whole_page, body, repeat=repeat))
+        report("_parse_aggregates in chunks", bars, best_time(_chunked_page, body, repeat=repeat))
+        print(f"{'peak memory, whole page':<40} {_peak_bytes(_whole_page, body) / 1e6:>10.1f} MB")
+        print(f"{'peak memory, in chunks':<40} {_peak_bytes(_chunked_page, body) / 1e6:>10.1f} MB")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import indicators.kernels as kernels
+from benchmarks.common import random_walk_bars, best_time, report
+from benchmarks.legacy import parabolic_sar_iloc
+
+
+def main():
+    """
+    Times the Parabolic SAR kernel, compiled and in pure Python, against the previous .iloc loop, e.g.:
+    python -m benchmarks.bench_parabolic_sar --bars 1000000
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Parabolic SAR implementations.")
+    parser.add_argument("--bars", type=int, default=1_000_000, help="Bars for the kernels (default is 1,000,000)")
+    parser.add_argument("--legacy-bars", type=int, default=20_000,
+                        help="Bars for the .iloc loop, which takes minutes at 1M bars (default is 20,000)")
+    args = parser.parse_args()
+
+    data = random_walk_bars(args.bars)
+    high, low = data["High"].to_numpy(), data["Low"].to_numpy()
+
+    if kernels._parabolic_sar_compiled is not None:
+        # Compile outside the timing
+        kernels.parabolic_sar(high[:10], low[:10])
+        report("numba kernel", args.bars, best_time(kernels.parabolic_sar, high, low))
+    else:
+        print("numba kernel                             not installed")
+
+    report("pure Python kernel", args.bars,
+           best_time(lambda: kernels._parabolic_sar_loop(high.tolist(), low.tolist(), 0.02, 0.2)))
+
+    legacy = data.iloc[:args.legacy_bars]
+    report(".iloc loop (previous)", len(legacy), best_time(parabolic_sar_iloc, legacy, repeat=1))
+
+
+if __name__ == "__main__":
+    main()
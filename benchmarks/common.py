@@ -0,0 +1,70 @@
+import time
+import numpy as np
+import pandas as pd
+
+
+def random_walk_bars(n, seed=0):
+    """
+    Builds random walk OHLCV bars for benchmarks and tests.
+
+    Parameters:
+    - n (int): Number of bars.
+    - seed (int): Seed of the random generator (default is 0).
+
+    Returns:
+    - pd.DataFrame: Bars with "Open", "High", "Low", "Close" and "Volume" columns, indexed by minute.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    open_ = close + rng.normal(0, 0.05, n)
+    high = np.maximum(open_, close) + rng.random(n) * 0.1
+    low = np.minimum(open_, close) - rng.random(n) * 0.1
+    volume = rng.integers(1_000, 100_000, n).astype(np.float64)
+
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=pd.date_range("2000-01-03 09:30", periods=n, freq="min", name="Date", unit="ns"),
+    )
+
+
+def aggregate_results(n, seed=0):
+    """
+    Builds the "results" list of a Polygon aggregates response with the 8 fields Polygon sends per bar.
+
+    Parameters:
+    - n (int): Number of bars.
+    - seed (int): Seed of the random generator (default is 0).
+
+    Returns:
+    - list of dict: The aggregate bars, one minute apart.
+    """
+    bars = random_walk_bars(n, seed)
+    timestamps = bars.index.values.astype("datetime64[ms]").astype(np.int64)
+
+    return [
+        {"v": v, "vw": round((o + c) / 2, 4), "o": round(o, 4), "c": round(c, 4), "h": round(h, 4),
+         "l": round(l, 4), "t": t, "n": int(v // 10)}
+        for v, o, c, h, l, t in zip(
+            bars["Volume"].tolist(), bars["Open"].tolist(), bars["Close"].tolist(), bars["High"].tolist(),
+            bars["Low"].tolist(), timestamps.tolist(),
+        )
+    ]
+
+
+def best_time(function, *args, repeat=3):
+    """
+    Returns the fastest of several runs of a function in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def report(label, bars, seconds):
+    """
+    Prints one benchmark result with its throughput.
+    """
+    print(f"{label:<40} {bars:>10,} bars {seconds * 1e3:>12.1f} ms {bars / seconds / 1e6:>10.2f} M bars/s")
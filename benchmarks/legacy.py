@@ -0,0 +1,72 @@
+"""
+Frozen copies of implementations that were replaced by faster ones. The benchmarks time them as
+baselines and the tests check the replacements against them. Do not optimize these.
+"""
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+
+def results_to_frame_per_row(results):
+    """
+    The aggregates parse as _results_to_frame did it before the columnar path, building a dict per bar
+    and converting each timestamp in the server's local time.
+    """
+
+    # Parse data and construct DataFrame
+    return pd.DataFrame([{
+        "Date": datetime.fromtimestamp(item["t"] / 1000),  # Convert timestamp to datetime
+        "Open": item.get("o"),
+        "High": item.get("h"),
+        "Low": item.get("l"),
+        "Close": item.get("c"),
+        "Volume": item.get("v")
+    } for item in results]).set_index("Date")
+
+
+def parabolic_sar_iloc(data, initial_af=0.02, max_af=0.2):
+    """
+    The Parabolic SAR as calculate_parabolic_sar computed it before the array kernel,
+    reading and writing the Series with .iloc on every bar.
+    """
+    # Initialize variables
+    sar = pd.Series(np.nan, index=data.index)
+    high, low = data['High'], data['Low']
+    af = initial_af  # acceleration factor
+    ep = low.iloc[0]  # extreme price
+    trend = 1  # 1 for uptrend, -1 for downtrend
+
+    # Set the initial SAR value
+    sar.iloc[0] = low.iloc[0]
+
+    # Iterate through each time period
+    for i in range(1, len(data)):
+        # Calculate SAR based on trend
+        sar.iloc[i] = sar.iloc[i - 1] + af * (ep - sar.iloc[i - 1])
+
+        if trend == 1:  # Uptrend
+            # Check for trend reversal to downtrend
+            if low.iloc[i] < sar.iloc[i]:
+                trend = -1
+                sar.iloc[i] = ep
+                af = initial_af
+                ep = high.iloc[i]
+            else:
+                # Update extreme price and acceleration factor for uptrend
+                if high.iloc[i] > ep:
+                    ep = high.iloc[i]
+                    af = min(af + initial_af, max_af)
+        else:  # Downtrend
+            # Check for trend reversal to uptrend
+            if high.iloc[i] > sar.iloc[i]:
+                trend = 1
+                sar.iloc[i] = ep
+                af = initial_af
+                ep = low.iloc[i]
+            else:
+                # Update extreme price and acceleration factor for downtrend
+                if low.iloc[i] < ep:
+                    ep = low.iloc[i]
+                    af = min(af + initial_af, max_af)
+
+    return sar
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+import indicators.rules as rules
+
+
+# Bars per year for each timespan, used to annualize returns
+BARS_PER_YEAR = {
+    "minute": 252 * 390,
+    "hour": 252 * 7,
+    "day": 252,
+    "week": 52,
+    "month": 12,
+    "quarter": 4,
+    "year": 1,
+}
+
+
+def positions_from_signals(entries, exits):
+    """
+    Turns entry and exit signals into a long-only position without looping over the bars.
+    A position is entered on an entry signal and held until the next exit signal. When both
+    signals occur on the same bar the exit wins.
+
+    Parameters:
+    - entries (np.ndarray): Boolean entry signal per bar.
+    - exits (np.ndarray): Boolean exit signal per bar.
+
+    Returns:
+    - np.ndarray: Position per bar, 1.0 while long and 0.0 while flat, as decided at each bar's close.
+    """
+    entries = np.asarray(entries, dtype=bool)
+    exits = np.asarray(exits, dtype=bool)
+
+    # Mark the bars where a signal sets the position, then carry the last set position forward
+    events = np.where(exits, 0.0, np.where(entries, 1.0, np.nan))
+    return pd.Series(events).ffill().fillna(0.0).to_numpy()
+
+
+def _trade_returns(held, equity):
+    """
+    Returns of each trade, a run of consecutive bars with the position held, including the cost of leaving it.
+    """
+    starts = np.flatnonzero(held & ~np.concatenate(([False], held[:-1])))
+    if len(starts) == 0:
+        return np.empty(0)
+
+    # Each trade runs until the next one starts, bars without a position change the equity only by the exit cost
+    ends = np.concatenate((starts[1:], [len(equity)])) - 1
+    before = np.concatenate(([1.0], equity))[starts]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return equity[ends] / before - 1
+
+
+def run_backtest(data, entry_rule, exit_rule, timespan="day", cost=0.0):
+    """
+    Backtests a long-only strategy that enters when the entry rule holds and exits when the exit rule holds.
+
+    Signals are evaluated on each bar's close and the position takes effect from the next bar, so a signal
+    never trades on the bar whose close produced it.
+
+    Parameters:
+    - data (DataFrame or BarSeries): Stock data with OHLCV columns, e.g., from fetch_stock_data.
+    - entry_rule (str): Rule for entering, e.g., "CROSS_ABOVE(EMA(12), EMA(26))" or "RSI(14) < 30".
+    - exit_rule (str): Rule for exiting, e.g., "CROSS_BELOW(EMA(12), EMA(26))" or "RSI(14) > 70".
+    - timespan (str): Timespan of the bars, used to annualize the return (default is "day").
+    - cost (float): Cost of each entry or exit as a fraction of the position, e.g., 0.001 for 0.1% (default is 0).
+
+    Returns:
+    - dict: Backtest results with keys:
+        - "total_return" (float): Compounded return of the strategy.
+        - "annual_return" (float): Compounded return per year.
+        - "buy_and_hold_return" (float): Return of holding the stock over the same bars.
+        - "max_drawdown" (float): Largest fall of the equity curve from a previous peak, as a negative fraction.
+        - "trades" (int): Number of trades entered.
+        - "win_rate" (float): Fraction of trades with a positive return, NaN without trades.
+        - "exposure" (float): Fraction of bars with the position held.
+        - "equity" (pd.Series): Equity curve starting at 1.0.
+        - "entries", "exits" (pd.Series): Boolean Series of the bars whose close the position was entered and exited at.
+
+    Raises:
+    - ValueError: If there are no bars, or a rule is not valid or cannot be evaluated.
+    """
+    if len(data) == 0:
+        raise ValueError("There are no bars to backtest.")
+
+    index = data.index
+    close = data["Close"].to_numpy(dtype=np.float64)
+
+    # Evaluate both rules on every bar at once
+    entries, _ = rules.evaluate_rule(rules.parse_rule(entry_rule), data)
+    exits, _ = rules.evaluate_rule(rules.parse_rule(exit_rule), data)
+    position = positions_from_signals(entries.to_numpy(), exits.to_numpy())
+
+    # The position decided at a bar's close earns the next bar's return
+    held = np.concatenate(([0.0], position[:-1]))
+    bar_returns = np.zeros(len(close))
+    bar_returns[1:] = close[1:] / close[:-1] - 1
+    bar_returns = np.nan_to_num(bar_returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+    # Pay the cost on every bar where the position changes
+    changes = np.abs(np.diff(np.concatenate(([0.0], held))))
+    strategy_returns = held * bar_returns - changes * cost
+
+    equity = np.cumprod(1 + strategy_returns)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+    trade_returns = _trade_returns(held > 0, equity)
+
+    total_return = equity[-1] - 1
+    years = len(close) / BARS_PER_YEAR.get(timespan, BARS_PER_YEAR["day"])
+    annual_return = (1 + total_return) ** (1 / years) - 1 if years > 0 and total_return > -1 else np.nan
+
+    # Trades are filled at the close of the bar whose signal changed the position
+    signal_changes = np.diff(np.concatenate(([0.0], position)))
+
+    return {
+        "total_return": float(total_return),
+        "annual_return": float(annual_return),
+        "buy_and_hold_return": float(close[-1] / close[0] - 1),
+        "max_drawdown": float(drawdown.min()),
+        "trades": int(len(trade_returns)),
+        "win_rate": float(np.mean(trade_returns > 0)) if len(trade_returns) else np.nan,
+        "exposure": float(held.mean()),
+        "equity": pd.Series(equity, index=index, name="Equity"),
+        "entries": pd.Series(signal_changes > 0, index=index, name="Entries"),
+        "exits": pd.Series(signal_changes < 0, index=index, name="Exits"),
+    }
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+
+# Price and volume columns held by a BarSeries, in storage order
+BAR_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class BarSeries:
+    """
+    Compact OHLCV bar series backed by contiguous NumPy arrays.
+
+    Timestamps are stored as int64 nanoseconds since the epoch and prices and volume as
+    float64 or float32 arrays. Columns are read like a DataFrame (bars["Close"]), returning
+    pandas Series that share memory with the arrays, so the indicator functions accept a
+    BarSeries wherever they accept a DataFrame.
+    """
+
+    __slots__ = ("timestamps", "values", "fingerprint")
+
+    def __init__(self, timestamps, values):
+        """
+        Parameters:
+        - timestamps (np.ndarray): int64 nanoseconds since the epoch, one per bar.
+        - values (np.ndarray): 2-D array of shape (5, bars) holding Open, High, Low, Close and Volume.
+        """
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        self.values = np.ascontiguousarray(values)
+
+        # Fingerprint of the bars, set by the indicator memo cache on first use
+        self.fingerprint = None
+
+        # Bar series are shared between sessions, so their memory must never be modified in place
+        self.timestamps.setflags(write=False)
+        self.values.setflags(write=False)
+
+    @classmethod
+    def from_frame(cls, frame, dtype=np.float64):
+        """
+        Builds a bar series from a DataFrame with OHLCV columns and a DatetimeIndex.
+
+        Parameters:
+        - frame (pd.DataFrame): DataFrame with "Open", "High", "Low", "Close" and "Volume" columns.
+        - dtype (np.dtype): Floating point type of the stored prices and volume (default is float64).
+          float32 halves the memory per bar.
+
+        Returns:
+        - BarSeries: The compact bar series.
+        """
+        if frame.empty:
+            return cls(np.empty(0, dtype=np.int64), np.empty((len(BAR_COLUMNS), 0), dtype=dtype))
+
+        timestamps = frame.index.values.astype("datetime64[ns]").view(np.int64)
+        values = np.vstack([frame[column].to_numpy(dtype=dtype) for column in BAR_COLUMNS])
+
+        return cls(timestamps, values)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __contains__(self, column):
+        return column in BAR_COLUMNS
+
+    def __getitem__(self, column):
+        """
+        Returns a column as a pandas Series that shares memory with the bar series.
+        """
+        return pd.Series(self.values[BAR_COLUMNS.index(column)], index=self.index, name=column, copy=False)
+
+    @property
+    def columns(self):
+        return pd.Index(BAR_COLUMNS)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def index(self):
+        """
+        Returns the bar dates as a DatetimeIndex viewing the stored timestamps.
+        """
+        return pd.DatetimeIndex(self.timestamps.view("datetime64[ns]"), name="Date")
+
+    @property
+    def nbytes(self):
+        """
+        Returns the number of bytes used by the stored arrays.
+        """
+        return self.timestamps.nbytes + self.values.nbytes
+
+    def to_frame(self):
+        """
+        Returns the bars as a DataFrame that owns a writable copy of the stored values, so callers
+        can modify it without touching the shared bar series.
+
+        Returns:
+        - pd.DataFrame: DataFrame with columns for "Open", "High", "Low", "Close", "Volume", and indexed by date.
+        """
+        if self.empty:
+            return pd.DataFrame()
+
+        # One copy of the values block, each column views its row of the copy
+        values = self.values.copy()
+        columns = {column: values[row] for row, column in enumerate(BAR_COLUMNS)}
+
+        return pd.DataFrame(columns, index=self.index, copy=False)
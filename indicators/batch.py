@@ -0,0 +1,343 @@
+import numpy as np
+import pandas as pd
+import indicators.kernels as kernels
+from indicators.bar_series import BAR_COLUMNS
+from indicators.compute import SMOOTHING_METHODS, IndicatorError
+
+
+# Batched indicators take aligned 2-D arrays with one row per ticker and one column per bar. Bars a ticker
+# has no data for are NaN. For tickers whose missing bars are only before their first or after their last
+# bar, every indicator matches the per-ticker function in indicators/compute.py on the ticker's own bars.
+# Missing bars inside a history are NaN in the results and make every rolling window containing them NaN.
+# Wilder's smoothing instead carries its average over missing bars inside a history.
+
+
+def align_frames(frames, columns=BAR_COLUMNS):
+    """
+    Aligns the stock data of several tickers on the union of their dates.
+
+    Parameters:
+    - frames (dict): Maps ticker symbols to DataFrames (or BarSeries) with OHLCV columns and a DatetimeIndex.
+    - columns (tuple of str): The columns to align (default is all OHLCV columns).
+
+    Returns:
+    - tuple: (tickers, index, arrays), where tickers is the list of tickers in row order, index is the
+      DatetimeIndex of the columns, and arrays maps each column name to a float64 array of shape
+      (tickers, bars) with NaN where a ticker has no bar.
+    """
+    tickers = [ticker for ticker, frame in frames.items() if not frame.empty]
+
+    # Collect the union of the dates as sorted nanosecond timestamps
+    timestamps = [frames[ticker].index.values.astype("datetime64[ns]").view(np.int64) for ticker in tickers]
+    dates = np.unique(np.concatenate(timestamps)) if timestamps else np.empty(0, dtype=np.int64)
+    index = pd.DatetimeIndex(dates.view("datetime64[ns]"), name="Date")
+
+    # Fill one (columns, tickers, bars) block, placing each ticker's bars at the positions of its dates
+    block = np.full((len(columns), len(tickers), len(index)), np.nan)
+    for row, ticker in enumerate(tickers):
+        positions = np.searchsorted(dates, timestamps[row])
+        block[:, row, positions] = np.vstack([frames[ticker][column].to_numpy(dtype=np.float64) for column in columns])
+
+    return tickers, index, {column: block[position] for position, column in enumerate(columns)}
+
+
+def _shift(values, periods=1):
+    """
+    Shifts every row of a 2-D array right by a number of bars, filling with NaN.
+    """
+    shifted = np.full(values.shape, np.nan)
+    if periods < values.shape[1]:
+        shifted[:, periods:] = values[:, :-periods]
+    return shifted
+
+
+def _rolling_sums(values, period, squares=False):
+    """
+    Rolling sums over the bars of every row, NaN until a window holds period valid values.
+    Rows are centred on their mean to keep the cumulative sums small and precise.
+
+    Returns:
+    - tuple: (sums of the centred values, sums of their squares or None, row means used as the centres).
+    """
+    rows, n = values.shape
+    if period > n or rows == 0:
+        empty = np.full((rows, n), np.nan)
+        return empty, empty if squares else None, np.zeros(rows)
+
+    missing = np.isnan(values)
+    centred = np.where(missing, 0.0, values)
+    counts = n - missing.sum(axis=1)
+    centres = centred.sum(axis=1) / np.maximum(counts, 1)
+    centred -= centres[:, None]
+    centred[missing] = 0.0
+
+    def window_sums(cumulative_values):
+        # Cumulative sums with a leading zero column, so each window is the difference of two columns
+        cumulative = np.zeros((rows, n + 1))
+        np.cumsum(cumulative_values, axis=1, out=cumulative[:, 1:])
+        sums = np.full((rows, n), np.nan)
+        np.subtract(cumulative[:, period:], cumulative[:, :-period], out=sums[:, period - 1:])
+        return sums
+
+    # Windows containing a missing bar are NaN
+    incomplete = window_sums(missing) > 0
+    sums = window_sums(centred)
+    sums[incomplete] = np.nan
+    square_sums = None
+    if squares:
+        square_sums = window_sums(centred * centred)
+        square_sums[incomplete] = np.nan
+
+    return sums, square_sums, centres
+
+
+def _wilder_smooth(values, period, skip_first=False):
+    """
+    Wilder's smoothing along the bars of every row, see kernels.wilder_smooth. Each row is seeded with the
+    simple average of its first period values, after its first bar when skip_first is set.
+    """
+    rows, n = values.shape
+    present = ~np.isnan(values)
+
+    # Each row's seed is the average of the period values ending at seed_at
+    first = np.where(present.any(axis=1), present.argmax(axis=1), n) + int(skip_first)
+    seed_at = first + period - 1
+    totals = np.zeros((rows, n + 1))
+    counts = np.zeros((rows, n + 1))
+    np.cumsum(np.where(present, values, 0.0), axis=1, out=totals[:, 1:])
+    np.cumsum(present, axis=1, out=counts[:, 1:])
+
+    seeded = np.full((rows, n), np.nan)
+    seeds = np.flatnonzero(seed_at < n)
+    start, end = first[seeds], seed_at[seeds] + 1
+    complete = counts[seeds, end] - counts[seeds, start] == period
+    seeded[seeds, end - 1] = np.where(complete, (totals[seeds, end] - totals[seeds, start]) / period, np.nan)
+
+    # After the seed the rows follow an EMA with smoothing factor 1 / period, which is a span of 2 * period - 1
+    after = np.arange(n)[None, :] > seed_at[:, None]
+    seeded[after] = values[after]
+
+    return kernels.ema_rows(seeded, 2 * period - 1)
+
+
+def _smooth(values, period, smoothing, skip_first=False):
+    """
+    Averages every row with a simple rolling mean ("sma") or Wilder's smoothing ("wilder"), NaN at missing values.
+    """
+    if smoothing == "sma":
+        return calculate_sma(values, period)
+    if smoothing != "wilder":
+        raise ValueError(f"Unknown smoothing '{smoothing}', expected one of: {', '.join(SMOOTHING_METHODS)}")
+
+    return np.where(np.isnan(values), np.nan, _wilder_smooth(values, period, skip_first))
+
+
+def calculate_sma(close, period=50):
+    """
+    Calculates the Simple Moving Average (SMA) of every ticker.
+
+    Parameters:
+    - close (np.ndarray): Closing prices, shape (tickers, bars).
+    - period (int): The number of bars averaged (default is 50).
+
+    Returns:
+    - np.ndarray: SMA values of the same shape.
+    """
+    sums, _, centres = _rolling_sums(np.asarray(close, dtype=np.float64), period)
+    return sums / period + centres[:, None]
+
+
+def calculate_ema(close, period=50):
+    """
+    Calculates the Exponential Moving Average (EMA) of every ticker.
+
+    Parameters:
+    - close (np.ndarray): Closing prices, shape (tickers, bars).
+    - period (int): The EMA period (default is 50).
+
+    Returns:
+    - np.ndarray: EMA values of the same shape, NaN at missing bars.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    return np.where(np.isnan(close), np.nan, kernels.ema_rows(close, period))
+
+
+def calculate_rsi(close, period=14, smoothing="sma"):
+    """
+    Calculates the Relative Strength Index (RSI) of every ticker, from averages of gains and losses.
+
+    Parameters:
+    - close (np.ndarray): Closing prices, shape (tickers, bars).
+    - period (int): The number of bars averaged (default is 14).
+    - smoothing (str): "sma" for simple averages or "wilder" for Wilder's smoothing (default is "sma").
+
+    Returns:
+    - np.ndarray: RSI values of the same shape.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    delta = close - _shift(close)
+
+    # The first bar of a ticker has no change and counts as neither gain nor loss, missing bars stay NaN
+    missing = np.isnan(close)
+    gains = np.where(missing, np.nan, np.where(delta > 0, delta, 0.0))
+    losses = np.where(missing, np.nan, np.where(delta < 0, -delta, 0.0))
+
+    # Wilder's smoothing starts after each ticker's first bar, which has no change
+    gain = _smooth(gains, period, smoothing, skip_first=True)
+    loss = _smooth(losses, period, smoothing, skip_first=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+
+def calculate_macd(close, short_period=12, long_period=26, signal_period=9):
+    """
+    Calculates the MACD line, Signal line, and Histogram of every ticker.
+
+    Parameters:
+    - close (np.ndarray): Closing prices, shape (tickers, bars).
+    - short_period (int): The short EMA period (default is 12).
+    - long_period (int): The long EMA period (default is 26).
+    - signal_period (int): The signal EMA period (default is 9).
+
+    Returns:
+    - tuple: (macd_line, signal_line, histogram) arrays of the same shape.
+    """
+    macd_line = calculate_ema(close, short_period) - calculate_ema(close, long_period)
+    signal_line = calculate_ema(macd_line, signal_period)
+
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def calculate_true_range(high, low, close):
+    """
+    Calculates the True Range (TR) of every ticker.
+
+    Parameters:
+    - high, low, close (np.ndarray): High, low and closing prices, shape (tickers, bars).
+
+    Returns:
+    - np.ndarray: True Range values of the same shape.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    previous_close = _shift(np.asarray(close, dtype=np.float64))
+
+    # fmax ignores the missing previous close of a ticker's first bar
+    return np.fmax(np.fmax(high - low, np.abs(high - previous_close)), np.abs(low - previous_close))
+
+
+def calculate_atr(high, low, close, period=14, smoothing="sma"):
+    """
+    Calculates the Average True Range (ATR) of every ticker.
+
+    Parameters:
+    - high, low, close (np.ndarray): High, low and closing prices, shape (tickers, bars).
+    - period (int): The number of bars averaged (default is 14).
+    - smoothing (str): "sma" for a simple average or "wilder" for Wilder's smoothing starting from each
+      ticker's second bar, which has the first complete True Range (default is "sma").
+
+    Returns:
+    - np.ndarray: ATR values of the same shape.
+    """
+    return _smooth(calculate_true_range(high, low, close), period, smoothing, skip_first=True)
+
+
+def calculate_bollinger_bands(close, period=20):
+    """
+    Calculates the Bollinger Bands, two sample standard deviations around the SMA, of every ticker.
+
+    Parameters:
+    - close (np.ndarray): Closing prices, shape (tickers, bars).
+    - period (int): The number of bars of the SMA and standard deviation (default is 20).
+
+    Returns:
+    - tuple: (upper_band, lower_band) arrays of the same shape.
+    """
+    sums, squares, centres = _rolling_sums(np.asarray(close, dtype=np.float64), period, squares=True)
+
+    sma = sums / period + centres[:, None]
+    variance = np.maximum(squares - sums * sums / period, 0.0) / (period - 1)
+    std = np.sqrt(variance)
+
+    return sma + 2 * std, sma - 2 * std
+
+
+def calculate_obv(close, volume):
+    """
+    Calculates the On-Balance Volume (OBV) of every ticker.
+
+    Parameters:
+    - close, volume (np.ndarray): Closing prices and volume, shape (tickers, bars).
+
+    Returns:
+    - np.ndarray: OBV values of the same shape, NaN at missing bars.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    previous = _shift(close)
+
+    # Volume counts as positive on up bars and negative on down bars
+    direction = (close > previous).astype(np.float64) - (close < previous).astype(np.float64)
+    flow = np.where(np.isnan(volume), 0.0, volume * direction)
+
+    return np.where(np.isnan(close) | np.isnan(volume), np.nan, np.cumsum(flow, axis=1))
+
+
+def calculate_vroc(volume, period=14):
+    """
+    Calculates the Volume Rate of Change (VROC) of every ticker, in percent.
+
+    Parameters:
+    - volume (np.ndarray): Volume, shape (tickers, bars).
+    - period (int): The number of bars compared (default is 14).
+
+    Returns:
+    - np.ndarray: VROC values of the same shape.
+    """
+    volume = np.asarray(volume, dtype=np.float64)
+    previous = _shift(volume, period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (volume - previous) / previous * 100
+
+
+# Mapping of indicator names to batched functions called with the aligned column arrays
+batch_functions = {
+    "sma": lambda arrays, period=50: calculate_sma(arrays["Close"], period),
+    "ema": lambda arrays, period=50: calculate_ema(arrays["Close"], period),
+    "rsi": lambda arrays, period=14, smoothing="sma": calculate_rsi(arrays["Close"], period, smoothing),
+    "macd": lambda arrays, *periods: calculate_macd(arrays["Close"], *periods),
+    "atr": lambda arrays, period=14, smoothing="sma": calculate_atr(
+        arrays["High"], arrays["Low"], arrays["Close"], period, smoothing
+    ),
+    "bollinger bands": lambda arrays, period=20: calculate_bollinger_bands(arrays["Close"], period),
+    "obv": lambda arrays: calculate_obv(arrays["Close"], arrays["Volume"]),
+    "vroc": lambda arrays, period=14: calculate_vroc(arrays["Volume"], period),
+}
+
+
+def compute_batch(arrays, indicators):
+    """
+    Computes indicators for every ticker of aligned arrays in one vectorized call per indicator.
+
+    Parameters:
+    - arrays (dict): Maps OHLCV column names to arrays of shape (tickers, bars), e.g., from align_frames.
+    - indicators (list): Indicator names, or tuples of a name followed by its parameters,
+      e.g., ["rsi", ("sma", 200), ("atr", 14, "wilder")].
+
+    Returns:
+    - dict: Maps each requested indicator to its array (or tuple of arrays), or to an IndicatorError if it failed.
+    """
+    results = {}
+
+    for indicator in indicators:
+        name, *params = (indicator,) if isinstance(indicator, str) else indicator
+
+        try:
+            results[indicator] = batch_functions[name](arrays, *params)
+        except Exception as e:
+            results[indicator] = IndicatorError(name, f"Error calculating {name.upper()} for the batch: {e}")
+
+    return results
@@ -1,380 +1,176 @@
-import pandas as pd
-import numpy as np
 import streamlit as st
+import indicators.compute as compute
 
 
-def calculate_sma(data, period=50):
-    """
-    Calculates the Simple Moving Average (SMA) for a specified period.
-    
-    Parameters:
-    - data: DataFrame, must contain a 'Close' column with closing prices.
-    - period: int, the number of periods over which to calculate the SMA (default is 50).
-    
-    Returns:
-    - Series of SMA values with the same length as the input data, or None if input is invalid.
-    """
-    
-    # Compute and return the SMA
-    try:
-        sma = data['Close'].rolling(window=period).mean()
-        return sma
-    
-    except Exception as e:
-        st.error(f"Error calculating SMA: {e}")
-        return None
+# Value each calculation returned on failure before errors were returned as IndicatorError objects
+failure_values = {
+    "macd": (None, None, None),
+    "bollinger bands": (None, None),
+    "directional movement": (None, None),
+    "dmi": (None, None),
+}
 
 
-def calculate_ema(data, period=50):
+def _failure_value(indicator, data):
+    # The Parabolic SAR returned the data itself on failure
+    if indicator == "parabolic sar":
+        return data
+    return failure_values.get(indicator)
+
+
+def report(result, indicator, data=None):
     """
-    Calculates the Exponential Moving Average (EMA) for a specified period.
-    
+    Shows the error of a failed calculation in Streamlit and replaces it with the indicator's failure value.
+
     Parameters:
-    - data: DataFrame, must contain a 'Close' column with closing prices.
-    - period: int, the number of periods over which to calculate the EMA (default is 50).
-    
+    - result: The result of a function in indicators/compute.py.
+    - indicator (str): The indicator name, e.g., "rsi".
+    - data (DataFrame or BarSeries): The stock data the indicator was calculated on (optional).
+
     Returns:
-    - Series of EMA values with the same length as the input data, or None if input is invalid.
+    - The result unchanged, or the failure value (None, a tuple of None, or the data) if the calculation failed.
     """
-    
-    # Compute and return the EMA
-    try:
-        ema = data['Close'].ewm(span=period, adjust=False).mean()
-        return ema
-    
-    except Exception as e:
-        st.error(f"Error calculating EMA: {e}")
-        return None
+    if not isinstance(result, compute.IndicatorError):
+        return result
+
+    st.error(str(result))
+    return _failure_value(indicator, data)
 
 
-def calculate_rsi(data, period=14):
+def report_results(results, data=None):
     """
-    Calculates the Relative Strength Index (RSI) for a specified period.
+    Shows the errors of failed calculations in a mapping of indicators to their results,
+    such as the output of graph.compute_indicators.
 
     Parameters:
-    - data: DataFrame, must contain a 'Close' column with closing prices.
-    - period: int, the number of periods over which to calculate the RSI (default is 14).
+    - results (dict): Maps indicator names to lists of results.
+    - data (DataFrame or BarSeries): The stock data the indicators were calculated on (optional).
 
     Returns:
-    - Series of RSI values with the same length as the input data, or None if input is invalid.
+    - dict: The same mapping with failed results replaced by their failure values.
+      An error shared by several results is shown once.
     """
+    shown = set()
+    replaced = {}
 
-    try:
-        # Calculate the daily price changes
-        delta = data['Close'].diff()
+    for indicator, values in results.items():
+        replaced[indicator] = []
+        for value in values:
+            if isinstance(value, compute.IndicatorError):
+                if str(value) not in shown:
+                    shown.add(str(value))
+                    st.error(str(value))
+                value = _failure_value(indicator, data)
+            replaced[indicator].append(value)
 
-        # Calculate gains (positive changes) and losses (negative changes)
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    return replaced
 
-        # Calculate the Relative Strength (RS)
-        rs = gain / loss
 
-        # Calculate the RSI
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
-    except Exception as e:
-        st.error(f"Error calculating RSI: {e}")
-        return None
+# Streamlit versions of the compute functions, showing errors with st.error and returning the failure value
+def calculate_sma(data, period=50):
+    """
+    Calculates the Simple Moving Average (SMA), see compute.calculate_sma. Returns None on failure.
+    """
+    return report(compute.calculate_sma(data, period), "sma")
 
 
-def calculate_macd(data, short_period=12, long_period=26, signal_period=9):
+def calculate_ema(data, period=50):
     """
-    Calculates the MACD line, Signal line, and Histogram.
-    
-    Parameters:
-    - data: DataFrame, must contain a 'Close' column with closing prices.
-    - short_period: int, the short EMA period (default is 12).
-    - long_period: int, the long EMA period (default is 26).
-    - signal_period: int, the signal EMA period (default is 9).
-    
-    Returns:
-    - A tuple of three Series: (macd_line, signal_line, histogram).
+    Calculates the Exponential Moving Average (EMA), see compute.calculate_ema. Returns None on failure.
     """
-    try:
-        # Calculate short and long EMAs
-        ema_short = data['Close'].ewm(span=short_period, adjust=False).mean()
-        ema_long = data['Close'].ewm(span=long_period, adjust=False).mean()
+    return report(compute.calculate_ema(data, period), "ema")
 
-        # MACD Line is the difference between short and long EMAs
-        macd_line = ema_short - ema_long
 
-        # Signal Line is the EMA of the MACD Line
-        signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+def calculate_sma_bank(data, periods=(5, 10, 20, 50, 100, 200)):
+    """
+    Calculates Simple Moving Averages for several periods, see compute.calculate_sma_bank. Returns None on failure.
+    """
+    return report(compute.calculate_sma_bank(data, periods), "sma bank")
 
-        # Histogram is the difference between the MACD Line and Signal Line
-        histogram = macd_line - signal_line
 
-        return macd_line, signal_line, histogram
-    
-    except Exception as e:
-        st.error(f"Error calculating MACD: {e}")
-        return None, None, None
+def calculate_ema_bank(data, periods=(12, 26, 50, 200)):
+    """
+    Calculates Exponential Moving Averages for several periods, see compute.calculate_ema_bank. Returns None on failure.
+    """
+    return report(compute.calculate_ema_bank(data, periods), "ema bank")
 
 
-def calculate_adx(data, period=14):
+def calculate_rsi(data, period=14, smoothing="sma"):
+    """
+    Calculates the Relative Strength Index (RSI), see compute.calculate_rsi. Returns None on failure.
     """
-    Calculates the Average Directional Index (ADX), an indicator of trend strength.
+    return report(compute.calculate_rsi(data, period, smoothing), "rsi")
 
-    Parameters:
-    - data: DataFrame, must contain 'High', 'Low', and 'Close' columns.
-    - period: int, the period over which to calculate ADX (default is 14).
 
-    Returns:
-    - Series of ADX values with the same length as the input data, or None if input is invalid.
-    """
-    
-    try:
-        # Calculate the difference between current and previous highs and lows
-        high_diff = data['High'].diff()
-        low_diff = data['Low'].diff()
-
-        # Calculate +DM and -DM (Directional Movement)
-        plus_dm = high_diff.where((high_diff > 0) & (high_diff > low_diff), 0)
-        minus_dm = -low_diff.where((low_diff > 0) & (low_diff > high_diff), 0)
-
-        # Calculate the Average True Range (ATR) for the given period
-        atr = calculate_atr(data, period)
-        if atr is None:
-            st.error("Failed to calculate ATR, which is required for ADX calculation.")
-            return None
-
-        # Calculate +DI and -DI (Directional Indicators)
-        plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr)
-        minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr)
-
-        # Calculate the DX (Directional Movement Index)
-        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-
-        # Calculate the ADX as a smoothed average of DX values
-        adx = dx.rolling(window=period).mean()
-        return adx
-    
-    except Exception as e:
-        st.error(f"Error calculating ADX: {e}")
-        return None
-    
-    
-def calculate_atr(data, period=14):
-    """
-    Calculates the Average True Range (ATR), a measure of market volatility.
+def calculate_macd(data, short_period=12, long_period=26, signal_period=9, ema_short=None, ema_long=None):
+    """
+    Calculates the MACD line, Signal line, and Histogram, see compute.calculate_macd.
+    Returns (None, None, None) on failure.
+    """
+    return report(
+        compute.calculate_macd(data, short_period, long_period, signal_period, ema_short, ema_long), "macd"
+    )
 
-    Parameters:
-    - data: DataFrame, must contain 'High', 'Low', and 'Close' columns.
-    - period: int, the period over which to calculate ATR (default is 14).
 
-    Returns:
-    - Series of ATR values with the same length as the input data, or None if input is invalid.
+def calculate_adx(data, period=14, smoothing="sma", dmi=None):
+    """
+    Calculates the Average Directional Index (ADX), see compute.calculate_adx. Returns None on failure.
     """
-    
-    try:
-        # Step 1: Calculate high-low range for each period
-        high_low = data['High'] - data['Low']
+    return report(compute.calculate_adx(data, period, smoothing, dmi), "adx")
 
-        # Step 2: Calculate high-close range (using previous close)
-        high_close = (data['High'] - data['Close'].shift()).abs()
 
-        # Step 3: Calculate low-close range (using previous close)
-        low_close = (data['Low'] - data['Close'].shift()).abs()
+def calculate_true_range(data):
+    """
+    Calculates the True Range (TR), see compute.calculate_true_range. Returns None on failure.
+    """
+    return report(compute.calculate_true_range(data), "true range")
 
-        # Step 4: Calculate True Range (TR) as the max of high-low, high-close, and low-close for each period
-        tr = high_low.combine(high_close, max).combine(low_close, max)
 
-        # Step 5: Calculate the ATR by taking a rolling mean of the True Range
-        atr = tr.rolling(window=period).mean()
-        return atr
-    
-    except Exception as e:
-        st.error(f"Error calculating ATR: {e}")
-        return None
+def calculate_atr(data, period=14, smoothing="sma", true_range=None):
+    """
+    Calculates the Average True Range (ATR), see compute.calculate_atr. Returns None on failure.
+    """
+    return report(compute.calculate_atr(data, period, smoothing, true_range), "atr")
 
 
 def calculate_bollinger_bands(data, period=20):
     """
-    Calculates the Bollinger Bands, which consist of an upper and lower band around a Simple Moving Average (SMA).
-    Bollinger Bands measure market volatility and indicate potential price levels for the security.
-
-    Parameters:
-    - data: DataFrame, must contain a 'Close' column.
-    - period: int, the period over which to calculate the SMA and standard deviation (default is 20).
-
-    Returns:
-    - A tuple of two Series: (upper_band, lower_band).
-      - upper_band: SMA + 2 * standard deviation.
-      - lower_band: SMA - 2 * standard deviation.
-      - Returns (None, None) if input is invalid.
+    Calculates the Bollinger Bands, see compute.calculate_bollinger_bands. Returns (None, None) on failure.
     """
-    
-    try:
-        # Step 1: Calculate the Simple Moving Average (SMA)
-        sma = data['Close'].rolling(window=period).mean()
+    return report(compute.calculate_bollinger_bands(data, period), "bollinger bands")
 
-        # Step 2: Calculate the rolling standard deviation
-        std = data['Close'].rolling(window=period).std()
 
-        # Step 3: Calculate the upper and lower Bollinger Bands
-        upper_band = sma + (2 * std)
-        lower_band = sma - (2 * std)
-
-        return upper_band, lower_band
-    
-    except Exception as e:
-        st.error(f"Error calculating Bollinger Bands: {e}")
-        return None, None
+def calculate_obv(data):
+    """
+    Calculates the On-Balance Volume (OBV), see compute.calculate_obv. Returns None on failure.
+    """
+    return report(compute.calculate_obv(data), "obv")
 
 
-def calculate_obv(data):
+def calculate_directional_movement(data):
+    """
+    Calculates the Directional Movement (+DM and -DM), see compute.calculate_directional_movement.
+    Returns (None, None) on failure.
     """
-    Calculates the On-Balance Volume (OBV), a momentum indicator that uses volume flow to predict changes in stock price.
+    return report(compute.calculate_directional_movement(data), "directional movement")
 
-    Parameters:
-    - data: DataFrame, must contain 'Close' and 'Volume' columns.
 
-    Returns:
-    - Series of OBV values, or None if input is invalid.
-    """
-    
-    try:
-        # Step 1: Calculate daily volume flow based on price direction
-        volume_flow = data['Volume'] * ((data['Close'] > data['Close'].shift()).astype(int) - 
-                                        (data['Close'] < data['Close'].shift()).astype(int))
-
-        # Step 2: Cumulatively sum the volume flow to obtain OBV
-        obv = volume_flow.cumsum()
-
-        return obv
-    
-    except Exception as e:
-        st.error(f"Error calculating OBV: {e}")
-        return None
-    
-    
-# Directional Movement Index (DMI)
-def calculate_dmi(data, period=14):
-    """
-    Calculates the Directional Movement Index (DMI), which consists of the Positive Directional Indicator (+DI)
-    and Negative Directional Indicator (-DI). The DMI helps identify the strength and direction of a trend.
+def calculate_dmi(data, period=14, smoothing="sma", atr=None, directional_movement=None):
+    """
+    Calculates the Directional Movement Index (DMI), see compute.calculate_dmi. Returns (None, None) on failure.
+    """
+    return report(compute.calculate_dmi(data, period, smoothing, atr, directional_movement), "dmi")
 
-    Parameters:
-    - data (DataFrame): A DataFrame containing 'High' and 'Low' columns with high and low price data.
-    - period (int): The period over which to calculate the DMI (default is 14).
 
-    Returns:
-    - tuple: (plus_di, minus_di), where:
-        - plus_di (Series): Positive Directional Indicator (in %), highlighting upward movement strength.
-        - minus_di (Series): Negative Directional Indicator (in %), highlighting downward movement strength.
-        - Returns (None, None) if an error occurs during calculation.
-
-    """
-    
-    try:
-        # Calculate directional movement
-        high_diff = data['High'].diff()
-        low_diff = data['Low'].diff()
-        plus_dm = high_diff.where((high_diff > 0) & (high_diff > low_diff), 0)
-        minus_dm = -low_diff.where((low_diff > 0) & (low_diff > high_diff), 0)
-        
-        # Calculate ATR, used for normalization
-        atr = calculate_atr(data, period)
-        plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr)
-        minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr)
-        
-        return plus_di, minus_di
-    except Exception as e:
-        st.error(f"Error calculating DMI: {e}")
-        return None, None
-
-
-# Parabolic SAR
 def calculate_parabolic_sar(data, initial_af=0.02, max_af=0.2):
     """
-    Calculates the Parabolic Stop and Reverse (SAR), a trend-following indicator that
-    provides trailing stop points for both upward and downward trends.
+    Calculates the Parabolic SAR, see compute.calculate_parabolic_sar. Returns the data on failure.
+    """
+    return report(compute.calculate_parabolic_sar(data, initial_af, max_af), "parabolic sar", data)
 
-    Parameters:
-    - data (DataFrame): A DataFrame containing 'High' and 'Low' columns with high and low price data.
-    - initial_af (float): The initial acceleration factor, typically set to 0.02 (default is 0.02).
-    - max_af (float): The maximum acceleration factor, which stops the SAR from increasing indefinitely (default is 0.2).
 
-    Returns:
-    - Series: A pandas Series containing the SAR values for each period, where the SAR values 
-              trail the price in an uptrend and lead it in a downtrend. Returns None if there 
-              is an error during calculation.
-    """
-    
-    try:
-        # Ensure 'High' and 'Low' columns are present
-        if 'High' not in data or 'Low' not in data:
-            st.error("Data must contain 'High' and 'Low' columns.")
-            return data
-
-        # Initialize variables
-        sar = pd.Series(np.nan, index=data.index)
-        high, low = data['High'], data['Low']
-        af = initial_af  # acceleration factor
-        ep = low.iloc[0]  # extreme price
-        trend = 1  # 1 for uptrend, -1 for downtrend
-
-        # Set the initial SAR value
-        sar.iloc[0] = low.iloc[0]
-
-        # Iterate through each time period
-        for i in range(1, len(data)):
-            # Calculate SAR based on trend
-            sar.iloc[i] = sar.iloc[i - 1] + af * (ep - sar.iloc[i - 1])
-
-            if trend == 1:  # Uptrend
-                # Check for trend reversal to downtrend
-                if low.iloc[i] < sar.iloc[i]:
-                    trend = -1
-                    sar.iloc[i] = ep
-                    af = initial_af
-                    ep = high.iloc[i]
-                else:
-                    # Update extreme price and acceleration factor for uptrend
-                    if high.iloc[i] > ep:
-                        ep = high.iloc[i]
-                        af = min(af + initial_af, max_af)
-            else:  # Downtrend
-                # Check for trend reversal to uptrend
-                if high.iloc[i] > sar.iloc[i]:
-                    trend = 1
-                    sar.iloc[i] = ep
-                    af = initial_af
-                    ep = low.iloc[i]
-                else:
-                    # Update extreme price and acceleration factor for downtrend
-                    if low.iloc[i] < ep:
-                        ep = low.iloc[i]
-                        af = min(af + initial_af, max_af)
-
-        return sar
-
-    except Exception as e:
-        st.error(f"Error calculating Parabolic SAR: {e}")
-        return data
-
-# Volume Rate of Change (VROC)
 def calculate_vroc(data, period=14):
     """
-    Calculates the Volume Rate of Change (VROC), a momentum indicator that 
-    measures the rate of change in volume over a specified period.
-
-    Parameters:
-    - data (DataFrame): A DataFrame containing a 'Volume' column with volume data.
-    - period (int): The period over which to calculate VROC (default is 14).
-
-    Returns:
-    - Series: A pandas Series containing VROC values for the given period.
-              The result is in percentage form, indicating the rate of volume change.
-              Returns None if there is an error during calculation.
-
-    """
-    
-    try:
-        vroc = ((data['Volume'] - data['Volume'].shift(period)) / data['Volume'].shift(period)) * 100
-        return vroc
-    except Exception as e:
-        st.error(f"Error calculating VROC: {e}")
-        return None
\ No newline at end of file
+    Calculates the Volume Rate of Change (VROC), see compute.calculate_vroc. Returns None on failure.
+    """
+    return report(compute.calculate_vroc(data, period), "vroc")
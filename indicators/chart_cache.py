@@ -0,0 +1,31 @@
+import os
+import indicators.memo as memo
+
+
+# Memory budget of the rendered chart cache in bytes, and its maximum number of charts
+CHART_CACHE_MAX_BYTES = int(os.getenv("CHART_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CHART_CACHE_MAX_ENTRIES = int(os.getenv("CHART_CACHE_MAX_ENTRIES", "256"))
+
+# Cache of rendered charts shared by every session in the process, holding (PNG bytes or interactive HTML page, notices) per chart
+rendered_charts = memo.MemoCache(CHART_CACHE_MAX_BYTES, CHART_CACHE_MAX_ENTRIES)
+
+
+def chart_key(ticker, timespan, indicators, style, data, visible=None):
+    """
+    Builds the cache key of a rendered chart. Requests for the same ticker, timespan, indicators and style
+    share the chart while the bars are unchanged.
+
+    Parameters:
+    - ticker (str): The stock ticker symbol.
+    - timespan (str): Timespan of the bars.
+    - indicators (list of str): The charted indicators, in any order.
+    - style (str): The mplfinance style, or "interactive" for charts drawn in the browser.
+    - data (DataFrame or BarSeries): The bars the chart is rendered from.
+    - visible (int): Number of most recent bars shown (optional).
+
+    Returns:
+    - tuple: The cache key. It holds the bars' fingerprint, which includes the last bar's timestamp and
+      also changes when a still forming last bar is updated.
+    """
+    return (ticker.upper(), timespan, tuple(sorted(set(indicators))), style, visible, memo.fingerprint(data))
+
@@ -0,0 +1,496 @@
+import numpy as np
+import pandas as pd
+import indicators.kernels as kernels
+import indicators.memo as memo
+
+
+class IndicatorError(Exception):
+    """
+    Structured result of a failed indicator calculation. The compute functions return it instead of raising,
+    so failures can be passed back from worker processes and reported by the caller.
+    """
+
+    def __init__(self, indicator, message):
+        """
+        Parameters:
+        - indicator (str): Name of the indicator that failed, e.g., "rsi".
+        - message (str): Description of the failure, suitable to show to users.
+        """
+        super().__init__(indicator, message)
+        self.indicator = indicator
+        self.message = message
+
+    def __str__(self):
+        return self.message
+
+
+# Ways rolling indicators can average their inputs: a simple rolling mean, or Wilder's smoothing
+# as used in his original definitions of RSI, ATR, DMI and ADX
+SMOOTHING_METHODS = ("sma", "wilder")
+
+
+def _smooth(series, period, smoothing, skip_first=False):
+    """
+    Averages a Series over a period with a simple rolling mean ("sma") or Wilder's smoothing ("wilder").
+    Wilder's smoothing can skip the first bar, which has no previous bar to compare with.
+    """
+    if smoothing == "sma":
+        return series.rolling(window=period).mean()
+    if smoothing != "wilder":
+        raise ValueError(f"Unknown smoothing '{smoothing}', expected one of: {', '.join(SMOOTHING_METHODS)}")
+
+    values = series.to_numpy(dtype=np.float64)
+    smoothed = np.full(len(values), np.nan)
+    start = 1 if skip_first else 0
+    smoothed[start:] = kernels.wilder_smooth(values[start:], period)
+
+    return pd.Series(smoothed, index=series.index)
+
+
+@memo.memoize("sma")
+def calculate_sma(data, period=50):
+    """
+    Calculates the Simple Moving Average (SMA) for a specified period.
+    
+    Parameters:
+    - data: DataFrame or BarSeries, must contain a 'Close' column with closing prices.
+    - period: int, the number of periods over which to calculate the SMA (default is 50).
+    
+    Returns:
+    - Series of SMA values with the same length as the input data, or an IndicatorError if input is invalid.
+    """
+    
+    # Compute and return the SMA
+    try:
+        sma = data['Close'].rolling(window=period).mean()
+        return sma
+    
+    except Exception as e:
+        return IndicatorError("sma", f"Error calculating SMA: {e}")
+
+
+@memo.memoize("ema")
+def calculate_ema(data, period=50):
+    """
+    Calculates the Exponential Moving Average (EMA) for a specified period.
+    
+    Parameters:
+    - data: DataFrame or BarSeries, must contain a 'Close' column with closing prices.
+    - period: int, the number of periods over which to calculate the EMA (default is 50).
+    
+    Returns:
+    - Series of EMA values with the same length as the input data, or an IndicatorError if input is invalid.
+    """
+    
+    # Compute and return the EMA
+    try:
+        ema = data['Close'].ewm(span=period, adjust=False).mean()
+        return ema
+    
+    except Exception as e:
+        return IndicatorError("ema", f"Error calculating EMA: {e}")
+
+
+@memo.memoize("sma bank")
+def calculate_sma_bank(data, periods=(5, 10, 20, 50, 100, 200)):
+    """
+    Calculates Simple Moving Averages for several periods in one pass over the data,
+    using a cumulative sum shared by all periods.
+
+    Parameters:
+    - data: DataFrame or BarSeries, must contain a 'Close' column with closing prices.
+    - periods: list of int, the SMA periods (default is 5, 10, 20, 50, 100 and 200).
+
+    Returns:
+    - 2-D array with one row per bar and one column per period, or an IndicatorError if input is invalid.
+    """
+
+    try:
+        return kernels.sma_bank(data['Close'].to_numpy(), list(periods))
+
+    except Exception as e:
+        return IndicatorError("sma bank", f"Error calculating SMA bank: {e}")
+
+
+@memo.memoize("ema bank")
+def calculate_ema_bank(data, periods=(12, 26, 50, 200)):
+    """
+    Calculates Exponential Moving Averages for several periods in one pass over the data.
+
+    Parameters:
+    - data: DataFrame or BarSeries, must contain a 'Close' column with closing prices.
+    - periods: list of int, the EMA periods (default is 12, 26, 50 and 200).
+
+    Returns:
+    - 2-D array with one row per bar and one column per period, or an IndicatorError if input is invalid.
+    """
+
+    try:
+        return kernels.ema_bank(data['Close'].to_numpy(), list(periods))
+
+    except Exception as e:
+        return IndicatorError("ema bank", f"Error calculating EMA bank: {e}")
+
+
+@memo.memoize("rsi")
+def calculate_rsi(data, period=14, smoothing="sma"):
+    """
+    Calculates the Relative Strength Index (RSI) for a specified period.
+
+    Parameters:
+    - data: DataFrame or BarSeries, must contain a 'Close' column with closing prices.
+    - period: int, the number of periods over which to calculate the RSI (default is 14).
+    - smoothing: str, "sma" to average gains and losses with a rolling mean, or "wilder" for Wilder's
+      smoothing seeded with the average of the first period changes (default is "sma").
+
+    Returns:
+    - Series of RSI values with the same length as the input data, or an IndicatorError if input is invalid.
+    """
+
+    try:
+        # Calculate the daily price changes
+        delta = data['Close'].diff()
+
+        # Calculate average gains (positive changes) and losses (negative changes)
+        if smoothing == "sma":
+            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        else:
+            gain = _smooth(delta.clip(lower=0), period, smoothing)
+            loss = _smooth((-delta).clip(lower=0), period, smoothing)
+
+        # Calculate the Relative Strength (RS)
+        rs = gain / loss
+
+        # Calculate the RSI
+        rsi = 100 - (100 / (1 + rs))
+        return rsi
+    
+    except Exception as e:
+        return IndicatorError("rsi", f"Error calculating RSI: {e}")
+
+
+@memo.memoize("macd")
+def calculate_macd(data, short_period=12, long_period=26, signal_period=9, ema_short=None, ema_long=None):
+    """
+    Calculates the MACD line, Signal line, and Histogram.
+    
+    Parameters:
+    - data: DataFrame or BarSeries, must contain a 'Close' column with closing prices.
+    - short_period: int, the short EMA period (default is 12).
+    - long_period: int, the long EMA period (default is 26).
+    - signal_period: int, the signal EMA period (default is 9).
+    - ema_short: Series, precomputed short period EMA (optional).
+    - ema_long: Series, precomputed long period EMA (optional).
+    
+    Returns:
+    - A tuple of three Series: (macd_line, signal_line, histogram), or an IndicatorError if input is invalid.
+    """
+    try:
+        # Calculate short and long EMAs unless they were already computed
+        if ema_short is None:
+            ema_short = data['Close'].ewm(span=short_period, adjust=False).mean()
+        if ema_long is None:
+            ema_long = data['Close'].ewm(span=long_period, adjust=False).mean()
+
+        # MACD Line is the difference between short and long EMAs
+        macd_line = ema_short - ema_long
+
+        # Signal Line is the EMA of the MACD Line
+        signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
+
+        # Histogram is the difference between the MACD Line and Signal Line
+        histogram = macd_line - signal_line
+
+        return macd_line, signal_line, histogram
+    
+    except Exception as e:
+        return IndicatorError("macd", f"Error calculating MACD: {e}")
+
+
+@memo.memoize("adx")
+def calculate_adx(data, period=14, smoothing="sma", dmi=None):
+    """
+    Calculates the Average Directional Index (ADX), an indicator of trend strength.
+
+    Parameters:
+    - data: DataFrame or BarSeries, must contain 'High', 'Low', and 'Close' columns.
+    - period: int, the period over which to calculate ADX (default is 14).
+    - smoothing: str, "sma" for rolling means or "wilder" for Wilder's smoothing (default is "sma").
+    - dmi: tuple, precomputed (plus_di, minus_di) for the same period and smoothing (optional).
+
+    Returns:
+    - Series of ADX values with the same length as the input data, or an IndicatorError if input is invalid.
+    """
+    
+    try:
+        # Calculate +DI and -DI (Directional Indicators) unless they were already computed
+        if dmi is None:
+            dmi = calculate_dmi(data, period, smoothing)
+        if isinstance(dmi, IndicatorError):
+            return IndicatorError("adx", "Failed to calculate DMI, which is required for ADX calculation.")
+        plus_di, minus_di = dmi
+
+        # Calculate the DX (Directional Movement Index)
+        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+
+        # Calculate the ADX as a smoothed average of DX values
+        adx = _smooth(dx, period, smoothing)
+        return adx
+    
+    except Exception as e:
+        return IndicatorError("adx", f"Error calculating ADX: {e}")
+    
+    
+@memo.memoize("true range")
+def calculate_true_range(data):
+    """
+    Calculates the True Range (TR), the largest of the high-low range and the distances
+    of the high and low from the previous close.
+
+    Parameters:
+    - data: DataFrame or BarSeries, must contain 'High', 'Low', and 'Close' columns.
+
+    Returns:
+    - Series of True Range values with the same length as the input data, or an IndicatorError if input is invalid.
+    """
+
+    try:
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        previous_close = data['Close'].shift().to_numpy(dtype=np.float64)
+
+        # Step 1: Calculate high-low range for each period
+        high_low = high - low
+
+        # Step 2: Calculate high-close range (using previous close)
+        high_close = np.abs(high - previous_close)
+
+        # Step 3: Calculate low-close range (using previous close)
+        low_close = np.abs(low - previous_close)
+
+        # Step 4: Calculate True Range (TR) as the max of high-low, high-close, and low-close for each period.
+        # fmax ignores the missing previous close of the first bar, whose range is its high-low range
+        tr = np.fmax(np.fmax(high_low, high_close), low_close)
+        return pd.Series(tr, index=data.index)
+
+    except Exception as e:
+        return IndicatorError("true range", f"Error calculating True Range: {e}")
+
+
+@memo.memoize("atr")
+def calculate_atr(data, period=14, smoothing="sma", true_range=None):
+    """
+    Calculates the Average True Range (ATR), a measure of market volatility.
+
+    Parameters:
+    - data: DataFrame or BarSeries, must contain 'High', 'Low', and 'Close' columns.
+    - period: int, the period over which to calculate ATR (default is 14).
+    - smoothing: str, "sma" for a rolling mean of the True Range, or "wilder" for Wilder's smoothing
+      starting from the second bar, which has the first complete True Range (default is "sma").
+    - true_range: Series, precomputed True Range (optional).
+
+    Returns:
+    - Series of ATR values with the same length as the input data, or an IndicatorError if input is invalid.
+    """
+    
+    try:
+        # Calculate the True Range unless it was already computed
+        if true_range is None:
+            true_range = calculate_true_range(data)
+        if isinstance(true_range, IndicatorError):
+            return true_range
+
+        # Calculate the ATR by averaging the True Range
+        atr = _smooth(true_range, period, smoothing, skip_first=True)
+        return atr
+    
+    except Exception as e:
+        return IndicatorError("atr", f"Error calculating ATR: {e}")
+
+
+@memo.memoize("bollinger bands")
+def calculate_bollinger_bands(data, period=20):
+    """
+    Calculates the Bollinger Bands, which consist of an upper and lower band around a Simple Moving Average (SMA).
+    Bollinger Bands measure market volatility and indicate potential price levels for the security.
+
+    Parameters:
+    - data: DataFrame or BarSeries, must contain a 'Close' column.
+    - period: int, the period over which to calculate the SMA and standard deviation (default is 20).
+
+    Returns:
+    - A tuple of two Series: (upper_band, lower_band).
+      - upper_band: SMA + 2 * standard deviation.
+      - lower_band: SMA - 2 * standard deviation.
+      - Returns an IndicatorError if input is invalid.
+    """
+    
+    try:
+        # Step 1: Calculate the Simple Moving Average (SMA)
+        sma = data['Close'].rolling(window=period).mean()
+
+        # Step 2: Calculate the rolling standard deviation
+        std = data['Close'].rolling(window=period).std()
+
+        # Step 3: Calculate the upper and lower Bollinger Bands
+        upper_band = sma + (2 * std)
+        lower_band = sma - (2 * std)
+
+        return upper_band, lower_band
+    
+    except Exception as e:
+        return IndicatorError("bollinger bands", f"Error calculating Bollinger Bands: {e}")
+
+
+@memo.memoize("obv")
+def calculate_obv(data):
+    """
+    Calculates the On-Balance Volume (OBV), a momentum indicator that uses volume flow to predict changes in stock price.
+
+    Parameters:
+    - data: DataFrame or BarSeries, must contain 'Close' and 'Volume' columns.
+
+    Returns:
+    - Series of OBV values, or an IndicatorError if input is invalid.
+    """
+    
+    try:
+        # Step 1: Calculate daily volume flow based on price direction
+        volume_flow = data['Volume'] * ((data['Close'] > data['Close'].shift()).astype(int) - 
+                                        (data['Close'] < data['Close'].shift()).astype(int))
+
+        # Step 2: Cumulatively sum the volume flow to obtain OBV
+        obv = volume_flow.cumsum()
+
+        return obv
+    
+    except Exception as e:
+        return IndicatorError("obv", f"Error calculating OBV: {e}")
+    
+    
+# Directional Movement (+DM and -DM)
+@memo.memoize("directional movement")
+def calculate_directional_movement(data):
+    """
+    Calculates the Positive and Negative Directional Movement (+DM and -DM) from the changes
+    in the high and low prices.
+
+    Parameters:
+    - data (DataFrame or BarSeries): A DataFrame or BarSeries containing 'High' and 'Low' columns with high and low price data.
+
+    Returns:
+    - tuple: (plus_dm, minus_dm) Series, or an IndicatorError if an error occurs during calculation.
+    """
+
+    try:
+        # Calculate the up-move of the highs and the down-move of the lows
+        up_move = data['High'].diff()
+        down_move = -data['Low'].diff()
+
+        # Calculate +DM and -DM (Directional Movement), only the larger positive move counts
+        plus_dm = up_move.where((up_move > down_move) & (up_move > 0), 0)
+        minus_dm = down_move.where((down_move > up_move) & (down_move > 0), 0)
+
+        return plus_dm, minus_dm
+    except Exception as e:
+        return IndicatorError("directional movement", f"Error calculating Directional Movement: {e}")
+
+
+# Directional Movement Index (DMI)
+@memo.memoize("dmi")
+def calculate_dmi(data, period=14, smoothing="sma", atr=None, directional_movement=None):
+    """
+    Calculates the Directional Movement Index (DMI), which consists of the Positive Directional Indicator (+DI)
+    and Negative Directional Indicator (-DI). The DMI helps identify the strength and direction of a trend.
+
+    Parameters:
+    - data (DataFrame or BarSeries): A DataFrame or BarSeries containing 'High' and 'Low' columns with high and low price data.
+    - period (int): The period over which to calculate the DMI (default is 14).
+    - smoothing (str): "sma" for rolling means or "wilder" for Wilder's smoothing (default is "sma").
+    - atr (Series): Precomputed ATR for the same period and smoothing (optional).
+    - directional_movement (tuple): Precomputed (plus_dm, minus_dm) (optional).
+
+    Returns:
+    - tuple: (plus_di, minus_di), where:
+        - plus_di (Series): Positive Directional Indicator (in %), highlighting upward movement strength.
+        - minus_di (Series): Negative Directional Indicator (in %), highlighting downward movement strength.
+        - Returns an IndicatorError if an error occurs during calculation.
+
+    """
+    
+    try:
+        # Calculate directional movement unless it was already computed
+        if directional_movement is None:
+            directional_movement = calculate_directional_movement(data)
+        if isinstance(directional_movement, IndicatorError):
+            return directional_movement
+        plus_dm, minus_dm = directional_movement
+        
+        # Calculate ATR, used for normalization
+        if atr is None:
+            atr = calculate_atr(data, period, smoothing)
+        if isinstance(atr, IndicatorError):
+            return atr
+        plus_di = 100 * (_smooth(plus_dm, period, smoothing, skip_first=True) / atr)
+        minus_di = 100 * (_smooth(minus_dm, period, smoothing, skip_first=True) / atr)
+        
+        return plus_di, minus_di
+    except Exception as e:
+        return IndicatorError("dmi", f"Error calculating DMI: {e}")
+
+
+# Parabolic SAR
+@memo.memoize("parabolic sar")
+def calculate_parabolic_sar(data, initial_af=0.02, max_af=0.2):
+    """
+    Calculates the Parabolic Stop and Reverse (SAR), a trend-following indicator that
+    provides trailing stop points for both upward and downward trends.
+
+    Parameters:
+    - data (DataFrame or BarSeries): A DataFrame or BarSeries containing 'High' and 'Low' columns with high and low price data.
+    - initial_af (float): The initial acceleration factor, typically set to 0.02 (default is 0.02).
+    - max_af (float): The maximum acceleration factor, which stops the SAR from increasing indefinitely (default is 0.2).
+
+    Returns:
+    - Series: A pandas Series containing the SAR values for each period, where the SAR values 
+              trail the price in an uptrend and lead it in a downtrend. Returns an IndicatorError
+              if there is an error during calculation.
+    """
+    
+    try:
+        # Ensure 'High' and 'Low' columns are present
+        if 'High' not in data or 'Low' not in data:
+            return IndicatorError("parabolic sar", "Data must contain 'High' and 'Low' columns.")
+
+        # Run the SAR recursion on the raw high and low arrays
+        sar = kernels.parabolic_sar(data['High'].to_numpy(), data['Low'].to_numpy(), initial_af, max_af)
+
+        return pd.Series(sar, index=data.index)
+
+    except Exception as e:
+        return IndicatorError("parabolic sar", f"Error calculating Parabolic SAR: {e}")
+
+# Volume Rate of Change (VROC)
+@memo.memoize("vroc")
+def calculate_vroc(data, period=14):
+    """
+    Calculates the Volume Rate of Change (VROC), a momentum indicator that 
+    measures the rate of change in volume over a specified period.
+
+    Parameters:
+    - data (DataFrame or BarSeries): A DataFrame or BarSeries containing a 'Volume' column with volume data.
+    - period (int): The period over which to calculate VROC (default is 14).
+
+    Returns:
+    - Series: A pandas Series containing VROC values for the given period.
+              The result is in percentage form, indicating the rate of volume change.
+              Returns an IndicatorError if there is an error during calculation.
+
+    """
+    
+    try:
+        vroc = ((data['Volume'] - data['Volume'].shift(period)) / data['Volume'].shift(period)) * 100
+        return vroc
+    except Exception as e:
+        return IndicatorError("vroc", f"Error calculating VROC: {e}")
\ No newline at end of file
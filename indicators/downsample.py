@@ -0,0 +1,114 @@
+import os
+import numpy as np
+import pandas as pd
+import indicators.kernels as kernels
+
+
+# Width of the charts in pixels as they are displayed, which bounds how many points can be told apart
+CHART_WIDTH_PX = int(os.getenv("CHART_WIDTH_PX", "1000"))
+
+# Horizontal pixels each drawn point needs: a candle needs a body and a gap, a line one pixel per point
+PIXELS_PER_POINT = {
+    "candle": 2,
+    "ohlc": 2,
+    "line": 1,
+}
+
+
+def point_budget(chart_type, width_px=CHART_WIDTH_PX):
+    """
+    Returns the number of points worth drawing across a chart.
+
+    Parameters:
+    - chart_type (str): The mplfinance chart type, e.g., "candle" or "line".
+    - width_px (int): Width of the chart in pixels (default is CHART_WIDTH_PX).
+
+    Returns:
+    - int: The point budget, at least 3.
+    """
+    return max(3, width_px // PIXELS_PER_POINT.get(chart_type, 1))
+
+
+def bucket_starts(length, points, uniform=False):
+    """
+    Splits bars into buckets that are each drawn as one point.
+
+    Parameters:
+    - length (int): Number of bars.
+    - points (int): Maximum number of buckets, at least 3.
+    - uniform (bool): True for buckets of the same whole number of bars, aligned so the last bucket ends with
+      the last bar, as candles need. False for the LTTB layout, where the first and last bar are buckets of
+      their own and the bars between them are split evenly (default is False).
+
+    Returns:
+    - np.ndarray: Index of the first bar of each bucket, or of every bar if the bars fit the budget.
+    """
+    if length <= points:
+        return np.arange(length)
+
+    if uniform:
+        size = -(-length // points)
+        return np.maximum(length - size * np.arange(-(-length // size), 0, -1), 0)
+
+    middle = np.floor(np.linspace(1, length - 1, points - 1)).astype(np.int64)[:-1]
+    return np.concatenate(([0], middle, [length - 1]))
+
+
+def downsample_bars(data, starts):
+    """
+    Aggregates bars into one bar per bucket: the first open, highest high, lowest low, last close and total
+    volume, dated at the bucket's first bar.
+
+    Parameters:
+    - data (DataFrame): Stock data with OHLCV columns, indexed by date.
+    - starts (np.ndarray): Index of the first bar of each bucket, from bucket_starts.
+
+    Returns:
+    - pd.DataFrame: The aggregated bars.
+    """
+    if len(starts) == len(data):
+        return data
+
+    ends = np.append(starts[1:], len(data)) - 1
+    high = data["High"].to_numpy(dtype=np.float64)
+    low = data["Low"].to_numpy(dtype=np.float64)
+
+    return pd.DataFrame(
+        {
+            "Open": data["Open"].to_numpy()[starts],
+            "High": np.fmax.reduceat(high, starts),
+            "Low": np.fmin.reduceat(low, starts),
+            "Close": data["Close"].to_numpy()[ends],
+            "Volume": np.add.reduceat(data["Volume"].to_numpy(dtype=np.float64), starts),
+        },
+        index=data.index[starts],
+    )
+
+
+def downsample_line(series, starts):
+    """
+    Downsamples a line such as an indicator to one LTTB-chosen value per bucket, dated at the bucket's first bar.
+
+    Parameters:
+    - series (pd.Series): The line's values, one per bar.
+    - starts (np.ndarray): Index of the first bar of each bucket, from bucket_starts.
+
+    Returns:
+    - pd.Series: One value per bucket.
+    """
+    if len(starts) == len(series):
+        return series
+
+    return pd.Series(kernels.lttb(series.to_numpy(dtype=np.float64), starts), index=series.index[starts],
+                     name=series.name)
+
+
+def downsample_result(result, starts):
+    """
+    Downsamples an indicator result, which may be a Series, a tuple of Series or None, line by line.
+    """
+    if isinstance(result, tuple):
+        return tuple(downsample_result(value, starts) for value in result)
+    if result is None:
+        return None
+    return downsample_line(result, starts)
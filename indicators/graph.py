@@ -0,0 +1,170 @@
+import os
+import pandas as pd
+import indicators.compute as compute
+from indicators.bar_series import BAR_COLUMNS, BarSeries
+
+
+# Moving average periods charted for the "sma" and "ema" indicators
+SMA_PERIODS = (5, 10, 20, 50, 100, 200)
+EMA_PERIODS = (12, 26, 50, 200)
+
+# Averaging of the RSI, ATR, DMI and ADX charted and used in rules: "sma" for rolling means,
+# or "wilder" for Wilder's smoothing as quoted by most charting platforms
+INDICATOR_SMOOTHING = os.getenv("INDICATOR_SMOOTHING", "sma")
+
+# Node kinds taking the smoothing as their parameter after the period
+SMOOTHED_KINDS = ("rsi", "atr", "dmi", "adx")
+
+# Nodes of the indicator graph are tuples of a node kind followed by its parameters, e.g. ("ema", 12).
+# Mapping of node kinds to the functions computing them
+node_functions = {
+    "sma": compute.calculate_sma,
+    "ema": compute.calculate_ema,
+    "rsi": compute.calculate_rsi,
+    "macd": compute.calculate_macd,
+    "adx": compute.calculate_adx,
+    "atr": compute.calculate_atr,
+    "true range": compute.calculate_true_range,
+    "directional movement": compute.calculate_directional_movement,
+    "bollinger bands": compute.calculate_bollinger_bands,
+    "obv": compute.calculate_obv,
+    "dmi": compute.calculate_dmi,
+    "parabolic sar": compute.calculate_parabolic_sar,
+    "vroc": compute.calculate_vroc,
+}
+
+# Node kinds whose nodes are computed together for all planned periods in a single pass
+bank_functions = {
+    "sma": compute.calculate_sma_bank,
+    "ema": compute.calculate_ema_bank,
+}
+
+# Intermediate nodes a node reuses, as a function of the node's parameters returning
+# (dependency node, keyword argument the dependency is passed as) pairs
+node_dependencies = {
+    "macd": lambda short, long, signal: [(("ema", short), "ema_short"), (("ema", long), "ema_long")],
+    "atr": lambda period, smoothing="sma": [(("true range",), "true_range")],
+    "dmi": lambda period, smoothing="sma": [
+        (("atr", period, smoothing), "atr"),
+        (("directional movement",), "directional_movement"),
+    ],
+    "adx": lambda period, smoothing="sma": [(("dmi", period, smoothing), "dmi")],
+}
+
+# Mapping of the indicators users can request to the nodes charted for them
+indicator_nodes = {
+    "sma": [("sma", period) for period in SMA_PERIODS],
+    "ema": [("ema", period) for period in EMA_PERIODS],
+    "rsi": [("rsi", 14, INDICATOR_SMOOTHING)],
+    "macd": [("macd", 12, 26, 9)],
+    "adx": [("adx", 14, INDICATOR_SMOOTHING)],
+    "atr": [("atr", 14, INDICATOR_SMOOTHING)],
+    "bollinger bands": [("bollinger bands", 20)],
+    "obv": [("obv",)],
+    "dmi": [("dmi", 14, INDICATOR_SMOOTHING)],
+    "parabolic sar": [("parabolic sar", 0.02, 0.2)],
+    "vroc": [("vroc", 14)],
+}
+
+
+def _dependencies(node):
+    kind, *params = node
+    return node_dependencies[kind](*params) if kind in node_dependencies else []
+
+
+def plan(nodes):
+    """
+    Expands nodes into every node they depend on, ordered so that each node comes after its dependencies.
+
+    Parameters:
+    - nodes (list of tuple): The nodes to compute.
+
+    Returns:
+    - list of tuple: Each required node exactly once, in evaluation order.
+    """
+    ordered = []
+    visited = set()
+
+    def visit(node):
+        if node in visited:
+            return
+        visited.add(node)
+        for dependency, _ in _dependencies(node):
+            visit(dependency)
+        ordered.append(node)
+
+    for node in nodes:
+        visit(node)
+
+    return ordered
+
+
+def compute_nodes(data, nodes):
+    """
+    Computes each node once, passing already computed intermediates to the nodes that reuse them.
+
+    Parameters:
+    - data (DataFrame or BarSeries): Stock data with OHLCV columns.
+    - nodes (list of tuple): The nodes to compute.
+
+    Returns:
+    - dict: Maps every planned node (including intermediates) to its result, or to an IndicatorError if it failed.
+    """
+    results = {}
+    ordered = plan(nodes)
+
+    # Freeze the bars once so every memoized node reuses a single fingerprint of them
+    if (
+        isinstance(data, pd.DataFrame)
+        and not data.empty
+        and isinstance(data.index, pd.DatetimeIndex)
+        and data.index.tz is None
+        and all(column in data for column in BAR_COLUMNS)
+    ):
+        data = BarSeries.from_frame(data)
+
+    # Compute all moving averages of the same kind with one bank call
+    for kind, bank_function in bank_functions.items():
+        periods = [node[1] for node in ordered if node[0] == kind]
+        if len(periods) < 2:
+            continue
+
+        # A failed bank leaves the nodes to be computed one by one
+        bank = bank_function(data, periods)
+        if not isinstance(bank, compute.IndicatorError):
+            for column, period in enumerate(periods):
+                results[(kind, period)] = pd.Series(bank[:, column], index=data.index)
+
+    for node in ordered:
+        if node in results:
+            continue
+
+        kind, *params = node
+        inputs = {argument: results[dependency] for dependency, argument in _dependencies(node)}
+
+        # A node whose intermediate failed fails with the intermediate's error
+        failed = [value for value in inputs.values() if isinstance(value, compute.IndicatorError)]
+        if failed:
+            results[node] = failed[0]
+            continue
+
+        results[node] = node_functions[kind](data, *params, **inputs)
+
+    return results
+
+
+def compute_indicators(data, indicators):
+    """
+    Computes the chart values of the requested indicators, sharing intermediates between them.
+
+    Parameters:
+    - data (DataFrame or BarSeries): Stock data with OHLCV columns.
+    - indicators (list of str): Requested indicator names, e.g., ["adx", "dmi", "macd"]. Unknown names are ignored.
+
+    Returns:
+    - dict: Maps each known indicator to the list of its node results, in the order of indicator_nodes.
+    """
+    indicators = [indicator for indicator in indicators if indicator in indicator_nodes]
+    results = compute_nodes(data, [node for indicator in indicators for node in indicator_nodes[indicator]])
+
+    return {indicator: [results[node] for node in indicator_nodes[indicator]] for indicator in indicators}
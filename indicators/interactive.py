@@ -0,0 +1,380 @@
+import os
+import json
+import base64
+import numpy as np
+
+
+# Plotly.js bundle the browser draws the interactive charts with
+PLOTLY_JS_URL = os.getenv("PLOTLY_JS_URL", "https://cdn.plot.ly/plotly-2.35.2.min.js")
+
+# Height of the interactive charts in pixels
+INTERACTIVE_CHART_HEIGHT = int(os.getenv("INTERACTIVE_CHART_HEIGHT", "700"))
+
+# Plotly dash of each mplfinance line style
+LINE_DASHES = {
+    "solid": "solid",
+    "-": "solid",
+    "dashed": "dash",
+    "--": "dash",
+    "dotted": "dot",
+    ":": "dot",
+    "dashdot": "dashdot",
+    "-.": "dashdot",
+}
+
+# How each line of an indicator result is drawn, in the order of the result's lines, as the indicator charts
+# draw them. Options that are left out come from the indicator's entry in the indicator configuration.
+series_styles = {
+    "sma": [
+        {"label": "5 period SMA", "color": "blue"},
+        {"label": "10 period SMA", "color": "green"},
+        {"label": "20 period SMA", "color": "red"},
+        {"label": "50 period SMA", "color": "purple"},
+        {"label": "100 period SMA", "color": "orange"},
+        {"label": "200 period SMA", "color": "brown"},
+    ],
+    "ema": [
+        {"label": "12 period EMA", "color": "blue"},
+        {"label": "26 period EMA", "color": "green"},
+        {"label": "50 period EMA", "color": "purple"},
+        {"label": "200 period EMA", "color": "orange"},
+    ],
+    "bollinger bands": [
+        {"label": "Upper Band", "style": "--"},
+        {"label": "Lower Band", "style": "--"},
+    ],
+    "macd": [
+        {"label": "MACD Line", "color": "blue"},
+        {"label": "Signal Line", "color": "red"},
+        {"label": "Histogram", "color": "grey", "type": "bar"},
+    ],
+    "dmi": [
+        {"label": "+DI"},
+        {"label": "-DI", "color": "red"},
+    ],
+    "parabolic sar": [
+        {"label": "Parabolic SAR", "color": "red", "type": "markers", "panel": 0},
+    ],
+}
+
+
+def encode_values(values):
+    """
+    Encodes numbers as base64 of little-endian float32, a third of the size of the same numbers written
+    out in JSON. Missing values stay NaN.
+
+    Parameters:
+    - values (array-like): The numbers to encode.
+
+    Returns:
+    - str: The base64 encoded float32 values.
+    """
+    return base64.b64encode(np.asarray(values, dtype="<f4").tobytes()).decode("ascii")
+
+
+def encode_timestamps(index):
+    """
+    Delta-encodes the dates of bars as the first date in epoch seconds and the seconds between
+    consecutive bars as base64 of little-endian int32. The naive exchange-local dates are encoded
+    as if they were UTC, so the browser shows them unchanged in any time zone.
+
+    Parameters:
+    - index (DatetimeIndex): The dates of the bars.
+
+    Returns:
+    - dict: "start", the first date in epoch seconds, or None without bars, and "deltas", the encoded gaps.
+    """
+    seconds = np.asarray(index, dtype="datetime64[s]").astype(np.int64)
+    if len(seconds) == 0:
+        return {"start": None, "deltas": ""}
+
+    deltas = np.diff(seconds).astype("<i4")
+    return {"start": int(seconds[0]), "deltas": base64.b64encode(deltas.tobytes()).decode("ascii")}
+
+
+def _lines(result):
+    """
+    Returns the lines of an indicator result, which may be a Series, a tuple of Series or None.
+    """
+    if isinstance(result, tuple):
+        return list(result)
+    return [result]
+
+
+def indicator_series(indicator_results, config, validate):
+    """
+    Lists the lines of the indicators with the panel, colour and style the indicator charts draw them in.
+
+    Parameters:
+    - indicator_results (dict): Maps indicators to the list of their results, as from graph.compute_indicators.
+    - config (dict): Maps indicators to their "color", "style" and "panel", e.g., the plot module's indicator_config.
+    - validate (function): Returns whether a line has values worth drawing.
+
+    Returns:
+    - tuple: (series, skipped), the lines as dicts of "label", "values", "panel", "color", "dash" and "type",
+      and the indicators without any line to draw.
+    """
+    series = []
+    skipped = []
+
+    for indicator, results in indicator_results.items():
+        settings = config.get(indicator, {})
+        lines = [line for result in results for line in _lines(result)]
+        styles = series_styles.get(indicator, [{"label": indicator.upper()}] * len(lines))
+
+        drawn = False
+        for line, style in zip(lines, styles):
+            if not validate(line):
+                continue
+
+            drawn = True
+            series.append({
+                "label": style["label"],
+                "values": line,
+                "panel": style.get("panel", settings.get("panel", 1)),
+                "color": style.get("color", settings.get("color", "orange")),
+                "dash": LINE_DASHES.get(style.get("style", settings.get("style", "solid")), "solid"),
+                "type": style.get("type", "line"),
+            })
+
+        if not drawn:
+            skipped.append(indicator)
+
+    return series, skipped
+
+
+def chart_payload(title, stock_data, series, visible=None, volume=False, theme=None):
+    """
+    Packs a chart into a compact JSON payload for the browser: the bars and indicator lines as
+    float32 columns and the dates delta-encoded.
+
+    Parameters:
+    - title (str): Title of the chart, e.g., the ticker.
+    - stock_data (DataFrame): Stock data with OHLCV columns, indexed by date.
+    - series (list of dict): The indicator lines, from indicator_series, one value per bar.
+    - visible (int): Number of most recent bars shown at first, the others are reached by panning (optional).
+    - volume (bool): Whether to draw the volume in a panel of its own (default is False).
+    - theme (dict): "background" and "text" colours of the chart (optional).
+
+    Returns:
+    - str: The payload as JSON.
+    """
+    columns = ["Open", "High", "Low", "Close"] + (["Volume"] if volume else [])
+
+    payload = {
+        "title": title,
+        "bars": len(stock_data),
+        "visible": min(visible or len(stock_data), len(stock_data)),
+        "time": encode_timestamps(stock_data.index),
+        "columns": {column.lower(): encode_values(stock_data[column]) for column in columns},
+        "series": [dict(line, values=encode_values(line["values"])) for line in series],
+        "theme": theme or {},
+    }
+
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def chart_html(payload, height=INTERACTIVE_CHART_HEIGHT):
+    """
+    Builds the page that draws a chart payload with Plotly.js in the browser, which zooms and pans it
+    without asking the server again. The price axis refits to the bars in view.
+
+    Parameters:
+    - payload (str): The chart payload, from chart_payload.
+    - height (int): Height of the chart in pixels (default is INTERACTIVE_CHART_HEIGHT).
+
+    Returns:
+    - str: The HTML page.
+    """
+    # The payload is JSON, so only a closing script tag inside a string could end the script early
+    payload = payload.replace("</", "<\\/")
+
+    return _CHART_TEMPLATE.replace("{height}", str(height)).replace(
+        "{plotly}", PLOTLY_JS_URL).replace("{payload}", payload)
+
+
+_CHART_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<style>
+  html, body { margin: 0; background: transparent; font-family: sans-serif; }
+  #chart { width: 100%; height: {height}px; }
+  #error { color: #ff6b6b; padding: 1em; }
+</style>
+</head>
+<body>
+<div id="chart"></div>
+<script>
+const payload = {payload};
+
+function failed(message) {
+  document.getElementById("chart").innerHTML = '<div id="error"></div>';
+  document.getElementById("error").textContent = message;
+}
+</script>
+<script src="{plotly}" onerror="failed('The interactive chart library could not be loaded.')"></script>
+<script>
+// Decodes base64 little-endian numbers into a typed array
+function decode(text, type) {
+  const bytes = Uint8Array.from(atob(text), c => c.charCodeAt(0));
+  return new type(bytes.buffer);
+}
+
+// Plotly draws gaps for nulls, not for NaN
+function column(text) {
+  return Array.from(decode(text, Float32Array), v => Number.isNaN(v) ? null : v);
+}
+
+// Rebuilds the dates from the first date and the gaps between bars
+function dates(time, count) {
+  const deltas = time.deltas ? decode(time.deltas, Int32Array) : [];
+  const intraday = deltas.some(delta => delta % 86400 !== 0) || time.start % 86400 !== 0;
+  const labels = new Array(count);
+  let seconds = time.start;
+  for (let i = 0; i < count; i++) {
+    if (i > 0) seconds += deltas[i - 1];
+    const text = new Date(seconds * 1000).toISOString();
+    labels[i] = intraday ? text.slice(0, 16).replace("T", " ") : text.slice(0, 10);
+  }
+  return labels;
+}
+
+function draw() {
+  if (typeof Plotly === "undefined") return;
+
+  // Bars are placed by position, so there are no gaps for nights, weekends and holidays
+  const count = payload.bars;
+  const x = dates(payload.time, count);
+  const columns = {};
+  for (const name in payload.columns) columns[name] = column(payload.columns[name]);
+
+  // Stack the panels: the price, the volume if requested and the lower indicator panel if used
+  const lower = payload.series.some(line => line.panel !== 0);
+  const panels = ["price"].concat(columns.volume ? ["volume"] : [], lower ? ["lower"] : []);
+  const heights = {price: 3, volume: 1, lower: 1.5};
+  const total = panels.reduce((sum, panel) => sum + heights[panel], 0);
+  const axes = {};
+  const layout = {
+    title: {text: payload.title},
+    height: {height},
+    margin: {l: 60, r: 20, t: 50, b: 60},
+    showlegend: true,
+    legend: {orientation: "h", y: -0.08},
+    dragmode: "pan",
+    hovermode: "x unified",
+    paper_bgcolor: payload.theme.background || "white",
+    plot_bgcolor: payload.theme.background || "white",
+    font: {color: payload.theme.text || "black"},
+  };
+
+  let top = 1;
+  panels.forEach((panel, i) => {
+    const id = i === 0 ? "y" : "y" + (i + 1);
+    const bottom = Math.max(0, top - heights[panel] / total);
+    axes[panel] = id;
+    layout["yaxis" + (i === 0 ? "" : i + 1)] = {
+      domain: [bottom + (i === panels.length - 1 ? 0 : 0.02), top],
+      anchor: "x",
+      title: {text: panel === "price" ? "Price (USD)" : (panel === "volume" ? "Volume" : "")},
+      fixedrange: true,
+      gridcolor: "rgba(128, 128, 128, 0.3)",
+    };
+    top = bottom;
+  });
+
+  layout.xaxis = {
+    type: "category",
+    anchor: axes[panels[panels.length - 1]],
+    range: [count - payload.visible - 0.5, count - 0.5],
+    rangeslider: {visible: false},
+    nticks: 10,
+    showgrid: false,
+  };
+
+  const traces = [{
+    type: "candlestick",
+    name: payload.title,
+    x: x,
+    open: columns.open,
+    high: columns.high,
+    low: columns.low,
+    close: columns.close,
+    yaxis: axes.price,
+  }];
+
+  if (columns.volume) {
+    traces.push({type: "bar", name: "Volume", x: x, y: columns.volume, yaxis: axes.volume,
+                 marker: {color: "grey"}});
+  }
+
+  for (const line of payload.series) {
+    const trace = {
+      name: line.label,
+      x: x,
+      y: column(line.values),
+      yaxis: line.panel === 0 ? axes.price : axes.lower,
+    };
+    if (line.type === "bar") {
+      Object.assign(trace, {type: "bar", marker: {color: line.color}});
+    } else if (line.type === "markers") {
+      Object.assign(trace, {type: "scatter", mode: "markers", marker: {color: line.color, size: 4}});
+    } else {
+      Object.assign(trace, {type: "scatter", mode: "lines",
+                            line: {color: line.color, dash: line.dash, width: 1.5}});
+    }
+    traces.push(trace);
+  }
+
+  // Fits each panel's value axis to the bars in view
+  function fit(start, end) {
+    const first = Math.max(0, Math.ceil(start));
+    const last = Math.min(count - 1, Math.floor(end));
+    const update = {};
+    for (const panel of panels) {
+      let low = Infinity, high = -Infinity, bars = false;
+      for (const trace of traces) {
+        if (trace.yaxis !== axes[panel]) continue;
+        const lows = trace.low || trace.y, highs = trace.high || trace.y;
+        for (let i = first; i <= last; i++) {
+          if (lows[i] !== null && lows[i] < low) low = lows[i];
+          if (highs[i] !== null && highs[i] > high) high = highs[i];
+        }
+        bars = bars || trace.type === "bar";
+      }
+      if (low <= high) {
+        // Bars grow from zero, so a panel of positive bars starts there
+        const pad = (high - low) * 0.05 || Math.abs(high) * 0.05 || 1;
+        const axis = "yaxis" + (axes[panel] === "y" ? "" : axes[panel].slice(1));
+        update[axis + ".range"] = [bars && low >= 0 ? 0 : low - pad, high + pad];
+      }
+    }
+    return update;
+  }
+
+  Object.entries(fit(layout.xaxis.range[0], layout.xaxis.range[1])).forEach(([key, range]) => {
+    layout[key.split(".")[0]].range = range;
+  });
+
+  const chart = document.getElementById("chart");
+  Plotly.newPlot(chart, traces, layout, {responsive: true, scrollZoom: true, displaylogo: false});
+
+  chart.on("plotly_relayout", event => {
+    if (event["xaxis.range[0]"] !== undefined) {
+      Plotly.relayout(chart, fit(event["xaxis.range[0]"], event["xaxis.range[1]"]));
+    } else if (event["xaxis.range"] !== undefined) {
+      Plotly.relayout(chart, fit(event["xaxis.range"][0], event["xaxis.range"][1]));
+    } else if (event["xaxis.autorange"]) {
+      Plotly.relayout(chart, fit(0, count - 1));
+    }
+  });
+}
+
+try {
+  draw();
+} catch (e) {
+  failed("The interactive chart could not be drawn: " + e.message);
+}
+</script>
+</body>
+</html>
+"""
@@ -0,0 +1,353 @@
+import numpy as np
+import pandas as pd
+
+# Numba is optional, without it the kernels fall back to plain Python loops or pandas
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _parabolic_sar_loop(high, low, initial_af, max_af):
+    """
+    Parabolic SAR recursion shared by the compiled and the pure Python kernel.
+    """
+    n = len(high)
+    sar = np.empty(n)
+    if n == 0:
+        return sar
+
+    af = initial_af  # acceleration factor
+    ep = low[0]  # extreme price
+    trend = 1  # 1 for uptrend, -1 for downtrend
+
+    # Set the initial SAR value
+    sar[0] = low[0]
+    previous = sar[0]
+
+    for i in range(1, n):
+        # Calculate SAR based on trend
+        current = previous + af * (ep - previous)
+
+        if trend == 1:  # Uptrend
+            # Check for trend reversal to downtrend
+            if low[i] < current:
+                trend = -1
+                current = ep
+                af = initial_af
+                ep = high[i]
+            # Update extreme price and acceleration factor for uptrend
+            elif high[i] > ep:
+                ep = high[i]
+                af = min(af + initial_af, max_af)
+        else:  # Downtrend
+            # Check for trend reversal to uptrend
+            if high[i] > current:
+                trend = 1
+                current = ep
+                af = initial_af
+                ep = low[i]
+            # Update extreme price and acceleration factor for downtrend
+            elif low[i] < ep:
+                ep = low[i]
+                af = min(af + initial_af, max_af)
+
+        sar[i] = current
+        previous = current
+
+    return sar
+
+
+# Compile the kernel when Numba is available
+_parabolic_sar_compiled = njit(cache=True)(_parabolic_sar_loop) if njit is not None else None
+
+
+def parabolic_sar(high, low, initial_af=0.02, max_af=0.2):
+    """
+    Calculates the Parabolic SAR over raw arrays of high and low prices.
+
+    Parameters:
+    - high (array-like): High prices.
+    - low (array-like): Low prices.
+    - initial_af (float): The initial acceleration factor and its increment (default is 0.02).
+    - max_af (float): The maximum acceleration factor (default is 0.2).
+
+    Returns:
+    - np.ndarray: float64 array of SAR values, one per bar.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+
+    if _parabolic_sar_compiled is not None:
+        return _parabolic_sar_compiled(high, low, float(initial_af), float(max_af))
+
+    # Python floats in lists are much faster to index than NumPy scalars
+    return _parabolic_sar_loop(high.tolist(), low.tolist(), initial_af, max_af)
+
+
+def _ema_bank_loop(values, alphas):
+    """
+    Exponential moving averages for several smoothing factors in a single pass over the values.
+    """
+    n = len(values)
+    k = len(alphas)
+    out = np.empty((n, k))
+    state = np.full(k, np.nan)
+    weights = np.ones(k)
+    started = False
+
+    for i in range(n):
+        value = values[i]
+        observed = not np.isnan(value)
+
+        if started:
+            for j in range(k):
+                # Like pandas, the previous average keeps decaying through NaN values
+                weights[j] *= 1.0 - alphas[j]
+                if observed:
+                    state[j] = (weights[j] * state[j] + alphas[j] * value) / (weights[j] + alphas[j])
+                    weights[j] = 1.0
+        elif observed:
+            state[:] = value
+            started = True
+
+        out[i] = state
+
+    return out
+
+
+# Compile the kernel when Numba is available
+_ema_bank_compiled = njit(cache=True)(_ema_bank_loop) if njit is not None else None
+
+
+def ema_bank(values, periods):
+    """
+    Calculates exponential moving averages (pandas ewm(span=period, adjust=False)) for several periods at once.
+
+    Parameters:
+    - values (array-like): The values to average, e.g., closing prices.
+    - periods (list of int): The EMA periods.
+
+    Returns:
+    - np.ndarray: float64 array of shape (len(values), len(periods)), one column per period.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    alphas = 2.0 / (np.asarray(periods, dtype=np.float64) + 1.0)
+
+    if _ema_bank_compiled is not None:
+        return _ema_bank_compiled(values, alphas)
+
+    # Without Numba the recursion of each column runs fastest in pandas' compiled ewm
+    series = pd.Series(values)
+    out = np.empty((len(values), len(alphas)))
+    for column, alpha in enumerate(alphas):
+        out[:, column] = series.ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+    return out
+
+
+def sma_bank(values, periods):
+    """
+    Calculates simple moving averages (pandas rolling(window=period).mean()) for several periods
+    from one shared cumulative sum.
+
+    Parameters:
+    - values (array-like): The values to average, e.g., closing prices.
+    - periods (list of int): The SMA periods.
+
+    Returns:
+    - np.ndarray: float64 array of shape (len(values), len(periods)), one column per period.
+      Values are NaN until a full window is available and while the window contains a NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    out = np.full((n, len(periods)), np.nan)
+
+    # Cumulative sums of the values and of the count of valid values, with a leading zero.
+    # The values are centred on their first valid value to keep the sums small and precise.
+    valid = ~np.isnan(values)
+    offset = values[valid][0] if valid.any() else 0.0
+    totals = np.concatenate(([0.0], np.cumsum(np.where(valid, values - offset, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+
+    for column, period in enumerate(periods):
+        if period > n:
+            continue
+
+        window_totals = totals[period:] - totals[:-period]
+        window_counts = counts[period:] - counts[:-period]
+        out[period - 1:, column] = np.where(window_counts == period, window_totals / period + offset, np.nan)
+
+    return out
+
+
+def _ema_rows_loop(values, alpha):
+    """
+    Exponential moving average along the bars of every row of a 2-D array, advancing all rows bar by bar.
+    """
+    rows, n = values.shape
+    out = np.empty((rows, n))
+    state = np.full(rows, np.nan)
+
+    for i in range(n):
+        for row in range(rows):
+            value = values[row, i]
+
+            # NaN values carry the previous average forward, the first valid value starts the average
+            if not np.isnan(value):
+                if np.isnan(state[row]):
+                    state[row] = value
+                else:
+                    state[row] += alpha * (value - state[row])
+
+            out[row, i] = state[row]
+
+    return out
+
+
+# Compile the kernel when Numba is available
+_ema_rows_compiled = njit(cache=True)(_ema_rows_loop) if njit is not None else None
+
+
+def ema_rows(values, period):
+    """
+    Calculates the exponential moving average (pandas ewm(span=period, adjust=False)) of every row of a 2-D array.
+
+    Parameters:
+    - values (array-like): 2-D array with one row per series and one column per bar.
+    - period (int): The EMA period.
+
+    Returns:
+    - np.ndarray: float64 array of the same shape. Leading NaN values stay NaN and later NaN values
+      carry the previous average forward.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    alpha = 2.0 / (period + 1.0)
+
+    if _ema_rows_compiled is not None:
+        return _ema_rows_compiled(values, alpha)
+
+    # Without Numba advance every row at once, one bar per step
+    out = np.empty(values.shape)
+    state = np.full(values.shape[0], np.nan)
+    for i in range(values.shape[1]):
+        value = values[:, i]
+        state = np.where(np.isnan(state), value, np.where(np.isnan(value), state, state + alpha * (value - state)))
+        out[:, i] = state
+
+    return out
+
+
+def wilder_smooth(values, period):
+    """
+    Calculates Wilder's smoothing (a running average with smoothing factor 1 / period), seeded with the
+    simple average of the first period values.
+
+    Parameters:
+    - values (array-like): The values to smooth, e.g., gains or true ranges. Leading NaN values are skipped.
+    - period (int): The smoothing period.
+
+    Returns:
+    - np.ndarray: float64 array of the same length, NaN until the seed. Later NaN values carry the
+      previous average forward.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    smoothed = np.full(len(values), np.nan)
+
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0 or len(values) - valid[0] < period:
+        return smoothed
+
+    # The first average is the simple average of the first full window
+    start = valid[0] + period - 1
+    smoothed[start] = values[valid[0]:start + 1].mean()
+    alpha = 1.0 / period
+
+    # Each later average is y[i] = alpha * x[i] + (1 - alpha) * y[i - 1], the recursion of pandas' compiled ewm
+    seeded = np.concatenate(([smoothed[start]], values[start + 1:]))
+    smoothed[start:] = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+    return smoothed
+
+
+def _lttb_loop(values, starts, n):
+    """
+    Largest-Triangle-Three-Buckets selection shared by the compiled and the pure Python kernel.
+    """
+    buckets = len(starts)
+    out = np.full(buckets, np.nan)
+    previous_x = 0.0
+    previous_y = np.nan
+
+    for b in range(buckets):
+        start = starts[b]
+        end = starts[b + 1] if b + 1 < buckets else n
+
+        # Average of the next bucket's valid points, the third corner of the triangles
+        next_x = 0.0
+        next_y = 0.0
+        count = 0
+        if b + 1 < buckets:
+            next_end = starts[b + 2] if b + 2 < buckets else n
+            for i in range(end, next_end):
+                if not np.isnan(values[i]):
+                    next_x += i
+                    next_y += values[i]
+                    count += 1
+
+        chosen = -1
+        best = -1.0
+        for i in range(start, end):
+            value = values[i]
+            if np.isnan(value):
+                continue
+
+            # Without a point before, keep the first valid point, and without points after, the last one
+            if np.isnan(previous_y):
+                if chosen < 0:
+                    chosen = i
+                continue
+            if count == 0:
+                chosen = i
+                continue
+
+            # Keep the point spanning the largest triangle with the previous selection and the next average
+            area = abs((previous_x - next_x / count) * (value - previous_y)
+                       - (previous_x - i) * (next_y / count - previous_y))
+            if area > best:
+                best = area
+                chosen = i
+
+        if chosen >= 0:
+            out[b] = values[chosen]
+            previous_x = float(chosen)
+            previous_y = values[chosen]
+
+    return out
+
+
+# Compile the kernel when Numba is available
+_lttb_compiled = njit(cache=True)(_lttb_loop) if njit is not None else None
+
+
+def lttb(values, starts):
+    """
+    Downsamples a line with Largest-Triangle-Three-Buckets, choosing in each bucket the point that spans the
+    largest triangle with the point chosen before and the average of the next bucket. This keeps the peaks
+    and troughs a plain average or stride would flatten.
+
+    Parameters:
+    - values (array-like): The line's values. NaN values are never chosen.
+    - starts (array-like): Increasing index of the first value of each bucket, starting at 0.
+
+    Returns:
+    - np.ndarray: float64 array with the chosen value of each bucket, NaN for buckets without valid values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.int64)
+
+    if _lttb_compiled is not None:
+        return _lttb_compiled(values, starts, len(values))
+
+    # Python floats in lists are much faster to index than NumPy scalars
+    return _lttb_loop(values.tolist(), starts.tolist(), len(values))
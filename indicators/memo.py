@@ -0,0 +1,236 @@
+import os
+import inspect
+import threading
+import zlib
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+from indicators.bar_series import BarSeries
+
+
+# Memory budget of the indicator memo cache in bytes, and its maximum number of entries
+INDICATOR_MEMO_MAX_BYTES = int(os.getenv("INDICATOR_MEMO_MAX_BYTES", str(64 * 1024 * 1024)))
+INDICATOR_MEMO_MAX_ENTRIES = int(os.getenv("INDICATOR_MEMO_MAX_ENTRIES", "512"))
+
+# Columns hashed into a fingerprint, whichever of them the data contains
+FINGERPRINT_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# Parameter values that identify a call by value, other arguments such as precomputed intermediates are keyed by identity
+_KEY_TYPES = (int, float, str, bool)
+
+
+def fingerprint(data):
+    """
+    Computes a cheap fingerprint of a bar series. Appending, dropping or changing bars changes the fingerprint.
+    A BarSeries is read-only, so its fingerprint is computed once and kept on the series.
+
+    Parameters:
+    - data (DataFrame or BarSeries): Stock data with OHLCV columns and a DatetimeIndex.
+
+    Returns:
+    - tuple: (number of bars, first timestamp, last timestamp, CRC-32 checksum of the OHLCV values).
+    """
+    if isinstance(data, BarSeries):
+        if data.fingerprint is None:
+            data.fingerprint = _fingerprint(data)
+        return data.fingerprint
+
+    return _fingerprint(data)
+
+
+def _fingerprint(data):
+    index = data.index
+    if len(index) == 0:
+        return (0, None, None, 0)
+
+    # Hash the raw column bytes, the arrays are only copied if they are not contiguous
+    checksum = 0
+    for column in FINGERPRINT_COLUMNS:
+        if column in data:
+            values = np.ascontiguousarray(data[column].to_numpy())
+            checksum = zlib.crc32(values.view(np.uint8), checksum)
+
+    return (len(index), index[0].value, index[-1].value, checksum)
+
+
+def _nbytes(result):
+    """
+    Estimates the memory held by an indicator result, rendered image or chart page.
+    """
+    if isinstance(result, tuple):
+        return sum(_nbytes(item) for item in result)
+    if isinstance(result, pd.Series):
+        return int(result.memory_usage(index=True, deep=False))
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, (bytes, bytearray, str)):
+        return len(result)
+    return 0
+
+
+def _is_valid(result):
+    """
+    Checks whether a result is worth caching: failed calculations return an error, None or tuples of None.
+    """
+    if isinstance(result, Exception):
+        return False
+    if isinstance(result, tuple):
+        return all(item is not None for item in result)
+    return result is not None
+
+
+def _key_value(value):
+    """
+    Returns a hashable form of a parameter value, and whether the value is keyed by identity.
+    """
+    if isinstance(value, _KEY_TYPES) or value is None:
+        return value, False
+    if isinstance(value, (tuple, list)) and all(isinstance(item, _KEY_TYPES) for item in value):
+        return tuple(value), False
+    return ("id", id(value)), True
+
+
+class MemoCache:
+    """
+    Thread-safe LRU cache of indicator results keyed by bar fingerprint, indicator name and parameters,
+    bounded both by the number of entries and by the memory of the cached results.
+    """
+
+    def __init__(self, max_bytes=INDICATOR_MEMO_MAX_BYTES, max_entries=INDICATOR_MEMO_MAX_ENTRIES):
+        """
+        Parameters:
+        - max_bytes (int): Memory budget for the cached results in bytes (default is 64 MiB).
+        - max_entries (int): Maximum number of entries kept (default is 512).
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key):
+        """
+        Looks up an entry.
+
+        Parameters:
+        - key: The cache key.
+
+        Returns:
+        - tuple: (found, value), where found is False if the key is missing.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.counters["misses"] += 1
+                return False, None
+
+            # Mark the entry as most recently used
+            self.entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return True, entry[1]
+
+    def set(self, key, value, pinned=()):
+        """
+        Stores an entry, evicting the least recently used entries until the cache fits its bounds.
+        Results larger than the whole memory budget are not stored.
+
+        Parameters:
+        - key: The cache key.
+        - value: The result to store.
+        - pinned (tuple): Objects whose identity is part of the key. The entry keeps them alive so that
+          their id cannot be reused by another object while the entry exists.
+        """
+        size = _nbytes(value) + sum(_nbytes(item) for item in pinned)
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous[0]
+
+            self.entries[key] = (size, value, pinned)
+            self.nbytes += size
+
+            while len(self.entries) > self.max_entries or self.nbytes > self.max_bytes:
+                evicted_size = self.entries.popitem(last=False)[1][0]
+                self.nbytes -= evicted_size
+                self.counters["evictions"] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """
+        Returns a snapshot of the counters.
+
+        Returns:
+        - dict: Number of hits, misses and evictions, and the current number of entries and bytes held.
+        """
+        with self.lock:
+            return dict(self.counters, entries=len(self.entries), nbytes=self.nbytes)
+
+
+# Cache shared by every memoized indicator function in the process
+indicator_memo = MemoCache()
+
+
+def memoize(name, cache=None):
+    """
+    Decorator caching an indicator function's results by the fingerprint of its input bars.
+
+    The first argument of the function must be the stock data. The key holds the data's fingerprint,
+    the indicator name and every parameter. Scalar and tuple values are keyed by value, other arguments,
+    such as precomputed intermediates, by identity. Intermediates handed out by the cache are the same
+    objects on every hit, so calls reusing them hit as well.
+    Failed calculations are not cached. Cached results are shared between callers and must not be modified.
+
+    Parameters:
+    - name (str): Indicator name used in the cache key.
+    - cache (MemoCache): Cache to store the results in. Defaults to the shared indicator_memo.
+
+    Returns:
+    - callable: The decorator.
+    """
+
+    def decorator(function):
+        signature = inspect.signature(function)
+
+        @wraps(function)
+        def wrapper(data, *args, **kwargs):
+            memo = cache if cache is not None else indicator_memo
+
+            # Identify the call by its bars and parameters, data that cannot be fingerprinted is computed directly
+            try:
+                bound = signature.bind(data, *args, **kwargs)
+                bound.apply_defaults()
+                parameters = []
+                pinned = []
+                for parameter, value in list(bound.arguments.items())[1:]:
+                    key_value, by_identity = _key_value(value)
+                    parameters.append((parameter, key_value))
+                    if by_identity:
+                        pinned.append(value)
+                key = (fingerprint(data), name, tuple(parameters))
+            except Exception:
+                return function(data, *args, **kwargs)
+
+            found, result = memo.get(key)
+            if found:
+                return result
+
+            result = function(data, *args, **kwargs)
+            if _is_valid(result) and result is not data:
+                memo.set(key, result, tuple(pinned))
+
+            return result
+
+        wrapper.uncached = function
+        return wrapper
+
+    return decorator
@@ -0,0 +1,194 @@
+import os
+import itertools
+import multiprocessing
+import numpy as np
+import pandas as pd
+import indicators.backtest as backtest
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from indicators.bar_series import BarSeries
+
+
+# Number of processes running the backtests, defaults to one per core
+OPTIMIZE_PROCESSES = int(os.getenv("OPTIMIZE_PROCESSES", str(os.cpu_count() or 1)))
+
+# Grids with fewer combinations than this run in the calling process, where starting workers would cost more
+OPTIMIZE_MIN_PARALLEL_COMBINATIONS = 64
+
+# Strategies that can be optimized, named after the indicator they trade on. The entry and exit rules are
+# templates filled with each combination of the grid. The shared parameters determine the indicator values,
+# so combinations that only differ in their other parameters reuse the same indicator calculations.
+strategies = {
+    "rsi": {
+        "entry": "RSI({period}) < {lower}",
+        "exit": "RSI({period}) > {upper}",
+        "grid": {"period": list(range(5, 51)), "lower": [20, 25, 30, 35], "upper": [65, 70, 75, 80]},
+        "shared": ("period",),
+    },
+    "sma": {
+        "entry": "CROSS_ABOVE(Close, SMA({period}))",
+        "exit": "CROSS_BELOW(Close, SMA({period}))",
+        "grid": {"period": list(range(5, 205, 5))},
+        "shared": ("period",),
+    },
+    "ema": {
+        "entry": "CROSS_ABOVE(EMA({fast}), EMA({slow}))",
+        "exit": "CROSS_BELOW(EMA({fast}), EMA({slow}))",
+        "grid": {"fast": list(range(5, 55, 5)), "slow": list(range(20, 210, 10))},
+        "shared": ("fast", "slow"),
+    },
+    "macd": {
+        "entry": "CROSS_ABOVE(MACD({fast}, {slow}, {signal}), MACD_SIGNAL({fast}, {slow}, {signal}))",
+        "exit": "CROSS_BELOW(MACD({fast}, {slow}, {signal}), MACD_SIGNAL({fast}, {slow}, {signal}))",
+        "grid": {"fast": [6, 8, 10, 12, 15], "slow": [20, 26, 30, 35, 40], "signal": [5, 7, 9, 12]},
+        "shared": ("fast", "slow", "signal"),
+    },
+    "bollinger bands": {
+        "entry": "Close < BB_LOWER({period})",
+        "exit": "Close > BB_UPPER({period})",
+        "grid": {"period": list(range(10, 52, 2))},
+        "shared": ("period",),
+    },
+}
+
+# Backtest results reported for each combination, in table order
+RESULT_COLUMNS = ("total_return", "annual_return", "max_drawdown", "trades", "win_rate", "exposure")
+
+# Bars shared with the worker processes, attached once per process
+_worker_bars = None
+
+
+def grid_combinations(strategy):
+    """
+    Lists the parameter combinations of a strategy's grid, grouped so combinations with the same
+    shared parameters are adjacent. Crossovers of a fast and a slow average skip fast >= slow.
+
+    Parameters:
+    - strategy (dict): A strategy from the strategies mapping.
+
+    Returns:
+    - list of list of dict: The combinations, one list per group of shared parameters.
+    """
+    grid = strategy["grid"]
+    shared = strategy["shared"]
+    names = [*shared, *[name for name in grid if name not in shared]]
+
+    groups = {}
+    for values in itertools.product(*[grid[name] for name in names]):
+        combination = dict(zip(names, values))
+        if "fast" in combination and combination["fast"] >= combination["slow"]:
+            continue
+        groups.setdefault(tuple(combination[name] for name in shared), []).append(combination)
+
+    return list(groups.values())
+
+
+def _run_combinations(bars, strategy, combinations, timespan, cost):
+    """
+    Backtests each combination and returns a row of parameters and results per combination.
+    """
+    rows = []
+    for combination in combinations:
+        result = backtest.run_backtest(
+            bars,
+            strategy["entry"].format(**combination),
+            strategy["exit"].format(**combination),
+            timespan,
+            cost,
+        )
+        rows.append({**combination, **{column: result[column] for column in RESULT_COLUMNS}})
+
+    return rows
+
+
+def _attach_bars(name, length, dtype):
+    """
+    Worker process initializer: views the bars in the shared memory block without copying them.
+    """
+    global _worker_bars
+
+    # Workers share the parent's resource tracker, which unlinks the block if the parent dies before it does
+    block = shared_memory.SharedMemory(name=name)
+    timestamps = np.ndarray((length,), dtype=np.int64, buffer=block.buf)
+    values = np.ndarray((5, length), dtype=dtype, buffer=block.buf, offset=timestamps.nbytes)
+    _worker_bars = (block, BarSeries(timestamps, values))
+
+
+def _run_worker_chunk(strategy, combinations, timespan, cost):
+    return _run_combinations(_worker_bars[1], strategy, combinations, timespan, cost)
+
+
+def _process_context():
+    # Forked workers start instantly, but inside the app the server's threads would be copied
+    # into them in an unknown state, so there the workers are spawned fresh
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        in_app = get_script_run_ctx(suppress_warning=True) is not None
+    except ImportError:
+        in_app = False
+
+    fork = "fork" in multiprocessing.get_all_start_methods() and not in_app
+    return multiprocessing.get_context("fork" if fork else "spawn")
+
+
+def optimize(data, strategy_name, timespan="day", cost=0.0, rank_by="total_return", processes=OPTIMIZE_PROCESSES):
+    """
+    Backtests every parameter combination of a strategy's grid and ranks the combinations.
+
+    The bars are placed once in shared memory, which the worker processes view without copying. The grid is
+    split into chunks of combinations that share their indicator parameters, so each worker calculates the
+    indicator values of a chunk once and reuses them for the other parameters through the memo cache.
+
+    Parameters:
+    - data (DataFrame or BarSeries): Stock data with OHLCV columns, e.g., from fetch_stock_data.
+    - strategy_name (str): Name of a strategy in the strategies mapping, e.g., "rsi".
+    - timespan (str): Timespan of the bars, used to annualize the returns (default is "day").
+    - cost (float): Cost of each entry or exit as a fraction of the position (default is 0).
+    - rank_by (str): Result column the table is sorted by, highest first (default is "total_return").
+    - processes (int): Number of worker processes (default is one per core).
+
+    Returns:
+    - pd.DataFrame: One row per combination with its parameters and backtest results, best first.
+
+    Raises:
+    - ValueError: If the strategy is unknown or there are no bars.
+    """
+    if strategy_name not in strategies:
+        raise ValueError(f"Unknown strategy: {strategy_name}. Available strategies: {', '.join(strategies)}")
+    if len(data) == 0:
+        raise ValueError("There are no bars to optimize on.")
+
+    strategy = strategies[strategy_name]
+    groups = grid_combinations(strategy)
+    bars = data if isinstance(data, BarSeries) else BarSeries.from_frame(data)
+
+    if processes <= 1 or sum(len(group) for group in groups) < OPTIMIZE_MIN_PARALLEL_COMBINATIONS:
+        rows = _run_combinations(bars, strategy, [c for group in groups for c in group], timespan, cost)
+    else:
+        # Copy the timestamps and values into one shared memory block
+        block = shared_memory.SharedMemory(create=True, size=bars.timestamps.nbytes + bars.values.nbytes)
+        try:
+            np.ndarray(bars.timestamps.shape, dtype=np.int64, buffer=block.buf)[:] = bars.timestamps
+            np.ndarray(bars.values.shape, dtype=bars.values.dtype, buffer=block.buf,
+                       offset=bars.timestamps.nbytes)[:] = bars.values
+
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=_process_context(),
+                initializer=_attach_bars,
+                initargs=(block.name, len(bars), bars.values.dtype),
+            ) as executor:
+                chunks = executor.map(
+                    _run_worker_chunk,
+                    itertools.repeat(strategy),
+                    groups,
+                    itertools.repeat(timespan),
+                    itertools.repeat(cost),
+                )
+                rows = [row for chunk in chunks for row in chunk]
+        finally:
+            block.close()
+            block.unlink()
+
+    table = pd.DataFrame(rows)
+    return table.sort_values(rank_by, ascending=False, na_position="last", ignore_index=True)
@@ -1,7 +1,16 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import mplfinance as mpf
 import polygon.data_fetcher as fetch
 import indicators.calculations as calc
+import indicators.graph as graph
+import indicators.backtest as backtest
+import indicators.optimize as optimize
+import indicators.chart_cache as chart_cache
+import indicators.downsample as downsample
+import indicators.render_pool as render_pool
+import indicators.interactive as interactive
+import polygon.trading_calendar as trading_calendar
 
 
 # Mapping of indicator names to calculation functions
@@ -19,19 +28,45 @@ indicator_functions = {
     "vroc": calc.calculate_vroc,
 }
 
-# Configuration dictionary for each indicator's style
+# Configuration dictionary for each indicator's style and warm-up, the number of bars the
+# indicator consumes before its first complete value (for the longest period it charts and either smoothing)
 indicator_config = {
-    "sma": {"color": "blue", "style": "solid", "panel": 0},
-    "ema": {"color": "green", "style": "solid", "panel": 0},
-    "rsi": {"color": "red", "style": "solid", "panel": 1},
-    "macd": {"color": "purple", "style": "solid", "panel": 1},
-    "adx": {"color": "green", "style": "solid", "panel": 1},
-    "atr": {"color": "magenta", "style": "solid", "panel": 1},
-    "bollinger bands": {"color": "purple", "style": "solid", "panel": 0, "bands": True},
-    "obv": {"color": "orange", "style": "solid", "panel": 1},
-    "dmi": {"color": "blue", "style": "solid", "panel": 1},
-    "parabolic sar": {"color": "green", "style": "solid", "panel": 1},
-    "vroc": {"color": "orange", "style": "solid", "panel": 1},
+    "sma": {"color": "blue", "style": "solid", "panel": 0, "warmup": 199},
+    "ema": {"color": "green", "style": "solid", "panel": 0, "warmup": 199},
+    "rsi": {"color": "red", "style": "solid", "panel": 1, "warmup": 14},
+    "macd": {"color": "purple", "style": "solid", "panel": 1, "warmup": 33},
+    "adx": {"color": "green", "style": "solid", "panel": 1, "warmup": 27},
+    "atr": {"color": "magenta", "style": "solid", "panel": 1, "warmup": 14},
+    "bollinger bands": {"color": "purple", "style": "solid", "panel": 0, "bands": True, "warmup": 19},
+    "obv": {"color": "orange", "style": "solid", "panel": 1, "warmup": 0},
+    "dmi": {"color": "blue", "style": "solid", "panel": 1, "warmup": 14},
+    "parabolic sar": {"color": "green", "style": "solid", "panel": 1, "warmup": 0},
+    "vroc": {"color": "orange", "style": "solid", "panel": 1, "warmup": 14},
+}
+
+# mplfinance style of the indicator charts
+CHART_STYLE = "charles"
+
+# Number of bars shown on the chart for each timespan
+visible_bars = {
+    "minute": 390,
+    "hour": 140,
+    "day": 252,
+    "week": 104,
+    "month": 60,
+    "quarter": 40,
+    "year": 20,
+}
+
+# Number of bars sent to interactive charts for each timespan, which are reached by panning past the visible bars
+interactive_bars = {
+    "minute": 3900,
+    "hour": 1400,
+    "day": 2520,
+    "week": 520,
+    "month": 240,
+    "quarter": 80,
+    "year": 40,
 }
 
 
@@ -48,7 +83,53 @@ def validate_data(data):
     return data is not None and not data.isnull().all()
 
 
-def plot_current_indicators(ticker, indicators, timespan):
+def _normalize_indicators(indicators):
+    # Remove any empty strings or "None" entries from the indicators list
+    return [
+        indicator.lower()
+        for indicator in indicators
+        if indicator.strip() and indicator != "None"
+    ]
+
+
+def plan_chart_window(indicators, timespan, interactive_chart=False):
+    """
+    Plans the bars to fetch for a chart: the visible window, or the history of an interactive chart,
+    plus the largest warm-up of the requested indicators.
+
+    Parameters:
+    - indicators: list of str, the indicators to plot.
+    - timespan: str, timespan of the chart (e.g., 'day', 'week').
+    - interactive_chart: bool, whether the chart is drawn interactively in the browser (default is False).
+
+    Returns:
+    - tuple: (from_date, visible), where from_date is the start date to fetch in "YYYY-MM-DD" format,
+      counted back in trading days for daily and intraday bars, and visible is the number of bars to show.
+    """
+    visible = visible_bars.get(timespan, visible_bars["day"])
+    warmup = max(
+        (indicator_config[indicator]["warmup"] for indicator in _normalize_indicators(indicators)
+         if indicator in indicator_config),
+        default=0,
+    )
+
+    bars = interactive_bars.get(timespan, interactive_bars["day"]) if interactive_chart else visible
+
+    return trading_calendar.start_date_for_bars(timespan, bars + warmup), visible
+
+
+def _tail(values, bars):
+    """
+    Returns the last bars of an indicator result, which may be a Series, DataFrame, tuple of Series or None.
+    """
+    if isinstance(values, tuple):
+        return tuple(_tail(value, bars) for value in values)
+    if values is None:
+        return None
+    return values.iloc[-bars:]
+
+
+def plot_current_indicators(ticker, indicators, timespan, stock_data=None, interactive_chart=False):
     """
     Fetches the latest stock data for the current ticker and plots the indicators requested by the user.
 
@@ -56,34 +137,55 @@ def plot_current_indicators(ticker, indicators, timespan):
     - ticker: str, stock ticker symbol.
     - indicators: list of str, the indicators to plot.
     - timespan: str, timespan for the stock data (e.g., 'day', 'week', 'month').
+    - stock_data: DataFrame, stock data that was already fetched for this ticker and timespan (optional),
+      starting at the from_date planned by plan_chart_window.
+    - interactive_chart: bool, draw the chart in the browser with plot_interactive_indicators instead of
+      rendering it on the server (default is False).
 
     Functionality:
     - Checks for the current ticker and indicators in session state.
     - Fetches stock data for the specified ticker.
     - Displays an error if no ticker or data is available.
-    - Calls plot_indicators to visualize the ticker data and selected indicators.
+    - Calls plot_indicators or plot_interactive_indicators to visualize the ticker data and selected indicators.
     """
 
     # Check if a ticker is set in session state
     if ticker:
 
-        # Fetch stock data for the specified ticker
-        stock_data = fetch.fetch_stock_data(ticker, timespan)
+        # Fetch the visible window plus the indicators' warm-up unless the data was already fetched
+        from_date, visible = plan_chart_window(indicators, timespan, interactive_chart)
+        if stock_data is None:
+            stock_data = fetch.fetch_stock_data(ticker, timespan, from_date=from_date)
 
         # Check if fetched data is empty, indicating an issue with data retrieval
         if stock_data.empty:
             st.error("No data available for the specified ticker.")
 
+        # Let the browser draw the chart, so zooming and panning need no new request
+        elif interactive_chart:
+            plot_interactive_indicators(ticker, stock_data, indicators, visible, timespan)
+
         else:
             # Plot the indicators on the fetched stock data
-            plot_indicators(ticker, stock_data, indicators)
+            plot_indicators(ticker, stock_data, indicators, visible, timespan)
 
     else:
         # Display an error if no ticker is set
         st.error("No ticker or indicators to display.")
 
 
-def plot_indicators(ticker, stock_data, indicators):
+def _show_notices(notices):
+    """
+    Shows the warnings and errors collected while plotting, given as (level, message) pairs.
+    """
+    for level, message in notices:
+        if level == "error":
+            st.error(message)
+        else:
+            st.warning(message)
+
+
+def plot_indicators(ticker, stock_data, indicators, visible=None, timespan=None):
     """
     Plots the main stock price and specified technical indicators for the given ticker symbol.
 
@@ -91,30 +193,63 @@ def plot_indicators(ticker, stock_data, indicators):
     - ticker: str, the stock ticker symbol
     - stock_data: DataFrame, containing the stock's OHLC and volume data
     - indicators: list of str, the names of the indicators to plot
+    - visible: int, the number of most recent bars to show (optional). Earlier bars only warm up the indicators.
+    - timespan: str, timespan of the stock data, part of the rendered chart's cache key (optional).
 
     Returns:
     - None, displays plots using Streamlit
     """
 
     # Remove any empty strings or "None" entries from the indicators list
-    indicators = [
-        indicator.lower()
-        for indicator in indicators
-        if indicator.strip() and indicator != "None"
-    ]
+    indicators = _normalize_indicators(indicators)
+
+    # Serve the chart rendered earlier for the same request and bars without rendering it again
+    cache_key = chart_cache.chart_key(ticker, timespan, indicators, CHART_STYLE, stock_data, visible)
+    found, cached = chart_cache.rendered_charts.get(cache_key)
+    if found:
+        image, notices = cached
+        _show_notices(notices)
+        st.image(image, use_column_width=True)
+        return
+
+    # Warnings and errors are kept with the rendered chart so cache hits show them as well
+    notices = []
 
     # Determine whether to plot volume or close price based on indicators
     volume_requested = "volume" in indicators
 
     mpf_kwargs = {
         "type": "candle",  # Default to candlestick chart
-        "style": "charles",
+        "style": CHART_STYLE,
         "title": f"{ticker}",
         "ylabel": "Price (USD)",
         "addplot": [],
         "volume": False,  # Default to not showing volume
     }
 
+    # Compute every requested indicator at once so shared intermediates are only computed once
+    indicator_results = graph.compute_indicators(stock_data, indicators)
+    failed = any(isinstance(result, Exception) for results in indicator_results.values() for result in results)
+    indicator_results = calc.report_results(indicator_results, stock_data)
+
+    # Show only the visible window, the bars before it were fetched to warm up the indicators
+    if visible:
+        stock_data = stock_data.iloc[-visible:]
+        indicator_results = {
+            indicator: [_tail(values, visible) for values in results]
+            for indicator, results in indicator_results.items()
+        }
+
+    # Draw no more candles than the chart has room for. The indicators were computed on every bar,
+    # each line keeps its most significant value per candle.
+    starts = downsample.bucket_starts(len(stock_data), downsample.point_budget(mpf_kwargs["type"]), uniform=True)
+    if len(starts) < len(stock_data):
+        stock_data = downsample.downsample_bars(stock_data, starts)
+        indicator_results = {
+            indicator: [downsample.downsample_result(values, starts) for values in results]
+            for indicator, results in indicator_results.items()
+        }
+
     # Loop through indicators and plot them on the stock data
     for indicator in indicators:
 
@@ -122,8 +257,8 @@ def plot_indicators(ticker, stock_data, indicators):
         if indicator in indicator_functions:
 
             try:
-                # Calculate the indicator values
-                indicator_values = indicator_functions[indicator](stock_data)
+                # Get the calculated indicator values
+                indicator_values = indicator_results[indicator][0]
 
                 # Get the specific plot configuration for this indicator
                 config = indicator_config.get(indicator, {})
@@ -140,19 +275,14 @@ def plot_indicators(ticker, stock_data, indicators):
 
                     sma_plotted = False
 
-                    # Generate SMAs with different time periods and add them to the stock_data DataFrame
-                    stock_data["SMA_5"] = calc.calculate_sma(stock_data, period=5)
-                    stock_data["SMA_10"] = calc.calculate_sma(stock_data, period=10)
-                    stock_data["SMA_20"] = calc.calculate_sma(stock_data, period=20)
-                    stock_data["SMA_50"] = calc.calculate_sma(stock_data, period=50)
-                    stock_data["SMA_100"] = calc.calculate_sma(stock_data, period=100)
-                    stock_data["SMA_200"] = calc.calculate_sma(stock_data, period=200)
+                    # Get the SMAs with different time periods
+                    sma_5, sma_10, sma_20, sma_50, sma_100, sma_200 = indicator_results["sma"]
 
                     # Check if the 5, 10, and 20 period SMAs have valid data (i.e., not all NaN/None)
                     if (
-                        validate_data(stock_data["SMA_5"])
-                        and validate_data(stock_data["SMA_10"])
-                        and validate_data(stock_data["SMA_20"])
+                        validate_data(sma_5)
+                        and validate_data(sma_10)
+                        and validate_data(sma_20)
                     ):
 
                         sma_plotted = True
@@ -160,52 +290,50 @@ def plot_indicators(ticker, stock_data, indicators):
                         # Add the 5, 10, and 20 period SMAs to the plot
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["SMA_5"], color="blue", label="5 period SMA"
+                                sma_5, color="blue", label="5 period SMA"
                             )
                         )
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["SMA_10"],
+                                sma_10,
                                 color="green",
                                 label="10 period SMA",
                             )
                         )
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["SMA_20"], color="red", label="20 period SMA"
+                                sma_20, color="red", label="20 period SMA"
                             )
                         )
 
                     # Check if the 50 and 100 period SMAs have valid data
-                    if validate_data(stock_data["SMA_50"]) and validate_data(
-                        stock_data["SMA_100"]
-                    ):
+                    if validate_data(sma_50) and validate_data(sma_100):
                         sma_plotted = True
 
                         # Add the 50 and 100 period SMAs to the plot
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["SMA_50"],
+                                sma_50,
                                 color="purple",
                                 label="50 period SMA",
                             )
                         )
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["SMA_100"],
+                                sma_100,
                                 color="orange",
                                 label="100 period SMA",
                             )
                         )
 
                     # Separate display for 200 period SMA if it has valid data
-                    if validate_data(stock_data["SMA_200"]):
+                    if validate_data(sma_200):
                         sma_plotted = True
 
                         # Add the 200 period SMA to the plot
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["SMA_200"],
+                                sma_200,
                                 color="brown",
                                 label="200 period SMA",
                             )
@@ -213,64 +341,60 @@ def plot_indicators(ticker, stock_data, indicators):
 
                     # If none of the SMA's were plotted and the indicator was requested then report a warning
                     elif not sma_plotted:
-                        st.warning(
-                            f"Cannot plot {indicator.upper()} due to insufficient data"
-                        )
+                        notices.append((
+                            "warning",
+                            f"Cannot plot {indicator.upper()} due to insufficient data",
+                        ))
 
                 # Exponential Moving Average
                 elif indicator == "ema":
 
                     ema_plotted = False
 
-                    # Generate EMAs with specified time periods
-                    stock_data["EMA_12"] = calc.calculate_ema(stock_data, period=12)
-                    stock_data["EMA_26"] = calc.calculate_ema(stock_data, period=26)
-                    stock_data["EMA_50"] = calc.calculate_ema(stock_data, period=50)
-                    stock_data["EMA_200"] = calc.calculate_ema(stock_data, period=200)
+                    # Get the EMAs with specified time periods
+                    ema_12, ema_26, ema_50, ema_200 = indicator_results["ema"]
 
                     # Check if the 12 and 26 period EMAs have valid data
-                    if validate_data(stock_data["EMA_12"]) and validate_data(
-                        stock_data["EMA_26"]
-                    ):
+                    if validate_data(ema_12) and validate_data(ema_26):
                         ema_plotted = True
 
                         # Add the 12 and 26 period EMAs to the plot
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["EMA_12"],
+                                ema_12,
                                 color="blue",
                                 label="12 period EMA",
                             )
                         )
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["EMA_26"],
+                                ema_26,
                                 color="green",
                                 label="26 period EMA",
                             )
                         )
 
                     # Check if the 50 period EMA has valid data
-                    if validate_data(stock_data["EMA_50"]):
+                    if validate_data(ema_50):
                         ema_plotted = True
 
                         # Add the 50 period EMA to the plot
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["EMA_50"],
+                                ema_50,
                                 color="purple",
                                 label="50 period EMA",
                             )
                         )
 
                     # Check if the 200 period EMA has valid data
-                    if validate_data(stock_data["EMA_200"]):
+                    if validate_data(ema_200):
                         ema_plotted = True
 
                         # Add the 200 period EMA to the plot
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["EMA_200"],
+                                ema_200,
                                 color="orange",
                                 label="200 period EMA",
                             )
@@ -278,9 +402,10 @@ def plot_indicators(ticker, stock_data, indicators):
 
                     # If none of the EMA's were plotted and the indicator was requested then report a warning
                     elif not ema_plotted:
-                        st.warning(
-                            f"Cannot plot {indicator.upper()} due to insufficient data"
-                        )
+                        notices.append((
+                            "warning",
+                            f"Cannot plot {indicator.upper()} due to insufficient data",
+                        ))
 
                 # Special handling for Bollinger Bands, which has upper and lower bands
                 elif indicator == "bollinger bands":
@@ -289,25 +414,22 @@ def plot_indicators(ticker, stock_data, indicators):
                         isinstance(indicator_values, tuple)
                         and len(indicator_values) == 2
                     ):
-                        stock_data["BB_upper"], stock_data["BB_lower"] = (
-                            indicator_values
-                        )
+                        bb_upper, bb_lower = indicator_values
 
                     else:
-                        st.warning(
-                            f"Invalid Bollinger Bands data for {ticker}. Skipping plot."
-                        )
+                        notices.append((
+                            "warning",
+                            f"Invalid Bollinger Bands data for {ticker}. Skipping plot.",
+                        ))
                         continue
 
                     # Check if the stock data has data
-                    if validate_data(stock_data["BB_upper"]) and validate_data(
-                        stock_data["BB_lower"]
-                    ):
+                    if validate_data(bb_upper) and validate_data(bb_lower):
 
                         # Add the Bollinger Bands to the plot
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["BB_upper"],
+                                bb_upper,
                                 panel=panel,
                                 color=color,
                                 linestyle="--",
@@ -316,7 +438,7 @@ def plot_indicators(ticker, stock_data, indicators):
                         )
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data["BB_lower"],
+                                bb_lower,
                                 panel=panel,
                                 color=color,
                                 linestyle="--",
@@ -325,15 +447,16 @@ def plot_indicators(ticker, stock_data, indicators):
                         )
 
                     else:
-                        st.warning(
-                            f"Cannot plot {indicator.upper()} due to insufficient data"
-                        )
+                        notices.append((
+                            "warning",
+                            f"Cannot plot {indicator.upper()} due to insufficient data",
+                        ))
 
                 # Special handling for MACD, requires the histogram, signal line and MACD line
                 elif indicator == "macd":
 
-                    # Calculate the MACD components
-                    macd_line, signal_line, histogram = calc.calculate_macd(stock_data)
+                    # Get the MACD components
+                    macd_line, signal_line, histogram = indicator_values
 
                     # Check if MACD calculation succeeded
                     if (
@@ -372,15 +495,16 @@ def plot_indicators(ticker, stock_data, indicators):
                             )
                         )
                     else:
-                        st.warning(
-                            f"Cannot plot {indicator.upper()} due to insufficient data"
-                        )
+                        notices.append((
+                            "warning",
+                            f"Cannot plot {indicator.upper()} due to insufficient data",
+                        ))
 
                 # Plotting Parabolic SAR Indicator
                 elif indicator == "parabolic sar":
 
-                    # Calculate the Parabolic SAR values for the stock data
-                    sar = calc.calculate_parabolic_sar(stock_data)
+                    # Get the Parabolic SAR values for the stock data
+                    sar = indicator_values
 
                     # Check if the stock data has data
                     if validate_data(sar):
@@ -397,15 +521,16 @@ def plot_indicators(ticker, stock_data, indicators):
                         )
 
                     else:
-                        st.warning(
-                            f"Cannot plot {indicator.upper()} due to insufficient data"
-                        )
+                        notices.append((
+                            "warning",
+                            f"Cannot plot {indicator.upper()} due to insufficient data",
+                        ))
 
                 # Plotting Directional Movement Index (DMI) Indicator
                 elif indicator == "dmi":
 
-                    # Calculate +DI and -DI values for Directional Movement Index
-                    plus_di, minus_di = calc.calculate_dmi(stock_data)
+                    # Get +DI and -DI values for Directional Movement Index
+                    plus_di, minus_di = indicator_values
 
                     # Check if the stock data has data
                     if validate_data(plus_di) and validate_data(minus_di):
@@ -428,29 +553,28 @@ def plot_indicators(ticker, stock_data, indicators):
                             )
                         )
                     else:
-                        st.warning(
-                            f"Cannot plot {indicator.upper()} due to insufficient data"
-                        )
+                        notices.append((
+                            "warning",
+                            f"Cannot plot {indicator.upper()} due to insufficient data",
+                        ))
 
                 # Handle all other indicators
                 else:
 
-                    # Assign the calculated indicator values to a DataFrame column if they match the data length
-                    if len(indicator_values) == len(stock_data):
-                        stock_data[indicator] = indicator_values
-
-                    else:
-                        st.warning(
-                            f"{indicator.upper()} calculation mismatch for {ticker}. Skipping plot."
-                        )
+                    # Only plot the calculated indicator values if they match the data length
+                    if indicator_values is None or len(indicator_values) != len(stock_data):
+                        notices.append((
+                            "warning",
+                            f"{indicator.upper()} calculation mismatch for {ticker}. Skipping plot.",
+                        ))
                         continue
 
                     # Check if the stock data has data
-                    if validate_data(stock_data[indicator]):
+                    if validate_data(indicator_values):
                         # Plot the indicator chart
                         mpf_kwargs["addplot"].append(
                             mpf.make_addplot(
-                                stock_data[indicator],
+                                indicator_values,
                                 panel=panel,
                                 color=color,
                                 linestyle=linestyle,
@@ -459,14 +583,217 @@ def plot_indicators(ticker, stock_data, indicators):
                         )
 
                     else:
-                        st.warning(
-                            f"Cannot plot {indicator.upper()} due to insufficient data"
-                        )
+                        notices.append((
+                            "warning",
+                            f"Cannot plot {indicator.upper()} due to insufficient data",
+                        ))
 
             except Exception as e:
-                st.error(f"Error plotting {indicator.upper()} for {ticker}: {e}")
+                notices.append(("error", f"Error plotting {indicator.upper()} for {ticker}: {e}"))
                 continue
 
     # Plot
-    fig, ax = mpf.plot(stock_data, **mpf_kwargs, returnfig=True)
-    st.pyplot(fig)
+    try:
+        image = render_pool.render_chart(stock_data, "indicators", **mpf_kwargs)
+    except Exception as e:
+        _show_notices(notices)
+        st.error(f"Error rendering the chart for {ticker}: {e}")
+        return
+
+    # Failed calculations are not cached so the next request tries them again
+    if not failed:
+        chart_cache.rendered_charts.set(cache_key, (image, tuple(notices)))
+
+    _show_notices(notices)
+    st.image(image, use_column_width=True)
+
+
+def plot_interactive_indicators(ticker, stock_data, indicators, visible=None, timespan=None):
+    """
+    Plots the stock price and technical indicators as an interactive chart that is drawn in the browser.
+    The bars and indicator lines are sent as compact columns, so the chart zooms and pans over the whole
+    history without a new request and the server renders nothing.
+
+    Parameters:
+    - ticker: str, the stock ticker symbol
+    - stock_data: DataFrame, containing the stock's OHLC and volume data
+    - indicators: list of str, the names of the indicators to plot
+    - visible: int, the number of most recent bars shown at first (optional).
+    - timespan: str, timespan of the stock data, which sets how many bars of history are sent (optional).
+
+    Returns:
+    - None, displays the chart using Streamlit
+    """
+
+    # Remove any empty strings or "None" entries from the indicators list
+    indicators = _normalize_indicators(indicators)
+
+    # Serve the page built earlier for the same request and bars without encoding it again
+    cache_key = chart_cache.chart_key(ticker, timespan, indicators, "interactive", stock_data, visible)
+    found, cached = chart_cache.rendered_charts.get(cache_key)
+    if found:
+        html, notices = cached
+        _show_notices(notices)
+        components.html(html, height=interactive.INTERACTIVE_CHART_HEIGHT)
+        return
+
+    # Compute every requested indicator at once so shared intermediates are only computed once
+    indicator_results = graph.compute_indicators(stock_data, indicators)
+    failed = any(isinstance(result, Exception) for results in indicator_results.values() for result in results)
+    indicator_results = calc.report_results(indicator_results, stock_data)
+
+    # Send the history of the timespan, the bars before it were fetched to warm up the indicators
+    history = interactive_bars.get(timespan, interactive_bars["day"])
+    stock_data = stock_data.iloc[-history:]
+    indicator_results = {
+        indicator: [_tail(values, history) for values in results]
+        for indicator, results in indicator_results.items()
+    }
+
+    # Draw the indicator lines with the panels and colours of the indicator configuration
+    series, skipped = interactive.indicator_series(
+        indicator_results,
+        indicator_config,
+        lambda line: validate_data(line) and len(line) == len(stock_data),
+    )
+    notices = [
+        ("warning", f"Cannot plot {indicator.upper()} due to insufficient data")
+        for indicator in skipped
+    ]
+
+    # Match the chart to the app's theme
+    theme = {
+        "background": st.get_option("theme.backgroundColor"),
+        "text": st.get_option("theme.textColor"),
+    }
+
+    payload = interactive.chart_payload(ticker, stock_data, series, visible, "volume" in indicators, theme)
+    html = interactive.chart_html(payload)
+
+    # Failed calculations are not cached so the next request tries them again
+    if not failed:
+        chart_cache.rendered_charts.set(cache_key, (html, tuple(notices)))
+
+    _show_notices(notices)
+    components.html(html, height=interactive.INTERACTIVE_CHART_HEIGHT)
+
+
+def _fetch_backtest_bars(ticker, timespan, years):
+    """
+    Fetches the bars of a backtest period, counted back in trading days for daily bars.
+    """
+    bars = years * backtest.BARS_PER_YEAR.get(timespan, backtest.BARS_PER_YEAR["day"])
+    return fetch.fetch_stock_data(ticker, timespan, from_date=trading_calendar.start_date_for_bars(timespan, bars))
+
+
+def plot_backtest(ticker, timespan, entry_rule, exit_rule, years=10):
+    """
+    Fetches the stock data for the ticker, backtests the entry and exit rules on it and plots the
+    price with the trades and the equity curve.
+
+    Parameters:
+    - ticker: str, stock ticker symbol.
+    - timespan: str, timespan for the stock data (e.g., 'day', 'week').
+    - entry_rule: str, rule for entering a position, e.g., "CROSS_ABOVE(EMA(12), EMA(26))".
+    - exit_rule: str, rule for exiting the position, e.g., "CROSS_BELOW(EMA(12), EMA(26))".
+    - years: int, number of years of bars to backtest over (default is 10).
+
+    Returns:
+    - None, displays the results using Streamlit
+    """
+
+    if not ticker or not entry_rule or not exit_rule:
+        st.error("A ticker, an entry rule and an exit rule are needed to run a backtest.")
+        return
+
+    stock_data = _fetch_backtest_bars(ticker, timespan, years)
+    if stock_data.empty:
+        st.error("No data available for the specified ticker.")
+        return
+
+    try:
+        result = backtest.run_backtest(stock_data, entry_rule, exit_rule, timespan)
+    except ValueError as e:
+        st.error(f"Error running backtest for {ticker}: {e}")
+        return
+
+    # Summarize the performance of the strategy
+    columns = st.columns(4)
+    columns[0].metric("Total Return", f"{result['total_return']:.1%}",
+                      f"{result['total_return'] - result['buy_and_hold_return']:.1%} vs. buy and hold")
+    columns[1].metric("Max Drawdown", f"{result['max_drawdown']:.1%}")
+    columns[2].metric("Trades", result["trades"])
+    columns[3].metric("Win Rate", "n/a" if result["trades"] == 0 else f"{result['win_rate']:.0%}")
+
+    mpf_kwargs = {
+        "type": "line",
+        "style": "charles",
+        "title": f"{ticker} Backtest",
+        "ylabel": "Price (USD)",
+        "addplot": [
+            mpf.make_addplot(result["equity"], panel=1, color="blue", ylabel="Equity", label="Equity"),
+        ],
+    }
+
+    # Mark the closes the trades were entered and exited at
+    if result["trades"] > 0:
+        close = stock_data["Close"]
+        mpf_kwargs["addplot"].append(
+            mpf.make_addplot(close.where(result["entries"]), type="scatter", marker="^", markersize=40, color="green")
+        )
+        mpf_kwargs["addplot"].append(
+            mpf.make_addplot(close.where(result["exits"]), type="scatter", marker="v", markersize=40, color="red")
+        )
+
+    # Plot
+    try:
+        image = render_pool.render_chart(stock_data, "backtest", **mpf_kwargs)
+    except Exception as e:
+        st.error(f"Error rendering the backtest chart for {ticker}: {e}")
+        return
+
+    st.image(image, use_column_width=True)
+
+
+def plot_optimization(ticker, timespan, strategy_name, years=10):
+    """
+    Fetches the stock data for the ticker, backtests every parameter combination of a strategy
+    and displays the combinations ranked by their total return.
+
+    Parameters:
+    - ticker: str, stock ticker symbol.
+    - timespan: str, timespan for the stock data (e.g., 'day', 'week').
+    - strategy_name: str, indicator whose strategy is optimized, e.g., 'rsi' (see optimize.strategies).
+    - years: int, number of years of bars to backtest over (default is 10).
+
+    Returns:
+    - None, displays the results using Streamlit
+    """
+
+    if not ticker:
+        st.error("A ticker is needed to run an optimization.")
+        return
+
+    strategy_name = strategy_name.strip().lower()
+    if strategy_name not in optimize.strategies:
+        st.warning(f"Optimization is not available for {strategy_name}. "
+                   f"Available indicators: {', '.join(optimize.strategies)}")
+        return
+
+    stock_data = _fetch_backtest_bars(ticker, timespan, years)
+    if stock_data.empty:
+        st.error("No data available for the specified ticker.")
+        return
+
+    try:
+        with st.spinner(f"Backtesting {strategy_name.upper()} parameters for {ticker}..."):
+            table = optimize.optimize(stock_data, strategy_name, timespan)
+    except ValueError as e:
+        st.error(f"Error running optimization for {ticker}: {e}")
+        return
+
+    strategy = optimize.strategies[strategy_name]
+    st.subheader(f"{ticker} {strategy_name.upper()} Optimization")
+    st.caption(f"Entry: {strategy['entry']} · Exit: {strategy['exit']}")
+    percentages = ["total_return", "annual_return", "max_drawdown", "win_rate", "exposure"]
+    st.dataframe(table.style.format("{:.1%}", subset=percentages, na_rep="n/a"), hide_index=True)
@@ -0,0 +1,211 @@
+import os
+import time
+import atexit
+import threading
+import multiprocessing
+import numpy as np
+import mplfinance as mpf
+import indicators.rendering as rendering
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from indicators.bar_series import BarSeries
+
+
+# Number of worker processes rendering charts, defaults to one per core. 0 renders in the calling thread.
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", str(os.cpu_count() or 1)))
+
+# Maximum number of charts waiting for or being rendered by the pool. Requests beyond it wait for a free slot.
+CHART_RENDER_QUEUE = int(os.getenv("CHART_RENDER_QUEUE", str(max(1, CHART_RENDER_WORKERS) * 4)))
+
+# Seconds a chart may take from the request, including the wait for a slot, before it is given up
+CHART_RENDER_TIMEOUT = float(os.getenv("CHART_RENDER_TIMEOUT", "30"))
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(1, CHART_RENDER_QUEUE))
+
+
+class RenderPoolBusy(TimeoutError):
+    """
+    Raised when a chart cannot be rendered in time because the pool's queue stays full or the render is too slow.
+    """
+
+
+def chart_spec(data, name="chart", **mpf_kwargs):
+    """
+    Packs a chart into a compact payload of plain arrays and options that is cheap to send to a worker.
+
+    Parameters:
+    - data (DataFrame or BarSeries): Stock data with OHLCV columns, indexed by date.
+    - name (str): Name of the chart in the render metrics (default is "chart").
+    - **mpf_kwargs: Keyword arguments for mpf.plot. Added plots from mpf.make_addplot are sent as their
+      values and options.
+
+    Returns:
+    - dict: The chart spec with "name", "timestamps" and "values" of the bars, "addplots" as
+      (values, options) pairs and the remaining mpf.plot "options".
+    """
+    bars = data if isinstance(data, BarSeries) else BarSeries.from_frame(data)
+
+    addplots = [
+        (
+            np.asarray(addplot["data"], dtype=np.float64),
+            {key: value for key, value in addplot.items() if key != "data" and value is not None},
+        )
+        for addplot in mpf_kwargs.get("addplot", [])
+    ]
+
+    return {
+        "name": name,
+        "timestamps": bars.timestamps,
+        "values": bars.values,
+        "addplots": addplots,
+        "options": {key: value for key, value in mpf_kwargs.items() if key != "addplot"},
+    }
+
+
+def render_spec(spec):
+    """
+    Renders a chart spec to PNG bytes. Runs in the worker processes.
+
+    Parameters:
+    - spec (dict): The chart spec, from chart_spec.
+
+    Returns:
+    - tuple: (PNG bytes, metrics of the render).
+    """
+    data = BarSeries(spec["timestamps"], spec["values"]).to_frame()
+    addplot = [mpf.make_addplot(values, **options) for values, options in spec["addplots"]]
+
+    image = rendering.render_chart(data, spec["name"], addplot=addplot, **spec["options"])
+    return image, rendering.recent_renders[-1]
+
+
+def _process_context():
+    # Forked workers start instantly, but inside the app the server's threads would be copied
+    # into them in an unknown state, so there the workers are spawned fresh
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        in_app = get_script_run_ctx(suppress_warning=True) is not None
+    except ImportError:
+        in_app = False
+
+    fork = "fork" in multiprocessing.get_all_start_methods() and not in_app
+    return multiprocessing.get_context("fork" if fork else "spawn")
+
+
+def _get_pool():
+    """
+    Returns the process-wide render pool, starting it on first use.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=CHART_RENDER_WORKERS, mp_context=_process_context())
+        return _pool
+
+
+def _reset_pool(broken):
+    """
+    Drops a pool whose worker died, the next render starts a new one.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _recycle_pool(stuck):
+    """
+    Replaces a pool whose worker is stuck on a render that was given up. Its workers are killed, so
+    the renders they held fail and free their queue slots, and the next render starts a new pool.
+    """
+    terminate_workers = getattr(stuck, "terminate_workers", None)
+    if terminate_workers is not None:
+        terminate_workers()
+    else:
+        # ProcessPoolExecutor has no public way to stop a running task before Python 3.14
+        for process in list((stuck._processes or {}).values()):
+            process.terminate()
+    _reset_pool(stuck)
+
+
+def shutdown():
+    """
+    Stops the render pool's worker processes.
+    """
+    global _pool
+
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown)
+
+
+def render_chart(data, name="chart", timeout=CHART_RENDER_TIMEOUT, **mpf_kwargs):
+    """
+    Renders a chart with mplfinance in a worker process and returns it as PNG bytes, so rendering
+    does not hold the GIL of the Streamlit server. Takes the same arguments as rendering.render_chart.
+
+    At most CHART_RENDER_QUEUE charts are queued or rendering at a time. Further requests wait for a
+    free slot, which slows busy sessions down instead of letting the queue grow without bound. A render
+    that runs past the timeout is stopped by recycling the pool, so it does not keep a worker and a slot.
+
+    Parameters:
+    - data (DataFrame or BarSeries): Stock data with OHLCV columns, indexed by date.
+    - name (str): Name of the chart in the render metrics (default is "chart").
+    - timeout (float): Seconds to wait for a slot and the render together (default is CHART_RENDER_TIMEOUT).
+    - **mpf_kwargs: Keyword arguments for mpf.plot, e.g., type, style and addplot.
+
+    Returns:
+    - bytes: The PNG image.
+
+    Raises:
+    - RenderPoolBusy: If no slot frees up or the render does not finish within the timeout.
+    - Exception: Any error raised by mplfinance or Matplotlib while rendering.
+    """
+    if CHART_RENDER_WORKERS <= 0:
+        return rendering.render_chart(data, name, **mpf_kwargs)
+
+    deadline = time.monotonic() + timeout
+    spec = chart_spec(data, name, **mpf_kwargs)
+
+    # A render that lost its worker because the pool was recycled is tried once more on the new pool
+    for attempt in range(2):
+        # Backpressure: wait for a free slot in the bounded queue
+        if not _slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise RenderPoolBusy(f"The chart queue stayed full for {timeout:g} seconds.")
+
+        pool = _get_pool()
+        try:
+            future = pool.submit(render_spec, spec)
+        except BaseException as e:
+            _slots.release()
+            if isinstance(e, BrokenProcessPool):
+                _reset_pool(pool)
+            raise
+
+        # The slot is freed when the worker is done, even if the caller gave up waiting
+        future.add_done_callback(lambda _: _slots.release())
+
+        try:
+            image, metrics = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            # A render that already started would keep its worker and its slot until it finishes
+            if not future.cancel():
+                _recycle_pool(pool)
+            raise RenderPoolBusy(f"The chart was not rendered within {timeout:g} seconds.") from None
+        except BrokenProcessPool:
+            _reset_pool(pool)
+            if attempt:
+                raise
+            continue
+
+        rendering.record_render(metrics)
+        return image
@@ -0,0 +1,123 @@
+import io
+import os
+import time
+import threading
+from collections import deque
+
+import matplotlib
+
+# Render without a GUI backend, which would keep every figure alive in a window manager
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import mplfinance as mpf
+
+
+# Number of recent renders whose metrics are kept
+RENDER_METRICS_HISTORY = int(os.getenv("RENDER_METRICS_HISTORY", "100"))
+
+# Options charts are saved with, the ones st.pyplot uses so charts look the same as before
+SAVEFIG_OPTIONS = {"format": "png", "dpi": 200, "bbox_inches": "tight"}
+
+# pyplot keeps its figures in global state that is not thread-safe, so sessions render one at a time.
+# Rendering holds the GIL for most of its time, so this costs little throughput.
+_render_lock = threading.Lock()
+
+# Totals over all renders in the process, and the metrics of the most recent renders
+_totals = {"renders": 0, "failures": 0, "seconds": 0.0, "max_seconds": 0.0}
+recent_renders = deque(maxlen=RENDER_METRICS_HISTORY)
+_metrics_lock = threading.Lock()
+
+
+def _rss_bytes():
+    """
+    Returns the resident memory of the process in bytes, or None where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def render_chart(data, name="chart", **mpf_kwargs):
+    """
+    Plots stock data with mplfinance and returns the chart as PNG bytes. Every figure opened while
+    rendering is closed afterwards, also when plotting fails, so long-running servers do not accumulate them.
+
+    Parameters:
+    - data (DataFrame): Stock data with OHLCV columns, indexed by date.
+    - name (str): Name of the chart in the render metrics, e.g., "indicators" (default is "chart").
+    - **mpf_kwargs: Keyword arguments for mpf.plot, e.g., type, style and addplot.
+
+    Returns:
+    - bytes: The PNG image.
+
+    Raises:
+    - Exception: Any error raised by mplfinance or Matplotlib, after the figures were closed.
+    """
+    with _render_lock:
+        open_before = set(plt.get_fignums())
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        image = None
+
+        try:
+            fig, _ = mpf.plot(data, **mpf_kwargs, returnfig=True)
+            buffer = io.BytesIO()
+            fig.savefig(buffer, **SAVEFIG_OPTIONS)
+            image = buffer.getvalue()
+            return image
+
+        finally:
+            # Close the figures mplfinance opened, no other session can open figures while the lock is held
+            for number in set(plt.get_fignums()) - open_before:
+                plt.close(number)
+
+            rss_after = _rss_bytes()
+            record_render({
+                "name": name,
+                "bars": len(data),
+                "seconds": time.perf_counter() - start,
+                "image_bytes": len(image) if image is not None else 0,
+                "rss_bytes": rss_after,
+                "rss_change_bytes": rss_after - rss_before if rss_after is not None and rss_before is not None else None,
+                "failed": image is None,
+            })
+
+
+def record_render(metrics):
+    """
+    Adds the metrics of one render to the totals and the recent renders. Also records renders
+    that ran in a render pool worker process.
+
+    Parameters:
+    - metrics (dict): The render's name, bars, seconds, image_bytes, rss_bytes, rss_change_bytes and failed flag.
+    """
+    with _metrics_lock:
+        _totals["renders"] += 1
+        _totals["failures"] += metrics["failed"]
+        _totals["seconds"] += metrics["seconds"]
+        _totals["max_seconds"] = max(_totals["max_seconds"], metrics["seconds"])
+        recent_renders.append(metrics)
+
+
+def stats():
+    """
+    Returns a snapshot of the render metrics.
+
+    Returns:
+    - dict: Number of renders and failures, total, mean and maximum render seconds, the current resident
+      memory in bytes, the number of figures still open in this process (0 unless figures leak) and the
+      metrics of the most recent renders, oldest first. The resident memory of renders in pool workers
+      is the worker's.
+    """
+    with _metrics_lock:
+        renders = _totals["renders"]
+        return dict(
+            _totals,
+            mean_seconds=_totals["seconds"] / renders if renders else 0.0,
+            rss_bytes=_rss_bytes(),
+            open_figures=len(plt.get_fignums()),
+            recent=list(recent_renders),
+        )
@@ -0,0 +1,293 @@
+import ast
+import operator
+import pandas as pd
+import indicators.graph as graph
+
+
+# Price and volume columns rules can refer to by name
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# Mapping of rule function names to the indicator computing them and the position of the
+# value in the indicator's result tuple (None for indicators returning a single Series)
+rule_functions = {
+    "SMA": ("sma", None),
+    "EMA": ("ema", None),
+    "RSI": ("rsi", None),
+    "MACD": ("macd", 0),
+    "MACD_SIGNAL": ("macd", 1),
+    "MACD_HIST": ("macd", 2),
+    "ADX": ("adx", None),
+    "ATR": ("atr", None),
+    "BB_UPPER": ("bollinger bands", 0),
+    "BB_LOWER": ("bollinger bands", 1),
+    "OBV": ("obv", None),
+    "PLUS_DI": ("dmi", 0),
+    "MINUS_DI": ("dmi", 1),
+    "SAR": ("parabolic sar", None),
+    "VROC": ("vroc", None),
+}
+
+# Functions comparing two expressions over consecutive bars, e.g., CROSS_ABOVE(EMA(12), EMA(26))
+signal_functions = ("CROSS_ABOVE", "CROSS_BELOW")
+
+# Operators allowed in rules
+comparison_operators = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+arithmetic_operators = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+
+
+def _validate(node):
+    """
+    Checks that a parsed rule only uses comparisons, and/or/not, arithmetic, numbers,
+    price columns and rule functions with numeric parameters. Raises ValueError otherwise.
+    """
+    if isinstance(node, ast.Expression):
+        _validate(node.body)
+
+    elif isinstance(node, ast.BoolOp):
+        for value in node.values:
+            _validate(value)
+
+    elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Not, ast.USub)):
+        _validate(node.operand)
+
+    elif isinstance(node, ast.Compare):
+        if not all(type(op) in comparison_operators for op in node.ops):
+            raise ValueError("Unsupported comparison in rule.")
+        for value in [node.left, *node.comparators]:
+            _validate(value)
+
+    elif isinstance(node, ast.BinOp):
+        if type(node.op) not in arithmetic_operators:
+            raise ValueError("Unsupported arithmetic in rule.")
+        _validate(node.left)
+        _validate(node.right)
+
+    elif isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported value in rule: {node.value!r}")
+
+    elif isinstance(node, ast.Name):
+        if node.id.capitalize() not in PRICE_COLUMNS:
+            raise ValueError(f"Unknown name in rule: {node.id}")
+
+    elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id.upper() in signal_functions:
+        if node.keywords or len(node.args) != 2:
+            raise ValueError(f"{node.func.id.upper()} takes two expressions: {ast.unparse(node)}")
+        for argument in node.args:
+            _validate(argument)
+
+    elif isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id.upper() not in rule_functions:
+            raise ValueError(f"Unknown function in rule: {ast.unparse(node.func)}")
+        if node.keywords:
+            raise ValueError(f"Keyword arguments are not supported in rules: {ast.unparse(node)}")
+        for argument in node.args:
+            if not isinstance(argument, ast.Constant) or isinstance(argument.value, bool) \
+                    or not isinstance(argument.value, (int, float)):
+                raise ValueError(f"Function parameters must be numbers: {ast.unparse(node)}")
+
+    else:
+        raise ValueError(f"Unsupported expression in rule: {ast.unparse(node)}")
+
+
+def parse_rule(rule):
+    """
+    Parses a screening rule such as "RSI(14) < 30 and Close > SMA(200)".
+
+    Rules combine comparisons and crossovers with and, or and not. Each side of a comparison is a number,
+    a price column (Open, High, Low, Close, Volume), a rule function with numeric parameters (e.g., SMA(200),
+    MACD(12, 26, 9)), or arithmetic on these. CROSS_ABOVE(a, b) holds on the bar where a moves from at or below b
+    to above it, and CROSS_BELOW(a, b) on the bar where it moves from at or above b to below it.
+    Nothing else is evaluated, so rules from users are safe to run.
+
+    Parameters:
+    - rule (str): The rule text.
+
+    Returns:
+    - ast.Expression: The validated rule.
+
+    Raises:
+    - ValueError: If the rule is not valid.
+    """
+    try:
+        tree = ast.parse(rule.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Invalid rule syntax: {e.msg}") from None
+
+    _validate(tree)
+    return tree
+
+
+def rule_indicators(tree):
+    """
+    Returns the names of the indicators a parsed rule uses, e.g., {"rsi", "sma"}.
+    """
+    return {
+        rule_functions[node.func.id.upper()][0]
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and node.func.id.upper() in rule_functions
+    }
+
+
+def rule_terms(tree):
+    """
+    Returns the price columns and rule functions a parsed rule refers to, as normalized text in order of
+    appearance, e.g., ["RSI(14)", "Close", "SMA(200)"].
+    """
+    terms = []
+
+    def visit(node):
+        # Function names are part of their call, not price columns, and crossovers compare other terms
+        if isinstance(node, ast.Call) and node.func.id.upper() in signal_functions:
+            for argument in node.args:
+                visit(argument)
+            return
+        if isinstance(node, (ast.Name, ast.Call)):
+            term = _term(node)
+            if term not in terms:
+                terms.append(term)
+            return
+        for child in ast.iter_child_nodes(node):
+            visit(child)
+
+    visit(tree)
+    return terms
+
+
+def _term(node):
+    if isinstance(node, ast.Name):
+        return node.id.capitalize()
+    return f"{node.func.id.upper()}({', '.join(repr(argument.value) for argument in node.args)})"
+
+
+def _term_values(node, data):
+    """
+    Computes the Series of a price column or rule function over the data.
+    """
+    if isinstance(node, ast.Name):
+        return data[node.id.capitalize()].astype(float)
+
+    indicator, position = rule_functions[node.func.id.upper()]
+    parameters = [argument.value for argument in node.args]
+
+    # Smoothed indicators are averaged the same way as on the chart
+    if indicator in graph.SMOOTHED_KINDS:
+        result = graph.node_functions[indicator](data, *parameters, smoothing=graph.INDICATOR_SMOOTHING)
+    else:
+        result = graph.node_functions[indicator](data, *parameters)
+    if isinstance(result, Exception):
+        raise ValueError(str(result))
+
+    return result[position] if position is not None else result
+
+
+def evaluate_rule(tree, data):
+    """
+    Evaluates a parsed rule on every bar of the data.
+
+    Parameters:
+    - tree (ast.Expression): The rule, from parse_rule.
+    - data (DataFrame or BarSeries): Stock data with OHLCV columns.
+
+    Returns:
+    - tuple: (matches, terms), where matches is a boolean Series that is True on bars where the rule holds
+      (comparisons with missing values are False), and terms maps the text of each price column and rule
+      function to its Series.
+
+    Raises:
+    - ValueError: If an indicator of the rule cannot be calculated.
+    """
+    terms = {}
+
+    def evaluate(node):
+        if isinstance(node, ast.Expression):
+            return evaluate(node.body)
+
+        if isinstance(node, ast.BoolOp):
+            combine = operator.and_ if isinstance(node.op, ast.And) else operator.or_
+            result = evaluate(node.values[0])
+            for value in node.values[1:]:
+                result = combine(result, evaluate(value))
+            return result
+
+        if isinstance(node, ast.UnaryOp):
+            operand = evaluate(node.operand)
+            return ~operand if isinstance(node.op, ast.Not) else -operand
+
+        if isinstance(node, ast.Compare):
+            # Chained comparisons such as 30 < RSI(14) < 70 hold if every comparison holds
+            result = None
+            left = evaluate(node.left)
+            for op, comparator in zip(node.ops, node.comparators):
+                right = evaluate(comparator)
+                comparison = pd.Series(comparison_operators[type(op)](left, right), index=data.index)
+                result = comparison if result is None else result & comparison
+                left = right
+            return result.fillna(False).astype(bool)
+
+        if isinstance(node, ast.BinOp):
+            return arithmetic_operators[type(node.op)](evaluate(node.left), evaluate(node.right))
+
+        if isinstance(node, ast.Constant):
+            return node.value
+
+        if isinstance(node, ast.Call) and node.func.id.upper() in signal_functions:
+            # Compare each bar with the previous one, a crossover needs both bars to have values
+            left = pd.Series(evaluate(node.args[0]), index=data.index, dtype=float)
+            right = pd.Series(evaluate(node.args[1]), index=data.index, dtype=float)
+            if node.func.id.upper() == "CROSS_ABOVE":
+                crossed = (left > right) & (left.shift() <= right.shift())
+            else:
+                crossed = (left < right) & (left.shift() >= right.shift())
+            return crossed
+
+        # Price columns and rule functions are computed once per rule
+        term = _term(node)
+        if term not in terms:
+            terms[term] = _term_values(node, data)
+        return terms[term]
+
+    matches = evaluate(tree)
+    if not isinstance(matches, pd.Series):
+        matches = pd.Series(bool(matches), index=data.index)
+
+    return matches.astype(bool), terms
+
+
+def screen_frames(rule, frames):
+    """
+    Evaluates a rule on the last bar of several tickers' stock data. Runs in screener worker processes.
+
+    Parameters:
+    - rule (str): The rule text.
+    - frames (list of tuple): (ticker, DataFrame) pairs.
+
+    Returns:
+    - list of tuple: (ticker, matched, values, error) per ticker, where values maps "Date" and each rule term
+      to its value on the last bar, and error is the error message if the rule could not be evaluated.
+    """
+    tree = parse_rule(rule)
+    results = []
+
+    for ticker, frame in frames:
+        try:
+            matches, terms = evaluate_rule(tree, frame)
+            values = {"Date": frame.index[-1]}
+            values.update({term: float(series.iloc[-1]) for term, series in terms.items()})
+            results.append((ticker, bool(matches.iloc[-1]), values, None))
+        except Exception as e:
+            results.append((ticker, False, {}, str(e)))
+
+    return results
@@ -0,0 +1,194 @@
+import os
+import re
+import argparse
+import multiprocessing
+import pandas as pd
+import indicators.plot as plot
+import indicators.rules as rules
+import polygon.data_fetcher as fetch
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+# Number of tickers fetched at the same time. The shared Polygon client still enforces the rate limit,
+# so more threads only help while bars come from the local cache or the limit is disabled.
+SCREENER_FETCH_WORKERS = int(os.getenv("SCREENER_FETCH_WORKERS", "8"))
+
+# Number of processes evaluating the rule, defaults to one per core
+SCREENER_PROCESSES = int(os.getenv("SCREENER_PROCESSES", str(os.cpu_count() or 1)))
+
+# Calendar days of bars fetched per ticker, enough for 200 day averages
+SCREENER_LOOKBACK_DAYS = int(os.getenv("SCREENER_LOOKBACK_DAYS", "400"))
+
+# Universes smaller than this are screened in the calling process, where starting workers would cost more
+SCREENER_MIN_PARALLEL_TICKERS = 64
+
+
+def load_universe(path):
+    """
+    Reads the ticker symbols of a universe file.
+
+    Parameters:
+    - path (str): Text file with tickers separated by commas, spaces or new lines. Text after "#" is ignored.
+
+    Returns:
+    - list of str: The upper-case tickers in file order, without duplicates.
+    """
+    tickers = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            for ticker in re.split(r"[\s,]+", line.split("#", 1)[0]):
+                ticker = ticker.strip().upper()
+                if ticker and ticker not in tickers:
+                    tickers.append(ticker)
+
+    return tickers
+
+
+def validate_rule(rule):
+    """
+    Parses a screening rule and checks that every indicator it uses is in the indicator registry.
+
+    Parameters:
+    - rule (str): The rule text, e.g., "RSI(14) < 30 and Close > SMA(200)".
+
+    Returns:
+    - ast.Expression: The parsed rule.
+
+    Raises:
+    - ValueError: If the rule is not valid or uses an unknown indicator.
+    """
+    tree = rules.parse_rule(rule)
+
+    unknown = rules.rule_indicators(tree) - set(plot.indicator_functions)
+    if unknown:
+        raise ValueError(f"Unknown indicators in rule: {', '.join(sorted(unknown))}")
+
+    return tree
+
+
+def fetch_universe(tickers, timespan="day", from_date=None, workers=SCREENER_FETCH_WORKERS):
+    """
+    Fetches the stock data of every ticker with a bounded number of concurrent requests.
+    Bars already in the local bar cache are not requested again.
+
+    Parameters:
+    - tickers (list of str): The tickers to fetch.
+    - timespan (str): Timespan of the bars (default is "day").
+    - from_date (str): Start date in "YYYY-MM-DD" format. Defaults to SCREENER_LOOKBACK_DAYS before today.
+    - workers (int): Maximum number of concurrent fetches (default is SCREENER_FETCH_WORKERS).
+
+    Returns:
+    - tuple: (frames, errors), where frames maps each ticker with data to its DataFrame, in the order of
+      the tickers, and errors maps tickers whose fetch failed to the error message.
+    """
+    if from_date is None:
+        from_date = (datetime.now() - timedelta(days=SCREENER_LOOKBACK_DAYS)).strftime("%Y-%m-%d")
+
+    # Worker threads collect their errors instead of showing them, the caller reports them per ticker
+    def run(ticker):
+        messages = []
+        frame = fetch.fetch_stock_data(ticker, timespan, from_date=from_date, errors=messages)
+        return frame, messages
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="screener-fetch") as executor:
+        fetched = dict(zip(tickers, executor.map(run, tickers)))
+
+    frames = {ticker: frame for ticker, (frame, _) in fetched.items() if frame is not None and not frame.empty}
+    errors = {ticker: " ".join(messages) for ticker, (_, messages) in fetched.items() if messages}
+
+    return frames, errors
+
+
+def screen(tickers, rule, timespan="day", from_date=None, processes=SCREENER_PROCESSES,
+           fetch_workers=SCREENER_FETCH_WORKERS):
+    """
+    Screens a universe of tickers with a rule evaluated on each ticker's last bar.
+
+    Parameters:
+    - tickers (list of str): The tickers to screen.
+    - rule (str): The rule text, e.g., "RSI(14) < 30 and Close > SMA(200)".
+    - timespan (str): Timespan of the bars (default is "day").
+    - from_date (str): Start date of the fetched bars in "YYYY-MM-DD" format (optional).
+    - processes (int): Number of worker processes evaluating the rule (default is one per core).
+    - fetch_workers (int): Maximum number of concurrent fetches (default is SCREENER_FETCH_WORKERS).
+
+    Returns:
+    - tuple: (matches, errors), where matches is a DataFrame indexed by ticker with the date and the value
+      of every rule term on the last bar of each matching ticker, and errors maps tickers that could not
+      be fetched or whose rule could not be evaluated to the error message.
+
+    Raises:
+    - ValueError: If the rule is not valid.
+    """
+    tree = validate_rule(rule)
+    frames, fetch_errors = fetch_universe(tickers, timespan, from_date, fetch_workers)
+    frames = list(frames.items())
+
+    if processes <= 1 or len(frames) < SCREENER_MIN_PARALLEL_TICKERS:
+        results = rules.screen_frames(rule, frames)
+    else:
+        # Send each process a few chunks so uneven chunks still keep every core busy
+        chunk_size = max(1, -(-len(frames) // (processes * 4)))
+        chunks = [frames[start:start + chunk_size] for start in range(0, len(frames), chunk_size)]
+
+        # Forked workers start instantly, but inside the app the server's threads would be copied
+        # into them in an unknown state, so there the workers are spawned fresh
+        in_app = get_script_run_ctx(suppress_warning=True) is not None
+        fork = "fork" in multiprocessing.get_all_start_methods() and not in_app
+        context = multiprocessing.get_context("fork" if fork else "spawn")
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+            results = [
+                result
+                for chunk_results in executor.map(rules.screen_frames, [rule] * len(chunks), chunks)
+                for result in chunk_results
+            ]
+
+    matches = {ticker: values for ticker, matched, values, error in results if matched}
+    errors = dict(fetch_errors)
+    errors.update({ticker: error for ticker, matched, values, error in results if error})
+
+    columns = ["Date", *rules.rule_terms(tree)]
+    table = pd.DataFrame.from_dict(matches, orient="index", columns=columns)
+    table.index.name = "Ticker"
+
+    return table, errors
+
+
+def main():
+    """
+    Command line entry point, e.g.:
+    python -m indicators.screener universe.txt "RSI(14) < 30 and Close > SMA(200)"
+    """
+    parser = argparse.ArgumentParser(description="Screen a universe of tickers with a technical rule.")
+    parser.add_argument("universe", help="File with the tickers to screen")
+    parser.add_argument("rule", help='Rule such as "RSI(14) < 30 and Close > SMA(200)"')
+    parser.add_argument("--timespan", default="day", help="Timespan of the bars (default is day)")
+    parser.add_argument("--from-date", default=None, help="Start date of the bars in YYYY-MM-DD format")
+    parser.add_argument("--processes", type=int, default=SCREENER_PROCESSES, help="Number of worker processes")
+    parser.add_argument("--fetch-workers", type=int, default=SCREENER_FETCH_WORKERS,
+                        help="Maximum number of concurrent fetches")
+    args = parser.parse_args()
+
+    tickers = load_universe(args.universe)
+    try:
+        matches, errors = screen(tickers, args.rule, args.timespan, args.from_date, args.processes,
+                                 args.fetch_workers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    for ticker, error in errors.items():
+        print(f"{ticker}: {error}")
+
+    print(f"{len(matches)} of {len(tickers)} tickers match {args.rule}")
+    if not matches.empty:
+        print(matches.to_string())
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    # Load the Polygon API key from the environment file
+    load_dotenv()
+    main()
@@ -0,0 +1,561 @@
+import math
+
+
+# Ways the RSI, ATR, DMI and ADX can average their inputs, as in compute.SMOOTHING_METHODS
+SMOOTHING_METHODS = ("sma", "wilder")
+
+
+def _divide(numerator, denominator):
+    """
+    Divides like pandas does: division by zero gives +/-inf, or NaN for 0 / 0.
+    """
+    if denominator == 0:
+        if numerator == 0 or math.isnan(numerator):
+            return math.nan
+        return math.copysign(math.inf, numerator) * math.copysign(1, denominator)
+    return numerator / denominator
+
+
+class StreamingIndicator:
+    """
+    Base class for indicators that are updated one bar at a time in constant time.
+
+    The state of an indicator is held in its slots. snapshot() returns it as plain Python
+    data that can be pickled or stored as JSON, and restore() loads it back.
+    """
+
+    __slots__ = ()
+
+    def update(self, bar):
+        """
+        Adds the next bar and returns the indicator value(s) for it.
+
+        Parameters:
+        - bar (mapping): The bar's "Open", "High", "Low", "Close" and "Volume" values,
+          e.g., a dict or a row of a stock data DataFrame.
+        """
+        raise NotImplementedError
+
+    def _fields(self):
+        for cls in type(self).__mro__:
+            yield from getattr(cls, "__slots__", ())
+
+    def snapshot(self):
+        """
+        Returns the indicator state.
+
+        Returns:
+        - dict: The state as plain Python values.
+        """
+        state = {}
+        for field in self._fields():
+            value = getattr(self, field)
+            if isinstance(value, StreamingIndicator):
+                value = value.snapshot()
+            elif isinstance(value, list):
+                value = list(value)
+            state[field] = value
+        return state
+
+    def restore(self, state):
+        """
+        Replaces the indicator state with a state returned by snapshot().
+
+        Parameters:
+        - state (dict): The state to restore.
+        """
+        for field in self._fields():
+            value = getattr(self, field)
+            if isinstance(value, StreamingIndicator):
+                value.restore(state[field])
+            elif isinstance(state[field], list):
+                setattr(self, field, list(state[field]))
+            else:
+                setattr(self, field, state[field])
+        return self
+
+
+class _RollingWindow(StreamingIndicator):
+    """
+    Rolling mean and standard deviation over the last values, matching pandas rolling(window):
+    the result is NaN until the window is full and while it contains a NaN.
+    """
+
+    __slots__ = ("period", "buffer", "position", "count", "total", "total_squares", "nan_count")
+
+    def __init__(self, period):
+        self.period = period
+        self.buffer = [0.0] * period
+        self.position = 0
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.nan_count = 0
+
+    def update(self, value):
+        # Remove the value leaving the window once it is full
+        if self.count == self.period:
+            old = self.buffer[self.position]
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old
+                self.total_squares -= old * old
+        else:
+            self.count += 1
+
+        # Add the new value
+        self.buffer[self.position] = value
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            self.total += value
+            self.total_squares += value * value
+        self.position = (self.position + 1) % self.period
+
+        # Recompute the sums once per pass over the window so rounding errors cannot build up,
+        # which keeps the amortized cost per update constant
+        if self.position == 0:
+            values = [value for value in self.buffer if not math.isnan(value)]
+            self.total = math.fsum(values)
+            self.total_squares = math.fsum(value * value for value in values)
+
+        return self.mean()
+
+    def ready(self):
+        return self.count == self.period and self.nan_count == 0
+
+    def mean(self):
+        return self.total / self.period if self.ready() else math.nan
+
+    def std(self):
+        if not self.ready() or self.period < 2:
+            return math.nan
+        variance = (self.total_squares - self.total * self.total / self.period) / (self.period - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class _ExponentialAverage(StreamingIndicator):
+    """
+    Exponential moving average matching pandas ewm(span=period, adjust=False).
+    """
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, period):
+        self.alpha = 2 / (period + 1)
+        self.value = math.nan
+
+    def update(self, value):
+        if math.isnan(value):
+            return self.value
+        if math.isnan(self.value):
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class _WilderAverage(StreamingIndicator):
+    """
+    Wilder's smoothing matching kernels.wilder_smooth: leading NaN values are skipped, the first average
+    is the simple average of the first period values, and each later average moves 1 / period of the way
+    to the new value. Like pandas, NaN values carry the average forward while it keeps decaying.
+    """
+
+    __slots__ = ("period", "skip_first", "count", "total", "value", "weight")
+
+    def __init__(self, period, skip_first=False):
+        """
+        Parameters:
+        - period (int): The smoothing period.
+        - skip_first (bool): Whether to ignore the first value, e.g., a first bar with no previous bar.
+        """
+        self.period = period
+        self.skip_first = skip_first
+        self.count = 0
+        self.total = 0.0
+        self.value = math.nan
+        self.weight = 1.0
+
+    def update(self, value):
+        if self.skip_first:
+            self.skip_first = False
+            return math.nan
+
+        # Sum the first period values for the seed
+        if self.count < self.period:
+            if self.count == 0 and math.isnan(value):
+                return math.nan
+            self.count += 1
+            self.total += value
+            if self.count < self.period:
+                return math.nan
+            self.value = self.total / self.period
+            return self.value
+
+        # A NaN seed is replaced by the next value
+        alpha = 1 / self.period
+        if math.isnan(self.value):
+            if not math.isnan(value):
+                self.value = value
+            return self.value
+
+        self.weight *= 1 - alpha
+        if not math.isnan(value):
+            self.value = (self.weight * self.value + alpha * value) / (self.weight + alpha)
+            self.weight = 1.0
+        return self.value
+
+
+def _average(period, smoothing, skip_first=False):
+    """
+    Returns the streaming average for a smoothing method: a rolling mean ("sma") or Wilder's smoothing ("wilder").
+    Wilder's smoothing can skip the first value, like the batch functions do for values of the first bar.
+    """
+    if smoothing == "sma":
+        return _RollingWindow(period)
+    if smoothing == "wilder":
+        return _WilderAverage(period, skip_first)
+    raise ValueError(f"Unknown smoothing '{smoothing}', expected one of: {', '.join(SMOOTHING_METHODS)}")
+
+
+class StreamingSMA(StreamingIndicator):
+    """
+    Simple Moving Average of the closing price, see calculate_sma.
+    """
+
+    __slots__ = ("window",)
+
+    def __init__(self, period=50):
+        self.window = _RollingWindow(period)
+
+    def update(self, bar):
+        return self.window.update(bar["Close"])
+
+
+class StreamingEMA(StreamingIndicator):
+    """
+    Exponential Moving Average of the closing price, see calculate_ema.
+    """
+
+    __slots__ = ("average",)
+
+    def __init__(self, period=50):
+        self.average = _ExponentialAverage(period)
+
+    def update(self, bar):
+        return self.average.update(bar["Close"])
+
+
+class StreamingRSI(StreamingIndicator):
+    """
+    Relative Strength Index from averaged gains and losses, see calculate_rsi.
+    """
+
+    __slots__ = ("gains", "losses", "previous_close")
+
+    def __init__(self, period=14, smoothing="sma"):
+        self.gains = _average(period, smoothing, skip_first=True)
+        self.losses = _average(period, smoothing, skip_first=True)
+        self.previous_close = math.nan
+
+    def update(self, bar):
+        # The first bar has no price change and counts as neither gain nor loss
+        delta = bar["Close"] - self.previous_close
+        self.previous_close = bar["Close"]
+
+        gain = self.gains.update(delta if delta > 0 else 0.0)
+        loss = self.losses.update(-delta if delta < 0 else 0.0)
+
+        rs = _divide(gain, loss)
+        return 100 - _divide(100, 1 + rs)
+
+
+class StreamingMACD(StreamingIndicator):
+    """
+    MACD line, signal line and histogram, see calculate_macd.
+    """
+
+    __slots__ = ("short", "long", "signal")
+
+    def __init__(self, short_period=12, long_period=26, signal_period=9):
+        self.short = _ExponentialAverage(short_period)
+        self.long = _ExponentialAverage(long_period)
+        self.signal = _ExponentialAverage(signal_period)
+
+    def update(self, bar):
+        macd_line = self.short.update(bar["Close"]) - self.long.update(bar["Close"])
+        signal_line = self.signal.update(macd_line)
+        return macd_line, signal_line, macd_line - signal_line
+
+
+class StreamingATR(StreamingIndicator):
+    """
+    Average True Range as an average of the true range, see calculate_atr.
+    """
+
+    __slots__ = ("window", "previous_close")
+
+    def __init__(self, period=14, smoothing="sma"):
+        self.window = _average(period, smoothing, skip_first=True)
+        self.previous_close = math.nan
+
+    def true_range(self, bar):
+        high_low = bar["High"] - bar["Low"]
+        high_close = abs(bar["High"] - self.previous_close)
+        low_close = abs(bar["Low"] - self.previous_close)
+        self.previous_close = bar["Close"]
+
+        # The first bar has no previous close, so its true range is the high-low range
+        return max(max(high_low, high_close), low_close)
+
+    def update(self, bar):
+        return self.window.update(self.true_range(bar))
+
+
+class StreamingDMI(StreamingIndicator):
+    """
+    Positive and negative Directional Indicators, see calculate_dmi.
+    """
+
+    __slots__ = ("atr", "plus_dm", "minus_dm", "previous_high", "previous_low")
+
+    def __init__(self, period=14, smoothing="sma"):
+        self.atr = StreamingATR(period, smoothing)
+        self.plus_dm = _average(period, smoothing, skip_first=True)
+        self.minus_dm = _average(period, smoothing, skip_first=True)
+        self.previous_high = math.nan
+        self.previous_low = math.nan
+
+    def update(self, bar):
+        # Calculate directional movement, only the larger positive move counts
+        up_move = bar["High"] - self.previous_high
+        down_move = self.previous_low - bar["Low"]
+        self.previous_high = bar["High"]
+        self.previous_low = bar["Low"]
+
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+
+        # Normalize the average directional movement by the ATR
+        atr = self.atr.update(bar)
+        plus_di = 100 * _divide(self.plus_dm.update(plus_dm), atr)
+        minus_di = 100 * _divide(self.minus_dm.update(minus_dm), atr)
+
+        return plus_di, minus_di
+
+
+class StreamingADX(StreamingIndicator):
+    """
+    Average Directional Index as an average of DX, see calculate_adx.
+    """
+
+    __slots__ = ("dmi", "dx")
+
+    def __init__(self, period=14, smoothing="sma"):
+        self.dmi = StreamingDMI(period, smoothing)
+        self.dx = _average(period, smoothing)
+
+    def update(self, bar):
+        plus_di, minus_di = self.dmi.update(bar)
+        dx = 100 * _divide(abs(plus_di - minus_di), plus_di + minus_di)
+        return self.dx.update(dx)
+
+
+class StreamingOBV(StreamingIndicator):
+    """
+    On-Balance Volume, see calculate_obv.
+    """
+
+    __slots__ = ("value", "previous_close")
+
+    def __init__(self):
+        self.value = 0.0
+        self.previous_close = math.nan
+
+    def update(self, bar):
+        close = bar["Close"]
+        direction = (close > self.previous_close) - (close < self.previous_close)
+        self.previous_close = close
+
+        self.value += bar["Volume"] * direction
+        return self.value
+
+
+class StreamingBollingerBands(StreamingIndicator):
+    """
+    Upper and lower Bollinger Bands, see calculate_bollinger_bands.
+    """
+
+    __slots__ = ("window",)
+
+    def __init__(self, period=20):
+        self.window = _RollingWindow(period)
+
+    def update(self, bar):
+        sma = self.window.update(bar["Close"])
+        std = self.window.std()
+        return sma + 2 * std, sma - 2 * std
+
+
+class StreamingVROC(StreamingIndicator):
+    """
+    Volume Rate of Change against the volume a fixed number of bars back, see calculate_vroc.
+    """
+
+    __slots__ = ("period", "volumes", "position", "count")
+
+    def __init__(self, period=14):
+        self.period = period
+        self.volumes = [math.nan] * period
+        self.position = 0
+        self.count = 0
+
+    def update(self, bar):
+        volume = bar["Volume"]
+
+        # The slot being overwritten holds the volume from `period` bars ago
+        previous = self.volumes[self.position] if self.count >= self.period else math.nan
+        self.volumes[self.position] = volume
+        self.position = (self.position + 1) % self.period
+        self.count += 1
+
+        return _divide(volume - previous, previous) * 100
+
+
+class StreamingParabolicSAR(StreamingIndicator):
+    """
+    Parabolic Stop and Reverse, see calculate_parabolic_sar.
+    """
+
+    __slots__ = ("initial_af", "max_af", "af", "ep", "trend", "sar")
+
+    def __init__(self, initial_af=0.02, max_af=0.2):
+        self.initial_af = initial_af
+        self.max_af = max_af
+        self.af = initial_af
+        self.ep = math.nan
+        self.trend = 1
+        self.sar = math.nan
+
+    def update(self, bar):
+        high, low = bar["High"], bar["Low"]
+
+        # The first bar starts an uptrend at its low
+        if math.isnan(self.sar):
+            self.sar = self.ep = low
+            return self.sar
+
+        sar = self.sar + self.af * (self.ep - self.sar)
+
+        if self.trend == 1:
+            if low < sar:
+                self.trend, sar, self.af, self.ep = -1, self.ep, self.initial_af, high
+            elif high > self.ep:
+                self.ep = high
+                self.af = min(self.af + self.initial_af, self.max_af)
+        else:
+            if high > sar:
+                self.trend, sar, self.af, self.ep = 1, self.ep, self.initial_af, low
+            elif low < self.ep:
+                self.ep = low
+                self.af = min(self.af + self.initial_af, self.max_af)
+
+        self.sar = sar
+        return sar
+
+
+# Mapping of indicator names to their streaming implementations
+streaming_indicators = {
+    "sma": StreamingSMA,
+    "ema": StreamingEMA,
+    "rsi": StreamingRSI,
+    "macd": StreamingMACD,
+    "adx": StreamingADX,
+    "atr": StreamingATR,
+    "bollinger bands": StreamingBollingerBands,
+    "obv": StreamingOBV,
+    "dmi": StreamingDMI,
+    "parabolic sar": StreamingParabolicSAR,
+    "vroc": StreamingVROC,
+}
+
+# Streaming indicators taking a smoothing method
+smoothed_indicators = ("rsi", "atr", "dmi", "adx")
+
+
+class StreamingIndicatorEngine:
+    """
+    Keeps a set of streaming indicators up to date as new bars arrive.
+    """
+
+    def __init__(self, indicators):
+        """
+        Parameters:
+        - indicators (dict): Maps a name to a StreamingIndicator instance.
+        """
+        self.indicators = dict(indicators)
+
+    @classmethod
+    def from_names(cls, names, smoothing="sma"):
+        """
+        Creates an engine with default parameters for each named indicator.
+
+        Parameters:
+        - names (list of str): Indicator names as used in indicator_functions, e.g., ["sma", "rsi"].
+        - smoothing (str): Averaging of the RSI, ATR, DMI and ADX, "sma" or "wilder" (default is "sma").
+
+        Returns:
+        - StreamingIndicatorEngine: The engine. Unknown names are ignored.
+        """
+        indicators = {}
+        for name in names:
+            name = name.lower()
+            if name in smoothed_indicators:
+                indicators[name] = streaming_indicators[name](smoothing=smoothing)
+            elif name in streaming_indicators:
+                indicators[name] = streaming_indicators[name]()
+        return cls(indicators)
+
+    def update(self, bar):
+        """
+        Adds the next bar to every indicator.
+
+        Parameters:
+        - bar (mapping): The bar's "Open", "High", "Low", "Close" and "Volume" values.
+
+        Returns:
+        - dict: Maps each indicator name to its value(s) for the bar.
+        """
+        return {name: indicator.update(bar) for name, indicator in self.indicators.items()}
+
+    def warm_up(self, stock_data):
+        """
+        Feeds historical bars to every indicator in order.
+
+        Parameters:
+        - stock_data (DataFrame or BarSeries): Bars with "Open", "High", "Low", "Close" and "Volume" columns.
+
+        Returns:
+        - dict: The indicator values for the last bar, or an empty dict if there are no bars.
+        """
+        values = {}
+        columns = ["Open", "High", "Low", "Close", "Volume"]
+        for row in zip(*(stock_data[column].tolist() for column in columns)):
+            values = self.update(dict(zip(columns, row)))
+        return values
+
+    def snapshot(self):
+        """
+        Returns the state of every indicator, see StreamingIndicator.snapshot.
+        """
+        return {name: indicator.snapshot() for name, indicator in self.indicators.items()}
+
+    def restore(self, state):
+        """
+        Restores the state of every indicator from a state returned by snapshot().
+        """
+        for name, indicator in self.indicators.items():
+            indicator.restore(state[name])
+        return self
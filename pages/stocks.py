@@ -3,8 +3,11 @@ import os
 import time
 import random
 import re
+import pandas as pd
 import indicators.plot as plot
+import indicators.optimize as optimize
 import polygon.data_fetcher as fetch
+import polygon.fetch_pool as fetch_pool
 import polygon.display_news as display_news
 import polygon.display_financials as display_financials
 from supabase import create_client, Client
@@ -88,6 +91,16 @@ with st.sidebar.expander("Available Timespans"):
     for timespan in available_timespans:        
         st.write(timespan.capitalize())
 
+# Draw the charts in the browser, where they can be zoomed and panned without a new request
+interactive_chart = st.sidebar.toggle("Interactive chart", help="Zoom and pan the chart across years of history")
+
+# Add an expandable section for backtesting entry and exit rules on the current ticker
+with st.sidebar.expander("Backtest"):
+    entry_rule = st.text_input("Entry rule", "CROSS_ABOVE(EMA(12), EMA(26))")
+    exit_rule = st.text_input("Exit rule", "CROSS_BELOW(EMA(12), EMA(26))")
+    backtest_years = st.number_input("Years", min_value=1, max_value=20, value=10)
+    run_backtest = st.button("Run Backtest")
+
 # Helper function to stream a message with a delay
 def stream_message(message, delay=0.05):
     for word in message.split():
@@ -163,20 +176,22 @@ def generate_update_response(ticker=None, indicators=None, timespan=None, news=N
 # Use OpenAI API to parse stock ticker and indicator/s from user input
 def get_response(user_prompt):
     """
-    Uses the OpenAI API to parse a user’s input for stock-related information, including the ticker, indicators, timespan, news, and financials preference.
+    Uses the OpenAI API to parse a user’s input for stock-related information, including the ticker, indicators, timespan, news, and financials preference,
+    and the indicator whose strategy parameters the user wants optimized.
     Updates the session state with the parsed values.
 
     Parameters:
     - user_prompt (str): The user's input containing the stock request and any indicators.
 
     Returns:
-    - tuple: (ticker, indicators, timespan, news, financials), where:
+    - tuple: (ticker, indicators, timespan, news, financials, optimize), where:
         - ticker (str): The stock ticker symbol.
         - indicators (list): A list of requested indicators.
         - timespan (str): The requested timespan (e.g., 'hour', 'day').
         - news (str): 'True', 'False', or None based on the user's preference for news updates.
         - financials (str): 'True', 'False', or None based on the user's preference for financials updates.
-        - Returns (None, [], None, None) if parsing fails or no response is provided.
+        - optimize (str): The indicator to optimize (e.g., 'rsi'), or None if no optimization was requested.
+        - Returns (None, [], None, None, None, None) if parsing fails or no response is provided.
     """
     
     # Define the system prompt for OpenAI with current session state values
@@ -196,10 +211,11 @@ def get_response(user_prompt):
     - When asked to change the timespan, provide the new timespan only if it's part the supported timespan list which is "hour, day, week, month, quarter, year".
     - When asked to show or add news then return True. If asked to stop or remove news then return False. Otherwise, use the current news value to return
     - When asked to show or add financials then return True. If asked to stop or remove financials then return False. Otherwise, use the current financials value to return
+    - When asked to optimize, tune or find the best parameters or settings for an indicator's strategy, return that indicator if it is one of "{", ".join(optimize.strategies)}". Otherwise return None. This only applies to the current request, so do not repeat it from earlier requests.
 
     
     Response format:
-    - Provide 'Ticker: <ticker>' and 'Indicators: <indicator1>, <indicator2>, ...' and 'Timespan: <timespan>' and 'News: <news>' and 'Financials: <financials>'.
+    - Provide 'Ticker: <ticker>' and 'Indicators: <indicator1>, <indicator2>, ...' and 'Timespan: <timespan>' and 'News: <news>' and 'Financials: <financials>' and 'Optimize: <indicator or None>'.
     - If the ticker symbol or indicator list or timespan or news or financials does not change, keep the response consistent with the previous values.
     
     Strictly follow the above format, responding with the ticker and indicators and timeframe and news as specified, also providing a positive, friendly manner.
@@ -219,7 +235,7 @@ def get_response(user_prompt):
         
     except Exception as e:
         st.error(f"Error communicating with OpenAI API: {e}")
-        return None, [], None, None, None
+        return None, [], None, None, None, None
 
 
     # Parse response content to update ticker, indicators, timespan, news, and financials
@@ -253,6 +269,12 @@ def get_response(user_prompt):
             financials_match = re.search(r"Financials:\s*(True|False)", content)
             financials = financials_match.group(1) if news_match else None
 
+            # Extract the indicator to optimize
+            optimize_match = re.search(r"Optimize:\s*([^\n]+)", content)
+            optimize_name = optimize_match.group(1).strip().strip("'\"").lower() if optimize_match else None
+            if optimize_name == "none":
+                optimize_name = None
+
             # Generate a friendly response
             update_message = generate_update_response(
                 ticker=ticker,
@@ -275,13 +297,13 @@ def get_response(user_prompt):
                 st.session_state.messages.append({"role": "assistant", "content": update_message})
 
             st.success(f"Ticker: {ticker}, Indicators: {', '.join(indicators)}, Timespan: {timespan}, News: {news}, Financials: {financials}")
-            return ticker, indicators, timespan, news, financials
+            return ticker, indicators, timespan, news, financials, optimize_name
 
         else:
             st.warning("Unexpected format in OpenAI response. Could not extract values.")
 
     # Return None and empty list if parsing fails
-    return None, [], None, None, None
+    return None, [], None, None, None, None
 
  
 
@@ -314,24 +336,39 @@ if ((user_data["isTrial"] and user_data['trialRequestsLeft'] > 0) or user_data["
             st.markdown(prompt)
     
         # Get response and update indicators
-        ticker, indicators, timespan, news, financials = get_response(prompt)
+        ticker, indicators, timespan, news, financials, optimize_name = get_response(prompt)
+        
+        # Start every Polygon request needed for this turn at the same time
+        turn_requests = {}
+        if (news == "True"):
+            turn_requests["news"] = (fetch.fetch_stock_news, ticker)
+        if (financials == "True"):
+            turn_requests["financials"] = (fetch.fetch_financials, ticker)
+        if ticker:
+            # Fetch only the visible chart window, or an interactive chart's history, plus the warm-up the indicators need
+            from_date, _ = plot.plan_chart_window(indicators, timespan, interactive_chart)
+            turn_requests["stock data"] = (fetch.fetch_stock_data, ticker, timespan, 1, None, from_date)
+        turn_results = fetch_pool.fetch_concurrently(turn_requests)
         
-        # Get news for the given stock if requested
+        # Display the news for the given stock if requested
         if (news == "True"):             
-            # Fetch the stock news from polygon
-            news_data = fetch.fetch_stock_news(ticker)
-            # Display the news in streamlit
-            display_news.display_stock_news(news_data, ticker)
+            display_news.display_stock_news(turn_results["news"], ticker)
             
-        # Get financials for the given stock if requested
+        # Display the financials for the given stock if requested
         if (financials == "True"):
-            # Fetch the stock financials from polygon
-            financials_data = fetch.fetch_financials(ticker)
-            # Display the financials in streamlit
-            display_financials.display_financial_statements(financials_data, ticker)            
+            display_financials.display_financial_statements(turn_results["financials"], ticker)            
         
+        # A stock data request that failed was already reported, so the chart does not fetch it again
+        stock_data = turn_results.get("stock data")
+        if ticker and stock_data is None:
+            stock_data = pd.DataFrame()
+
         # Refresh the chart with the latest indicators
-        plot.plot_current_indicators(ticker, indicators, timespan) 
+        plot.plot_current_indicators(ticker, indicators, timespan, stock_data, interactive_chart) 
+
+        # Rank the parameters of the requested indicator's strategy
+        if optimize_name:
+            plot.plot_optimization(ticker, timespan, optimize_name)
         
         if (user_data["isTrial"]):
             supabase.table("User").update({"trialRequestsLeft": user_data["trialRequestsLeft"] - 1}).eq("email", st.session_state['email']).execute()
@@ -340,6 +377,16 @@ if ((user_data["isTrial"] and user_data['trialRequestsLeft'] > 0) or user_data["
                 user_data = user_data_response.data[0]
                 # Update the displayed requests remaining
                 st.sidebar.write(f"Number of free requests remaining: {user_data['trialRequestsLeft']}")
+
+    # Backtest the rules from the sidebar on the current ticker and timespan
+    if run_backtest:
+        plot.plot_backtest(
+            st.session_state.current_ticker,
+            st.session_state.current_timespan,
+            entry_rule,
+            exit_rule,
+            int(backtest_years),
+        )
 else:
     st.write("Subscribe to use Charles you are currently not subscribed")
     
\ No newline at end of file
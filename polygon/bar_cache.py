@@ -0,0 +1,155 @@
+import os
+import re
+import threading
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# Directory where cached OHLCV bars are stored, one Parquet file per series
+BAR_CACHE_DIR = os.getenv("BAR_CACHE_DIR", os.path.join(".cache", "bars"))
+
+# Version of the stored bar layout, bumped whenever cached bars become incompatible
+# (2: timestamps are stored in exchange-local time)
+BAR_CACHE_VERSION = 2
+
+# Parquet metadata key recording the earliest date the cached series covers
+COVERED_FROM_KEY = b"charles.covered_from"
+
+
+def _cache_path(ticker, multiplier, timespan, adjusted):
+    """
+    Builds the file path of the cached bar series for the given query parameters.
+
+    Parameters:
+    - ticker (str): Stock ticker symbol.
+    - multiplier (int): Multiplier for the timespan.
+    - timespan (str): Time unit for aggregation, e.g., "day", "minute".
+    - adjusted (bool): Whether the bars are adjusted for splits.
+
+    Returns:
+    - str: Path of the Parquet file holding the cached bars.
+    """
+
+    # Keep only characters that are safe to use in a file name
+    safe_ticker = re.sub(r"[^A-Za-z0-9.\-]", "_", ticker.upper())
+    adjustment = "adj" if adjusted else "raw"
+
+    return os.path.join(BAR_CACHE_DIR, f"v{BAR_CACHE_VERSION}", f"{safe_ticker}_{multiplier}_{timespan}_{adjustment}.parquet")
+
+
+def load_bars(ticker, multiplier, timespan, adjusted=True):
+    """
+    Loads the cached bars for a ticker along with the earliest date the cache covers.
+
+    Parameters:
+    - ticker (str): Stock ticker symbol.
+    - multiplier (int): Multiplier for the timespan.
+    - timespan (str): Time unit for aggregation, e.g., "day", "minute".
+    - adjusted (bool): Whether the bars are adjusted for splits. Default is True.
+
+    Returns:
+    - tuple: (bars, covered_from), where:
+        - bars (pd.DataFrame): Cached OHLCV bars indexed by date, empty if nothing is cached.
+        - covered_from (pd.Timestamp): Earliest requested date the cache covers, or None.
+    """
+
+    path = _cache_path(ticker, multiplier, timespan, adjusted)
+
+    if not os.path.exists(path):
+        return pd.DataFrame(), None
+
+    # A corrupt or unreadable file is treated as a cache miss
+    try:
+        table = pq.read_table(path)
+    except (OSError, pa.ArrowException):
+        return pd.DataFrame(), None
+
+    metadata = table.schema.metadata or {}
+    covered_from = metadata.get(COVERED_FROM_KEY)
+
+    return table.to_pandas(), pd.Timestamp(covered_from.decode()) if covered_from else None
+
+
+def load_coverage(ticker, multiplier, timespan, adjusted=True):
+    """
+    Reads only the earliest date a cached series covers, without loading its bars.
+
+    Parameters:
+    - ticker (str): Stock ticker symbol.
+    - multiplier (int): Multiplier for the timespan.
+    - timespan (str): Time unit for aggregation, e.g., "day", "minute".
+    - adjusted (bool): Whether the bars are adjusted for splits. Default is True.
+
+    Returns:
+    - pd.Timestamp: Earliest requested date the cache covers, or None if nothing is cached.
+    """
+
+    path = _cache_path(ticker, multiplier, timespan, adjusted)
+
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (OSError, pa.ArrowException):
+        return None
+
+    covered_from = metadata.get(COVERED_FROM_KEY)
+
+    return pd.Timestamp(covered_from.decode()) if covered_from else None
+
+
+def save_bars(bars, ticker, multiplier, timespan, adjusted=True, covered_from=None):
+    """
+    Writes the bars for a ticker to the cache, replacing any previously cached series.
+
+    Parameters:
+    - bars (pd.DataFrame): OHLCV bars indexed by date.
+    - ticker (str): Stock ticker symbol.
+    - multiplier (int): Multiplier for the timespan.
+    - timespan (str): Time unit for aggregation, e.g., "day", "minute".
+    - adjusted (bool): Whether the bars are adjusted for splits. Default is True.
+    - covered_from (pd.Timestamp): Earliest requested date the bars cover. Defaults to the first bar.
+    """
+
+    if bars.empty:
+        return
+
+    if covered_from is None:
+        covered_from = bars.index[0]
+
+    table = pa.Table.from_pandas(bars)
+    metadata = dict(table.schema.metadata or {})
+    metadata[COVERED_FROM_KEY] = pd.Timestamp(covered_from).isoformat().encode()
+    table = table.replace_schema_metadata(metadata)
+
+    path = _cache_path(ticker, multiplier, timespan, adjusted)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Write to a temporary file first so concurrent readers never see a partial file
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    pq.write_table(table, temp_path)
+    os.replace(temp_path, path)
+
+
+def merge_bars(cached, fresh):
+    """
+    Merges newly fetched bars into the cached bars, preferring the fresh values for overlapping dates.
+
+    Parameters:
+    - cached (pd.DataFrame): Previously cached OHLCV bars.
+    - fresh (pd.DataFrame): Newly fetched OHLCV bars.
+
+    Returns:
+    - pd.DataFrame: Combined bars sorted by date without duplicate timestamps.
+    """
+
+    if cached.empty:
+        return fresh
+    if fresh.empty:
+        return cached
+
+    merged = pd.concat([cached, fresh])
+
+    # The last cached bar may have been incomplete, so keep the freshly fetched copy
+    merged = merged[~merged.index.duplicated(keep="last")]
+
+    return merged.sort_index()
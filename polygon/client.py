@@ -0,0 +1,200 @@
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Base URL for all Polygon API requests
+POLYGON_BASE_URL = "https://api.polygon.io"
+
+# Requests allowed per minute by our Polygon plan (the free plan allows 5), 0 disables throttling
+POLYGON_REQUESTS_PER_MINUTE = int(os.getenv("POLYGON_REQUESTS_PER_MINUTE", "5"))
+
+# HTTP status codes that are worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter that refills continuously at a fixed rate per minute.
+    """
+
+    def __init__(self, requests_per_minute, capacity=None):
+        """
+        Parameters:
+        - requests_per_minute (int): Number of tokens added per minute. 0 or less disables throttling.
+        - capacity (int): Maximum number of tokens that can be saved up for bursts.
+          Defaults to the per-minute rate.
+        """
+        self.rate = requests_per_minute / 60.0
+        self.capacity = capacity or max(requests_per_minute, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a token is available and takes it.
+
+        Returns:
+        - float: Number of seconds spent waiting for the token.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self.lock:
+                # Refill the bucket for the time elapsed since the last update
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                # Time until the next token becomes available
+                delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+class PolygonClient:
+    """
+    Polygon API client that keeps pooled connections alive, throttles requests to the
+    plan's quota and retries failed requests with jittered exponential backoff.
+    """
+
+    def __init__(self, api_key=None, requests_per_minute=POLYGON_REQUESTS_PER_MINUTE, max_retries=3,
+                 backoff_base=0.5, backoff_max=8.0, connect_timeout=3.05, read_timeout=10.0, pool_size=20):
+        """
+        Parameters:
+        - api_key (str): Polygon API key. Defaults to the POLYGON_API_KEY environment variable.
+        - requests_per_minute (int): Requests allowed per minute, 0 disables throttling.
+        - max_retries (int): Number of retries after a failed attempt (default is 3).
+        - backoff_base (float): Base delay in seconds for the exponential backoff (default is 0.5).
+        - backoff_max (float): Maximum delay in seconds between retries (default is 8.0).
+        - connect_timeout (float): Seconds to wait for a connection to be established (default is 3.05).
+        - read_timeout (float): Seconds to wait for the server to send data (default is 10.0).
+        - pool_size (int): Maximum number of connections kept alive (default is 20).
+        """
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = (connect_timeout, read_timeout)
+        self.rate_limiter = TokenBucket(requests_per_minute)
+
+        # Share one connection pool between all threads using this client
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+
+        self.stats_lock = threading.Lock()
+        self.counters = {
+            "requests": 0,
+            "retries": 0,
+            "failures": 0,
+            "throttled_seconds": 0.0,
+        }
+
+    def _count(self, name, amount=1):
+        with self.stats_lock:
+            self.counters[name] += amount
+
+    def stats(self):
+        """
+        Returns a snapshot of the request counters.
+
+        Returns:
+        - dict: Counts of requests, retries, failures and the total seconds spent throttled.
+        """
+        with self.stats_lock:
+            return dict(self.counters)
+
+    def _backoff(self, attempt, response=None):
+        """
+        Computes the delay before the next retry, honouring a Retry-After header when present.
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+
+        # Full jitter keeps concurrent sessions from retrying in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get(self, url, params=None, stream=False):
+        """
+        Sends a GET request to the Polygon API.
+
+        Parameters:
+        - url (str): Path relative to the Polygon base URL (e.g., "/v2/reference/news") or a full URL.
+        - params (dict): Query parameters. The API key is added automatically.
+        - stream (bool): Return before the body is downloaded, so it can be read in chunks with
+          iter_content. The caller must close the response (default is False).
+
+        Returns:
+        - requests.Response: The successful response.
+
+        Raises:
+        - requests.RequestException: If the request still fails after all retries.
+        """
+        if url.startswith("/"):
+            url = POLYGON_BASE_URL + url
+
+        params = dict(params or {})
+        params["apiKey"] = self.api_key or os.getenv("POLYGON_API_KEY")
+
+        for attempt in range(self.max_retries + 1):
+            self._count("throttled_seconds", self.rate_limiter.acquire())
+            self._count("requests")
+
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    self._count("failures")
+                    raise
+                self._count("retries")
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                response.close()
+                self._count("retries")
+                time.sleep(self._backoff(attempt, response))
+                continue
+
+            try:
+                response.raise_for_status()
+            except requests.HTTPError:
+                response.close()
+                self._count("failures")
+                raise
+
+            return response
+
+
+# Client shared by every session in this process
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Returns the process-wide Polygon client, creating it on first use.
+
+    Returns:
+    - PolygonClient: The shared client.
+    """
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = PolygonClient()
+        return _client
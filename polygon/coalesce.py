@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def _has_data(result):
+    """
+    Default check for whether a result is worth caching: failed fetches return None or an empty result.
+    """
+    return result is not None and len(result) > 0
+
+
+class TTLCache:
+    """
+    Thread-safe cache whose entries expire after a fixed time and which evicts the
+    least recently used entry once it holds the maximum number of entries.
+    """
+
+    def __init__(self, maxsize=256, ttl=60.0):
+        """
+        Parameters:
+        - maxsize (int): Maximum number of entries kept (default is 256).
+        - ttl (float): Seconds an entry stays valid after it is stored (default is 60).
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Looks up an entry.
+
+        Parameters:
+        - key: The cache key.
+
+        Returns:
+        - tuple: (found, value), where found is False if the key is missing or expired.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return False, None
+
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return False, None
+
+            # Mark the entry as most recently used
+            self.entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value):
+        """
+        Stores an entry, evicting the least recently used entries if the cache is full.
+
+        Parameters:
+        - key: The cache key.
+        - value: The value to store.
+        """
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class _Call:
+    """
+    A request that is currently in flight and the callers waiting for it.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one call whose result is shared
+    by every caller, and keeps recent results in a TTL cache.
+    """
+
+    def __init__(self, cache=None, cache_if=_has_data):
+        """
+        Parameters:
+        - cache (TTLCache): Cache for finished results. Defaults to a new TTLCache.
+        - cache_if (callable): Returns True if a result should be cached. By default, empty results
+          from failed fetches are not cached.
+        """
+        self.cache = cache if cache is not None else TTLCache()
+        self.cache_if = cache_if
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.counters = {"calls": 0, "cache_hits": 0, "coalesced": 0}
+
+    def stats(self):
+        """
+        Returns a snapshot of the counters.
+
+        Returns:
+        - dict: Number of executed calls, cache hits and calls that joined an in-flight call.
+        """
+        with self.lock:
+            return dict(self.counters)
+
+    def do(self, key, function, *args, **kwargs):
+        """
+        Returns the cached result for the key, waits for an identical call already in flight,
+        or runs the function and shares its result.
+
+        Parameters:
+        - key: Hashable key identifying identical calls.
+        - function (callable): The function to call.
+        - *args, **kwargs: Arguments passed to the function.
+
+        Returns:
+        - The function's result. Exceptions raised by the function are raised for every waiting caller.
+        """
+        found, value = self.cache.get(key)
+        if found:
+            with self.lock:
+                self.counters["cache_hits"] += 1
+            return value
+
+        with self.lock:
+            # Check the cache again, an identical call may have finished since the check above
+            found, value = self.cache.get(key)
+            if found:
+                self.counters["cache_hits"] += 1
+                return value
+
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+                self.counters["calls"] += 1
+            else:
+                self.counters["coalesced"] += 1
+
+        # Another caller is already running this request, wait for its result
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+            if self.cache_if(call.result):
+                self.cache.set(key, call.result)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+        return call.result
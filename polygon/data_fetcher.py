@@ -1,75 +1,179 @@
-import requests
 import os
+import re
+import json
+import requests
+import numpy as np
 import pandas as pd
 import streamlit as st
+import polygon.bar_cache as bar_cache
+import polygon.resample as resample
+from polygon.client import get_client
+from polygon.coalesce import SingleFlight, TTLCache
+from indicators.bar_series import BarSeries
 from datetime import datetime
 
+# orjson is optional, it decodes aggregate bars considerably faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Seconds a fetched Polygon result is reused before it is requested again
+POLYGON_CACHE_TTL = float(os.getenv("POLYGON_CACHE_TTL", "60"))
+
+# Largest number of base aggregates Polygon returns in one page
+AGGREGATES_PAGE_LIMIT = 50000
+
+# Bytes of an aggregates page read and decoded at a time, about 9,000 bars. Only the bars of one
+# read are held as Python objects, the page's bars are kept as DataFrame chunks.
+AGGREGATES_READ_BYTES = int(os.getenv("AGGREGATES_READ_BYTES", str(1024 * 1024)))
+
+# Start of the "results" array in an aggregates page
+_RESULTS_START = re.compile(rb'"results"\s*:\s*\[')
+
+# A JSON value that is not a number, e.g., a nested object or array, a string or true
+_NON_NUMERIC_VALUE = re.compile(rb':\s*[^\s0-9\-]')
+
+# Timezone of the exchange, bar timestamps are shown in its local time
+MARKET_TIMEZONE = "America/New_York"
+
+# Mapping of Polygon aggregate fields to DataFrame columns
+AGGREGATE_FIELDS = {
+    "o": "Open",
+    "h": "High",
+    "l": "Low",
+    "c": "Close",
+    "v": "Volume",
+}
+
 
-# Replace this with your actual Polygon.io key
-POLYGON_API_KEY = os.getenv("POLYGON_API_KEY")
+def _show_error(message, errors=None):
+    """
+    Shows an error message to the user, or collects it when a list is given.
+
+    Parameters:
+    - message (str): The error message.
+    - errors (list): List collecting the messages instead of showing them (optional).
+    """
+    if errors is None:
+        st.error(message)
+    else:
+        errors.append(message)
 
 
-def fetch_financials(ticker):
+def _is_complete(result):
+    """
+    Checks whether a fetch result is worth caching: it has data and no errors.
+    """
+    value, errors = result
+    return not errors and value is not None and len(value) > 0
+
+
+# Coalesces identical Polygon queries across sessions and keeps their results briefly.
+# Fetches return (value, errors), so every session sharing a fetch sees its errors.
+_polygon_requests = SingleFlight(TTLCache(maxsize=256, ttl=POLYGON_CACHE_TTL), cache_if=_is_complete)
+
+
+def _report(result, errors=None):
+    """
+    Shows the errors of a shared fetch in the calling session and returns the fetched value.
+
+    Parameters:
+    - result (tuple): (value, errors) as returned by the fetch, where errors is a list of messages.
+    - errors (list): List collecting the messages instead of showing them (optional).
+
+    Returns:
+    - The fetched value.
+    """
+    value, fetch_errors = result
+    for message in fetch_errors:
+        _show_error(message, errors)
+    return value
+
+
+def fetch_financials(ticker, errors=None):
     """
     Fetch financial data for a specific stock ticker from the Polygon API and display it.
 
     Parameters:
     - ticker (str): The stock ticker for which to fetch financial data.
+    - errors (list): List collecting error messages instead of showing them (optional).
+    """
+    
+    # Identical concurrent requests share a single call and recent results are reused
+    return _report(_polygon_requests.do(("financials", ticker), _fetch_financials, ticker), errors)
+
+
+def _fetch_financials(ticker):
+    """
+    Requests the quarterly financials for a specific stock ticker from the Polygon API.
+
+    Returns:
+    - tuple: (financials, errors), where errors lists the messages to show to every caller.
     """
     
     # Construct URL for Polygon API request
-    url = f"https://api.polygon.io/vX/reference/financials?ticker={ticker}&timeframe=quarterly&include_sources=false&apiKey={POLYGON_API_KEY}"
+    url = "/vX/reference/financials"
+    params = {"ticker": ticker, "timeframe": "quarterly", "include_sources": "false"}
     
-    # Make request to Polygon API
+    # Make request to Polygon API, the client raises an error for unsuccessful status codes
     try:
-        response = requests.get(url)
-        # Raise an error for unsuccessful status codes
-        response.raise_for_status()  
+        response = get_client().get(url, params)
         data = response.json()
         
     except requests.RequestException as e:
-        st.error(f"Error fetching stock earnings: {e}")
-        return []
+        return [], [f"Error fetching stock earnings: {e}"]
     
     # Validate response content
     if "results" not in data or not data["results"]:
-        st.error("No financial data found in the API response.")
-        return
+        return None, ["No financial data found in the API response."]
     
     financials = data["results"]
     
-    return financials
+    return financials, []
 
 
 # Function to fetch stock news
-def fetch_stock_news(ticker):
+def fetch_stock_news(ticker, errors=None):
     """
     Fetches the latest news for a specified stock ticker from the Polygon API.
 
     Parameters:
     - ticker (str): Stock ticker symbol.
+    - errors (list): List collecting error messages instead of showing them (optional).
 
     Returns:
     - list: A list of dictionaries with news details (title, date, summary, etc.).
     """
+
+    # Identical concurrent requests share a single call and recent results are reused
+    return _report(_polygon_requests.do(("news", ticker), _fetch_stock_news, ticker), errors)
+
+
+def _fetch_stock_news(ticker):
+    """
+    Requests the latest news for a specified stock ticker from the Polygon API.
+
+    Returns:
+    - tuple: (news_list, errors), where errors lists the messages to show to every caller.
+    """
+
     # Construct URL for Polygon API request
-    url = f"https://api.polygon.io/v2/reference/news?ticker={ticker}&apiKey={POLYGON_API_KEY}"
+    url = "/v2/reference/news"
+    params = {"ticker": ticker}
 
-    # Make request to Polygon API
+    # Make request to Polygon API, the client raises an error for unsuccessful status codes
     try:
-        response = requests.get(url)
-        # Raise an error for unsuccessful status codes
-        response.raise_for_status()  
+        response = get_client().get(url, params)
         data = response.json()
         
     except requests.RequestException as e:
-        st.error(f"Error fetching stock news: {e}")
-        return []
+        return [], [f"Error fetching stock news: {e}"]
 
     # Validate response content
     if "results" not in data:
-        st.error("No news results found in the API response.")
-        return []
+        return [], ["No news results found in the API response."]
 
     # Parse and return news data
     news_list = [{
@@ -84,70 +188,396 @@ def fetch_stock_news(ticker):
         "Sentiment Reasoning": item["insights"][0].get("sentiment_reasoning") if item.get("insights") else None
     } for item in data["results"]]
     
-    return news_list
+    return news_list, []
 
 
 # Function to fetch stock data from Polygon API using URL
-def fetch_stock_data(ticker, timespan="day", multiplier=1, limit=365, from_date="2024-01-01", to_date=None):
+def fetch_stock_data(ticker, timespan="day", multiplier=1, limit=None, from_date="2024-01-01", to_date=None, adjusted=True, errors=None):
     """
-    Fetches stock data for a specified ticker from the Polygon API within a date range.
+    Fetches stock data for a specified ticker within a date range, using the local bar cache
+    so that only bars missing from the cache are requested from the Polygon API.
 
     Parameters:
     - ticker (str): Stock ticker symbol.
     - timespan (str): Time unit for aggregation, e.g., "day", "minute". Default is "day".
     - multiplier (int): Multiplier for the timespan, e.g., 1 for daily data. Default is 1.
-    - limit (int): Maximum number of results to fetch. Default is 100.
+    - limit (int): Maximum number of bars to return from the start of the range. Default is None (all bars).
     - from_date (str): Start date for the data in "YYYY-MM-DD" format. Default is "2024-01-01".
     - to_date (str): End date for the data in "YYYY-MM-DD" format. Defaults to today's date if not provided.
+    - adjusted (bool): Whether the results are adjusted for splits. Default is True.
+    - errors (list): List collecting error messages instead of showing them (optional).
 
     Returns:
     - pd.DataFrame: DataFrame with columns for "Open", "High", "Low", "Close", "Volume", and indexed by date.
       Returns an empty DataFrame if data retrieval fails or required columns are missing.
     """
     
-    
     # Set default end date to today if not provided
     if not to_date:
         to_date = datetime.now().strftime("%Y-%m-%d")
-    
-    # Construct URL for Polygon API request
-    url = (
-        f"https://api.polygon.io/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{from_date}/{to_date}"
-        f"?adjusted=true&sort=asc&limit={limit}&apiKey={POLYGON_API_KEY}"
-    )
-    
-    # Make request to Polygon API
+
+    # Coarser bars are built locally from finer cached bars, so switching timespans needs no new query
+    source_timespan = _resample_source(ticker, timespan, multiplier, from_date, adjusted)
+    if source_timespan:
+        source_bars = fetch_stock_data(
+            ticker, source_timespan, 1, None, resample.period_start(from_date, timespan), to_date, adjusted, errors
+        )
+        stock_data = resample.resample_bars(source_bars, timespan)
+        return stock_data.iloc[:limit] if limit else stock_data
+
+    # Identical concurrent requests share a single call and recent results are reused.
+    # Results are kept as compact read-only bar series and each caller gets its own writable frame,
+    # since the chart adds indicator columns to the frame.
+    key = ("aggs", ticker, multiplier, timespan, limit, from_date, to_date, adjusted)
+    bars = _report(_polygon_requests.do(
+        key, _fetch_bar_series, ticker, timespan, multiplier, limit, from_date, to_date, adjusted
+    ), errors)
+
+    return bars.to_frame()
+
+
+def _fetch_bar_series(*args):
+    """
+    Fetches stock data like _fetch_stock_data and stores it as a compact BarSeries.
+
+    Returns:
+    - tuple: (bars, errors), where errors lists the messages to show to every caller.
+    """
+    bars, errors = _fetch_stock_data(*args)
+    return BarSeries.from_frame(bars), errors
+
+
+def _resample_source(ticker, timespan, multiplier, from_date, adjusted):
+    """
+    Determines whether bars of the requested timespan can be built locally from finer bars.
+
+    Parameters:
+    - ticker (str): Stock ticker symbol.
+    - timespan (str): Requested timespan.
+    - multiplier (int): Requested multiplier for the timespan.
+    - from_date (str): Start date for the data in "YYYY-MM-DD" format.
+    - adjusted (bool): Whether the results are adjusted for splits.
+
+    Returns:
+    - str: The finer timespan to resample from ("day" or "minute"), or None to query Polygon directly.
+    """
+
+    if multiplier != 1:
+        return None
+
+    # Weekly and longer bars always come from daily bars
+    if timespan in resample.RESAMPLE_PERIODS:
+        return "day"
+
+    # Hourly bars come from minute bars only when those are already cached for the range
+    if timespan == "hour":
+        covered_from = bar_cache.load_coverage(ticker, 1, "minute", adjusted)
+        if covered_from is not None and covered_from <= pd.Timestamp(from_date):
+            return "minute"
+
+    return None
+
+
+def _fetch_stock_data(ticker, timespan, multiplier, limit, from_date, to_date, adjusted):
+    """
+    Loads the cached bars for a ticker, requests the bars missing from the cache from the Polygon API
+    and updates the cache.
+
+    Returns:
+    - tuple: (bars, errors), where bars holds the cached bars when a request fails and errors lists
+      the messages to show to every caller.
+    """
+
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    # Load previously fetched bars for this series
+    cached, covered_from = bar_cache.load_bars(ticker, multiplier, timespan, adjusted)
+
+    # The cache can only be extended when the requested range overlaps it, otherwise it is replaced
+    if (
+        cached.empty
+        or covered_from is None
+        or from_date > cached.index[-1].strftime("%Y-%m-%d")
+        or to_date < covered_from.strftime("%Y-%m-%d")
+    ):
+        cached, covered_from = pd.DataFrame(), None
+
+    if cached.empty:
+        ranges = [(from_date, to_date)]
+    else:
+        last_cached = cached.index[-1].strftime("%Y-%m-%d")
+        covers_start = covered_from <= pd.Timestamp(from_date)
+        covers_end = last_cached >= to_date and to_date < today
+        in_range = cached.loc[from_date:to_date]
+
+        # Historical ranges inside the cache, or ranges whose first `limit` bars are cached, need no request
+        if covers_start and (covers_end or (limit and len(in_range) >= limit)):
+            return in_range.iloc[:limit], []
+
+        ranges = []
+        if limit:
+            # A limited delta could stop short of the bars the caller needs, so the whole range is requested
+            ranges.append((from_date, to_date))
+        else:
+            # Request the missing head of the range up to the earliest covered date
+            if not covers_start:
+                ranges.append((from_date, covered_from.strftime("%Y-%m-%d")))
+
+            # Request bars newer than the last cached bar, which is fetched again since it may have been
+            # incomplete when stored
+            if not covers_end:
+                ranges.append((max(from_date, last_cached), to_date))
+
+    bars, saved_from, errors = cached, covered_from, []
+    for request_from, request_to in ranges:
+        fresh, request_errors = _request_stock_data(
+            ticker, timespan, multiplier, limit, request_from, request_to, adjusted
+        )
+        errors += request_errors
+        if fresh.empty:
+            continue
+
+        # A request truncated by the limit before reaching the cached bars would leave a gap in the cache
+        if limit and len(fresh) >= limit and not bars.empty and fresh.index[-1] < bars.index[0]:
+            return fresh.iloc[:limit], errors
+
+        # Merge the new bars into the cache, extending its coverage when the head of the range was fetched
+        bars = bar_cache.merge_bars(bars, fresh)
+        if request_from == from_date:
+            saved_from = pd.Timestamp(from_date) if saved_from is None else min(saved_from, pd.Timestamp(from_date))
+
+    if bars.empty:
+        return pd.DataFrame(), errors
+
+    # Persist the result when anything new was fetched
+    if bars is not cached:
+        bar_cache.save_bars(bars, ticker, multiplier, timespan, adjusted, saved_from)
+
+    return bars.loc[from_date:to_date].iloc[:limit], errors
+
+
+def iter_aggregate_pages(ticker, timespan="day", multiplier=1, from_date="2024-01-01", to_date=None, adjusted=True, page_limit=AGGREGATES_PAGE_LIMIT):
+    """
+    Streams aggregate bars for a specified ticker from the Polygon API one page at a time,
+    following the "next_url" returned with each page until the date range is exhausted.
+
+    Parameters:
+    - ticker (str): Stock ticker symbol.
+    - timespan (str): Time unit for aggregation, e.g., "day", "minute". Default is "day".
+    - multiplier (int): Multiplier for the timespan. Default is 1.
+    - from_date (str): Start date for the data in "YYYY-MM-DD" format. Default is "2024-01-01".
+    - to_date (str): End date for the data in "YYYY-MM-DD" format. Defaults to today's date if not provided.
+    - adjusted (bool): Whether the results are adjusted for splits. Default is True.
+    - page_limit (int): Maximum number of base aggregates per page. Default is the Polygon maximum.
+
+    Yields:
+    - pd.DataFrame: The bars of one page, indexed by date. See _parse_aggregates.
+
+    Raises:
+    - requests.RequestException: If a page cannot be fetched.
+    """
+
+    # Set default end date to today if not provided
+    if not to_date:
+        to_date = datetime.now().strftime("%Y-%m-%d")
+
+    # Construct URL for the first page of the Polygon API request
+    url = f"/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{from_date}/{to_date}"
+    params = {"adjusted": str(adjusted).lower(), "sort": "asc", "limit": page_limit}
+
+    while url:
+        # Make request to Polygon API, the client raises an error for unsuccessful status codes
+        with get_client().get(url, params, stream=True) as response:
+            bars, data = _parse_aggregates(response.iter_content(AGGREGATES_READ_BYTES))
+
+        if bars is not None:
+            yield bars
+
+        # The next page URL already carries the cursor and query parameters
+        url = data.get("next_url")
+        params = None
+
+
+def _request_stock_data(ticker, timespan, multiplier, limit, from_date, to_date, adjusted):
+    """
+    Requests aggregate bars for a specified ticker from the Polygon API, page by page.
+
+    Parameters:
+    - ticker (str): Stock ticker symbol.
+    - timespan (str): Time unit for aggregation, e.g., "day", "minute".
+    - multiplier (int): Multiplier for the timespan.
+    - limit (int): Maximum number of bars to fetch, or None to fetch the whole date range.
+    - from_date (str): Start date for the data in "YYYY-MM-DD" format.
+    - to_date (str): End date for the data in "YYYY-MM-DD" format.
+    - adjusted (bool): Whether the results are adjusted for splits.
+
+    Returns:
+    - tuple: (df, errors), where df is a DataFrame with columns for "Open", "High", "Low", "Close", "Volume",
+      indexed by date, or an empty DataFrame if data retrieval fails or required columns are missing,
+      and errors lists the messages to show to every caller.
+    """
+
+    # Collect the pages, stopping early once enough bars have been received
+    chunks = []
+    bar_count = 0
     try:
-        response = requests.get(url)
-        # Raise an error for unsuccessful status codes
-        response.raise_for_status()  
-        data = response.json()
-        
+        for chunk in iter_aggregate_pages(ticker, timespan, multiplier, from_date, to_date, adjusted):
+            chunks.append(chunk)
+            bar_count += len(chunk)
+            if limit and bar_count >= limit:
+                break
+
     except requests.RequestException as e:
-        st.error(f"Error fetching stock data: {e}")
-        return pd.DataFrame()
+        return pd.DataFrame(), [f"Error fetching stock data: {e}"]
 
     # Validate response content
-    if "results" not in data:
-        st.error("No results found in the API response.")
-        return pd.DataFrame()
-
-    # Parse data and construct DataFrame
-    df = pd.DataFrame([{
-        "Date": datetime.fromtimestamp(item["t"] / 1000),  # Convert timestamp to datetime
-        "Open": item.get("o"),
-        "High": item.get("h"),
-        "Low": item.get("l"),
-        "Close": item.get("c"),
-        "Volume": item.get("v")
-    } for item in data["results"]]).set_index("Date")
+    if not chunks:
+        return pd.DataFrame(), ["No results found in the API response."]
+
+    df = pd.concat(chunks)
+    if limit:
+        df = df.iloc[:limit]
 
     # Required columns for plotting and analysis
     required_columns = ["Open", "High", "Low", "Close", "Volume"]
 
     # Validate presence of required columns
     if not all(col in df.columns for col in required_columns):
-        st.error("Fetched data is missing required columns.")
-        return pd.DataFrame()  # Return empty DataFrame if columns are missing
+        return pd.DataFrame(), ["Fetched data is missing required columns."]  # Empty DataFrame if columns are missing
+
+    return df, []
+
+
+def _results_to_frame(results):
+    """
+    Converts the "results" list of a Polygon aggregates response into a DataFrame column by column,
+    converting all timestamps in one vectorized step to the exchange's local time.
+
+    Parameters:
+    - results (list): List of aggregate bars as returned by the Polygon API.
+
+    Returns:
+    - pd.DataFrame: DataFrame with columns for "Open", "High", "Low", "Close", "Volume", and indexed by date.
+    """
+
+    count = len(results)
+
+    # Pull each field into a typed array, missing values become NaN
+    timestamps = np.fromiter((item["t"] for item in results), dtype=np.int64, count=count)
+    columns = {
+        column: np.fromiter((item.get(key, np.nan) for item in results), dtype=np.float64, count=count)
+        for key, column in AGGREGATE_FIELDS.items()
+    }
+
+    # Convert the millisecond epoch timestamps to naive exchange-local datetimes
+    index = (
+        pd.to_datetime(timestamps, unit="ms", utc=True)
+        .tz_convert(MARKET_TIMEZONE)
+        .tz_localize(None)
+        .rename("Date")
+    )
+
+    return pd.DataFrame(columns, index=index)
+
+
+def _loads(body):
+    """
+    Decodes JSON, using orjson when it is installed.
+
+    Parameters:
+    - body (bytes): The JSON to decode.
+
+    Returns:
+    - The decoded value.
+
+    Raises:
+    - requests.RequestException: If the body is not valid JSON.
+    """
+
+    try:
+        return orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError as e:
+        raise requests.RequestException(f"Invalid JSON in response: {e}")
+
+
+def _parse_aggregates(chunks):
+    """
+    Parses an aggregates page read in chunks, without decoding the whole body into Python objects.
+    The complete bars of each chunk are decoded and converted into a DataFrame before the next chunk
+    is read, so only one chunk's bars are held as dicts at a time. The rest of the page, such as
+    "next_url", is decoded once the results array has been read.
+
+    Aggregate bars are flat JSON objects of numbers, so a bar ends at the next "}" and the results
+    array ends at the next "]". Once a bar holds any other value, e.g., a nested object or true,
+    the rest of the page is decoded as a whole instead.
+
+    Parameters:
+    - chunks (iterable of bytes): The response body, e.g., from response.iter_content.
+
+    Returns:
+    - tuple: (bars, data), where bars is a DataFrame of the page's bars as from _results_to_frame, or None
+      if the page has none, and data is the rest of the page with an empty "results" list.
+
+    Raises:
+    - requests.RequestException: If the body is not valid JSON.
+    """
+
+    head = b""  # The page before the results array
+    pending = b""  # Bars of the results array that were only partly read
+    tail = []  # The page after the decoded bars
+    frames = []
+    state = "head"
+
+    for chunk in chunks:
+        if state in ("tail", "whole"):
+            tail.append(chunk)
+            continue
+
+        if state == "head":
+            head += chunk
+            match = _RESULTS_START.search(head)
+            if match is None:
+                continue
+            head, pending = head[:match.start()], head[match.end():]
+            state = "results"
+        else:
+            pending += chunk
+
+        # Split off the complete bars read so far, the results array ends at the first "]"
+        end = pending.find(b"]")
+        cut = end if end >= 0 else pending.rfind(b"}") + 1
+        complete = pending[:cut]
+
+        # A bar that is not flat may hide a "}" or "]", so the rest of the results is decoded as a whole
+        if _NON_NUMERIC_VALUE.search(complete):
+            tail.append(b"[" + pending.lstrip(b" \t\r\n,"))
+            state = "whole"
+            continue
+
+        if end >= 0:
+            tail.append(pending[end + 1:])
+            state = "tail"
+            pending = b""
+        else:
+            pending = pending[cut:]
+
+        complete = complete.strip(b" \t\r\n,")
+        if complete:
+            frames.append(_results_to_frame(_loads(b"[" + complete + b"]")))
+
+    if state == "results":
+        raise requests.RequestException("Invalid JSON in response: the results array is not closed")
+
+    if state == "whole":
+        # Decode the remaining bars along with the rest of the page
+        data = _loads(head + b'"results":' + b"".join(tail))
+        if data["results"]:
+            frames.append(_results_to_frame(data["results"]))
+        data["results"] = []
+    else:
+        # Decode the rest of the page with the results left out
+        data = _loads(head + (b'"results":[]' if state == "tail" else b"") + b"".join(tail))
+
+    bars = pd.concat(frames) if len(frames) > 1 else (frames[0] if frames else None)
 
-    return df
\ No newline at end of file
+    return bars, data
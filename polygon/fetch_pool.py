@@ -0,0 +1,45 @@
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+
+
+def fetch_concurrently(requests):
+    """
+    Runs several Polygon fetch functions at the same time and waits for all of them,
+    so the total latency is roughly that of the slowest request.
+
+    Each function must accept an `errors` keyword argument, a list to which it appends
+    its error messages instead of showing them. The errors are shown afterwards on the
+    calling script thread, in the order the requests were given.
+
+    Parameters:
+    - requests (dict): Maps a request name to a tuple of (function, *args), e.g.
+      {"news": (fetch_stock_news, "AAPL")}.
+
+    Returns:
+    - dict: Maps each request name to the function's result, or None if the request raised an error.
+      An error in one request does not affect the others.
+    """
+
+    if not requests:
+        return {}
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(requests), thread_name_prefix="polygon-fetch") as executor:
+        errors = {name: [] for name in requests}
+        futures = {
+            name: executor.submit(function, *args, errors=errors[name])
+            for name, (function, *args) in requests.items()
+        }
+
+        # Collect the results and show the errors in the order the requests were given
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name].append(f"Error fetching {name}: {e}")
+                results[name] = None
+
+            for message in errors[name]:
+                st.error(message)
+
+    return results
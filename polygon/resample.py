@@ -0,0 +1,66 @@
+import pandas as pd
+
+
+# Pandas period frequency used to group daily bars into each coarser timespan.
+# Weeks run from Sunday to Saturday like Polygon's weekly aggregates.
+RESAMPLE_PERIODS = {
+    "week": "W-SAT",
+    "month": "M",
+    "quarter": "Q",
+    "year": "Y",
+}
+
+# How each OHLCV column is combined when bars are merged
+OHLCV_AGGREGATION = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+}
+
+
+def period_start(date, timespan):
+    """
+    Returns the start of the period containing the date, so that the first resampled bar is complete.
+
+    Parameters:
+    - date (str): Date in "YYYY-MM-DD" format.
+    - timespan (str): Target timespan, e.g., "week", "month".
+
+    Returns:
+    - str: Start date of the period in "YYYY-MM-DD" format.
+    """
+
+    if timespan not in RESAMPLE_PERIODS:
+        return date
+
+    return pd.Timestamp(date).to_period(RESAMPLE_PERIODS[timespan]).start_time.strftime("%Y-%m-%d")
+
+
+def resample_bars(bars, timespan):
+    """
+    Builds coarser OHLCV bars from finer ones: hourly bars from minute bars, or weekly, monthly,
+    quarterly and yearly bars from daily bars.
+
+    Parameters:
+    - bars (pd.DataFrame): OHLCV bars indexed by exchange-local date.
+    - timespan (str): Target timespan, one of "hour", "week", "month", "quarter" or "year".
+
+    Returns:
+    - pd.DataFrame: Resampled bars indexed by the start of each period.
+    """
+
+    if bars.empty:
+        return bars
+
+    # Hours are aligned to the clock, longer periods to their calendar boundaries
+    if timespan == "hour":
+        keys = bars.index.floor("h")
+    else:
+        keys = bars.index.to_period(RESAMPLE_PERIODS[timespan]).start_time
+
+    resampled = bars.groupby(keys).agg(OHLCV_AGGREGATION)
+    resampled.index.name = "Date"
+
+    return resampled
@@ -0,0 +1,149 @@
+import math
+import pandas as pd
+import polygon.resample as resample
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+
+# Bars in one regular trading session (9:30 to 16:00) for intraday timespans. Sessions with extended hours
+# have more bars, so counting only regular hours never plans too few sessions.
+SESSION_BARS = {
+    "minute": 390,
+    "hour": 7,
+}
+
+
+def _nth_weekday(year, month, weekday, n):
+    """
+    Returns the n-th given weekday (0 is Monday) of a month, or the last one if n is -1.
+    """
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+    last = date(year + 1, 1, 1) - timedelta(days=1) if month == 12 else date(year, month + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year):
+    """
+    Returns Easter Sunday of a year (anonymous Gregorian algorithm).
+    """
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _observed(holiday):
+    """
+    Moves a fixed-date holiday on a weekend to the Friday before or the Monday after.
+    """
+    if holiday.weekday() == 5:
+        return holiday - timedelta(days=1)
+    if holiday.weekday() == 6:
+        return holiday + timedelta(days=1)
+    return holiday
+
+
+@lru_cache(maxsize=None)
+def nyse_holidays(year):
+    """
+    Returns the full-day NYSE holidays of a year. Closures for special events are not included.
+
+    Parameters:
+    - year (int): The year.
+
+    Returns:
+    - frozenset of date: The weekdays the exchange is closed.
+    """
+    holidays = {
+        _nth_weekday(year, 1, 0, 3),  # Martin Luther King Jr. Day
+        _nth_weekday(year, 2, 0, 3),  # Washington's Birthday
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _observed(date(year, 7, 4)),  # Independence Day
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving Day
+        _observed(date(year, 12, 25)),  # Christmas Day
+    }
+
+    # New Year's Day on a Saturday is not observed on the Friday before, which closes the previous year
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.add(_observed(new_year))
+
+    # Juneteenth has been a holiday since 2022
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))
+
+    return frozenset(holidays)
+
+
+def is_trading_day(day):
+    """
+    Checks whether the exchange is open on a day.
+
+    Parameters:
+    - day (date): The day.
+
+    Returns:
+    - bool: True for weekdays that are not NYSE holidays.
+    """
+    return day.weekday() < 5 and day not in nyse_holidays(day.year)
+
+
+def trading_days_back(end, count):
+    """
+    Returns the earliest of the last count trading days up to and including the end date.
+
+    Parameters:
+    - end (date): The last day.
+    - count (int): Number of trading days.
+
+    Returns:
+    - date: The first of the trading days.
+    """
+    day = end
+    remaining = max(count, 1)
+
+    while True:
+        if is_trading_day(day):
+            remaining -= 1
+            if remaining == 0:
+                return day
+        day -= timedelta(days=1)
+
+
+def start_date_for_bars(timespan, bars, end_date=None):
+    """
+    Returns the start date from which a range ending on the end date holds at least the given number of bars.
+
+    Parameters:
+    - timespan (str): Timespan of the bars, e.g., "hour", "day", "week".
+    - bars (int): Number of bars needed.
+    - end_date (str): Last date in "YYYY-MM-DD" format. Defaults to today.
+
+    Returns:
+    - str: Start date in "YYYY-MM-DD" format.
+    """
+    end = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else date.today()
+
+    # Daily and intraday bars only exist on trading days
+    if timespan in SESSION_BARS or timespan == "day":
+        sessions = math.ceil(bars / SESSION_BARS.get(timespan, 1))
+        return trading_days_back(end, sessions).strftime("%Y-%m-%d")
+
+    # Coarser bars start at calendar period boundaries
+    if timespan in resample.RESAMPLE_PERIODS:
+        period = pd.Timestamp(end).to_period(resample.RESAMPLE_PERIODS[timespan]) - (max(bars, 1) - 1)
+        return period.start_time.strftime("%Y-%m-%d")
+
+    return end.strftime("%Y-%m-%d")
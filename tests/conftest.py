@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Import the app's packages from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
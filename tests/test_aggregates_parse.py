@@ -0,0 +1,151 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+import polygon.data_fetcher as data_fetcher
+
+
+def aggregate_results(n, seed=0):
+    """
+    Builds the "results" list of a Polygon aggregates response, one minute bar apart.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, n))
+    start = int(pd.Timestamp("2024-01-02 14:30").timestamp() * 1000)
+
+    return [
+        {"v": float(rng.integers(1_000, 100_000)), "vw": round(c, 4), "o": round(c - 0.05, 4), "c": round(c, 4),
+         "h": round(c + 0.1, 4), "l": round(c - 0.1, 4), "t": start + i * 60_000, "n": 10}
+        for i, c in enumerate(close.tolist())
+    ]
+
+
+def _page(results, **fields):
+    return json.dumps({"ticker": "AAPL", "queryCount": len(results), "results": results, "status": "OK", **fields})
+
+
+def _chunks(body, size):
+    body = body.encode()
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 1000, 10 ** 9])
+def test_parse_matches_whole_page(size):
+    results = aggregate_results(300)
+    body = _page(results, next_url="https://api.polygon.io/v2/aggs/next?cursor=abc")
+
+    bars, data = data_fetcher._parse_aggregates(_chunks(body, size))
+
+    pd.testing.assert_frame_equal(bars, data_fetcher._results_to_frame(results))
+    assert data["next_url"] == "https://api.polygon.io/v2/aggs/next?cursor=abc"
+    assert data["results"] == [] and data["status"] == "OK"
+
+
+def test_parse_pretty_printed_page_with_missing_fields():
+    results = aggregate_results(20)
+    del results[3]["v"]
+    body = json.dumps({"results": results, "status": "OK"}, indent=2)
+
+    bars, data = data_fetcher._parse_aggregates(_chunks(body, 50))
+
+    assert len(bars) == 20
+    assert pd.isna(bars["Volume"].iloc[3])
+    assert data == {"results": [], "status": "OK"}
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 1000, 10 ** 9])
+def test_parse_falls_back_for_bars_that_are_not_flat_numbers(size):
+    results = aggregate_results(50)
+    for item in results[:30:3]:
+        item["otc"] = True
+    results[10]["x"] = {"nested": [1, {"a": "]}"}]}
+    results[40]["s"] = "a}b]c"
+    body = _page(results, next_url="https://api.polygon.io/v2/aggs/next?cursor=abc")
+
+    bars, data = data_fetcher._parse_aggregates(_chunks(body, size))
+
+    pd.testing.assert_frame_equal(bars, data_fetcher._results_to_frame(results))
+    assert data["next_url"] == "https://api.polygon.io/v2/aggs/next?cursor=abc"
+    assert data["results"] == [] and data["status"] == "OK"
+
+
+@pytest.mark.parametrize("body", [
+    '{"status": "OK", "resultsCount": 0}',
+    '{"status": "OK", "results": []}',
+])
+def test_parse_page_without_bars(body):
+    bars, data = data_fetcher._parse_aggregates(_chunks(body, 5))
+
+    assert bars is None
+    assert data["status"] == "OK"
+
+
+@pytest.mark.parametrize("body", ['{"results": [{"t": 1, "o": 2}', '{"results": [{"t": 1, "o": }]}', "<html>"])
+def test_parse_invalid_page(body):
+    with pytest.raises(requests.RequestException):
+        data_fetcher._parse_aggregates(_chunks(body, 4))
+
+
+class _PagedClient:
+    """
+    Polygon client that serves pages of bars linked by next_url, read in chunks.
+    """
+
+    class _Response:
+        def __init__(self, body):
+            self.body = body
+            self.closed = False
+
+        def iter_content(self, size):
+            return iter(_chunks(self.body, size))
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.closed = True
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.urls = []
+        self.responses = []
+
+    def get(self, url, params=None, stream=False):
+        assert stream
+        self.urls.append(url)
+        index = len(self.urls) - 1
+        fields = {"next_url": f"https://api.polygon.io/next/{index + 1}"} if index + 1 < len(self.pages) else {}
+        self.responses.append(self._Response(_page(self.pages[index], **fields)))
+        return self.responses[-1]
+
+
+def test_iter_aggregate_pages_follows_next_url(monkeypatch):
+    results = aggregate_results(2_500)
+    pages = [results[:1000], results[1000:2000], results[2000:]]
+    client = _PagedClient(pages)
+    monkeypatch.setattr(data_fetcher, "get_client", lambda: client)
+    monkeypatch.setattr(data_fetcher, "AGGREGATES_READ_BYTES", 4096)
+
+    frames = list(data_fetcher.iter_aggregate_pages("AAPL", "minute", from_date="2024-01-02", to_date="2024-01-03"))
+
+    assert [len(frame) for frame in frames] == [1000, 1000, 500]
+    pd.testing.assert_frame_equal(pd.concat(frames), data_fetcher._results_to_frame(results))
+    assert client.urls[1:] == ["https://api.polygon.io/next/1", "https://api.polygon.io/next/2"]
+    assert all(response.closed for response in client.responses)
+
+
+def test_results_to_frame_uses_exchange_local_time():
+    # 2024-01-02 14:30 UTC (winter) and 2024-07-01 13:30 UTC (summer) are both the 09:30 open in New York
+    results = [
+        {"t": 1704205800000, "o": 1, "h": 2, "l": 0.5, "c": 1.5, "v": 100},
+        {"t": 1719840600000, "o": 2, "h": 3, "l": 1.5, "c": 2.5},
+    ]
+
+    bars = data_fetcher._results_to_frame(results)
+
+    assert list(bars.index) == [pd.Timestamp("2024-01-02 09:30"), pd.Timestamp("2024-07-01 09:30")]
+    assert bars.index.name == "Date"
+    assert list(bars.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert all(dtype == np.float64 for dtype in bars.dtypes)
+    assert np.isnan(bars["Volume"].iloc[1])
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+import indicators.backtest as backtest
+import indicators.compute as compute
+import indicators.rules as rules
+from benchmarks.common import random_walk_bars
+
+
+def _loop_backtest(close, entries, exits, cost):
+    """
+    Bar-by-bar reference of run_backtest, returning the equity curve and the trade returns.
+    """
+    equity = []
+    value = 1.0
+    position = 0.0
+    held = 0.0
+    trade_start = None
+    trades = []
+
+    for i in range(len(close)):
+        # The position decided at the previous close is held over this bar
+        previous_held, held = held, position
+        bar_return = close[i] / close[i - 1] - 1 if i > 0 else 0.0
+        value *= 1 + held * bar_return - abs(held - previous_held) * cost
+
+        if held and not previous_held:
+            trade_start = equity[-1] if equity else 1.0
+        if previous_held and not held:
+            trades.append(value / trade_start - 1)
+        equity.append(value)
+
+        if exits[i]:
+            position = 0.0
+        elif entries[i]:
+            position = 1.0
+
+    if held:
+        trades.append(value / trade_start - 1)
+
+    return np.array(equity), np.array(trades)
+
+
+@pytest.mark.parametrize("cost", [0.0, 0.001])
+def test_backtest_matches_a_bar_by_bar_loop(cost):
+    data = random_walk_bars(2_520, seed=13)
+    entry_rule, exit_rule = "CROSS_ABOVE(EMA(12), EMA(26))", "CROSS_BELOW(EMA(12), EMA(26))"
+
+    result = backtest.run_backtest(data, entry_rule, exit_rule, cost=cost)
+
+    entries, _ = rules.evaluate_rule(rules.parse_rule(entry_rule), data)
+    exits, _ = rules.evaluate_rule(rules.parse_rule(exit_rule), data)
+    equity, trades = _loop_backtest(data["Close"].to_numpy(), entries.to_numpy(), exits.to_numpy(), cost)
+
+    np.testing.assert_allclose(result["equity"].to_numpy(), equity, rtol=1e-12)
+    assert result["total_return"] == pytest.approx(equity[-1] - 1, rel=1e-12)
+    assert result["trades"] == len(trades) > 10
+    assert result["win_rate"] == pytest.approx(np.mean(trades > 0))
+    assert result["entries"].sum() == result["trades"]
+
+
+def test_crossovers_hold_only_on_the_crossing_bar():
+    data = random_walk_bars(500, seed=14)
+    fast, slow = compute.calculate_ema(data, 12), compute.calculate_ema(data, 26)
+
+    above, _ = rules.evaluate_rule(rules.parse_rule("CROSS_ABOVE(EMA(12), EMA(26))"), data)
+
+    expected = (fast > slow) & (fast.shift() <= slow.shift())
+    pd.testing.assert_series_equal(above, expected, check_names=False)
+    assert rules.rule_terms(rules.parse_rule("CROSS_ABOVE(EMA(12), EMA(26))")) == ["EMA(12)", "EMA(26)"]
+
+
+def test_exit_wins_over_entry_on_the_same_bar():
+    entries = np.array([True, False, True, True, False])
+    exits = np.array([False, False, True, False, True])
+
+    position = backtest.positions_from_signals(entries, exits)
+
+    np.testing.assert_array_equal(position, [1.0, 1.0, 0.0, 1.0, 0.0])
+
+
+def test_no_signals_means_no_trades():
+    result = backtest.run_backtest(random_walk_bars(100), "Close < 0", "Close < 0")
+
+    assert result["total_return"] == 0.0 and result["trades"] == 0 and result["exposure"] == 0.0
+    assert np.isnan(result["win_rate"])
+
+
+def test_no_bars_is_an_error():
+    with pytest.raises(ValueError):
+        backtest.run_backtest(pd.DataFrame(), "Close > 0", "Close < 0")
@@ -0,0 +1,160 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import polygon.bar_cache as bar_cache
+import polygon.data_fetcher as data_fetcher
+
+
+def _bars(start, end):
+    """
+    Builds daily OHLCV bars on business days between two dates.
+    """
+    index = pd.bdate_range(start, end, name="Date").as_unit("ns")
+    close = 100 + np.arange(len(index), dtype=float)
+    return pd.DataFrame(
+        {"Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000.0},
+        index=index,
+    )
+
+
+# Bars the fake Polygon API serves
+UPSTREAM = _bars("2023-01-01", "2024-12-31")
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(bar_cache, "BAR_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def requests_made(monkeypatch, cache_dir):
+    """
+    Serves aggregate requests from UPSTREAM and records the requested date ranges.
+    """
+    made = []
+
+    def request(ticker, timespan, multiplier, limit, from_date, to_date, adjusted):
+        made.append((from_date, to_date, limit))
+        return UPSTREAM.loc[from_date:to_date].iloc[:limit], []
+
+    monkeypatch.setattr(data_fetcher, "_request_stock_data", request)
+    data_fetcher._polygon_requests.cache.clear()
+    return made
+
+
+def _seed(from_date, to_date):
+    bar_cache.save_bars(UPSTREAM.loc[from_date:to_date], "AAPL", 1, "day", covered_from=pd.Timestamp(from_date))
+
+
+def test_merge_prefers_fresh_bars():
+    cached = _bars("2024-01-01", "2024-01-10")
+    fresh = _bars("2024-01-10", "2024-01-15") + 1000
+
+    merged = bar_cache.merge_bars(cached, fresh)
+
+    assert merged.index.is_monotonic_increasing
+    assert not merged.index.duplicated().any()
+    assert merged.loc["2024-01-10", "Close"] == fresh.loc["2024-01-10", "Close"]
+    assert merged.loc["2024-01-09", "Close"] == cached.loc["2024-01-09", "Close"]
+    assert len(merged) == len(pd.bdate_range("2024-01-01", "2024-01-15"))
+
+
+def test_merge_with_empty_side():
+    bars = _bars("2024-01-01", "2024-01-10")
+
+    assert bar_cache.merge_bars(pd.DataFrame(), bars) is bars
+    assert bar_cache.merge_bars(bars, pd.DataFrame()) is bars
+
+
+def test_save_and_load_keep_bars_and_coverage(cache_dir):
+    bars = _bars("2024-01-02", "2024-02-01")
+    bar_cache.save_bars(bars, "brk.b", 1, "day", covered_from=pd.Timestamp("2024-01-01"))
+
+    loaded, covered_from = bar_cache.load_bars("brk.b", 1, "day")
+
+    pd.testing.assert_frame_equal(loaded, bars, check_freq=False)
+    assert covered_from == pd.Timestamp("2024-01-01")
+    assert bar_cache.load_bars("brk.b", 1, "day", adjusted=False)[0].empty
+
+
+def test_missing_or_corrupt_cache_is_a_miss(cache_dir):
+    loaded, covered_from = bar_cache.load_bars("AAPL", 1, "day")
+    assert loaded.empty and covered_from is None
+
+    path = bar_cache._cache_path("AAPL", 1, "day", True)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(b"not parquet")
+
+    loaded, covered_from = bar_cache.load_bars("AAPL", 1, "day")
+    assert loaded.empty and covered_from is None
+
+
+def test_cold_cache_fetches_whole_range(requests_made):
+    bars = data_fetcher.fetch_stock_data("AAPL", limit=None, from_date="2024-01-01", to_date="2024-03-01")
+
+    assert requests_made == [("2024-01-01", "2024-03-01", None)]
+    pd.testing.assert_frame_equal(bars, UPSTREAM.loc["2024-01-01":"2024-03-01"], check_freq=False)
+    assert bar_cache.load_bars("AAPL", 1, "day")[1] == pd.Timestamp("2024-01-01")
+
+
+def test_only_newer_bars_are_requested(requests_made):
+    _seed("2024-01-01", "2024-03-01")
+
+    bars = data_fetcher.fetch_stock_data("AAPL", limit=None, from_date="2024-02-01", to_date="2024-04-01")
+
+    # The last cached bar is requested again along with the newer bars
+    assert requests_made == [("2024-03-01", "2024-04-01", None)]
+    pd.testing.assert_frame_equal(bars, UPSTREAM.loc["2024-02-01":"2024-04-01"], check_freq=False)
+
+
+def test_historical_range_inside_cache_needs_no_request(requests_made):
+    _seed("2024-01-01", "2024-03-01")
+
+    bars = data_fetcher.fetch_stock_data("AAPL", limit=None, from_date="2024-01-15", to_date="2024-02-15")
+
+    assert requests_made == []
+    pd.testing.assert_frame_equal(bars, UPSTREAM.loc["2024-01-15":"2024-02-15"], check_freq=False)
+
+
+def test_missing_head_is_fetched_and_merged(requests_made):
+    _seed("2024-03-01", "2024-06-03")
+
+    bars = data_fetcher.fetch_stock_data("AAPL", limit=None, from_date="2024-01-01", to_date="2024-05-01")
+
+    # Only the head before the covered range is requested, the cached bars are kept
+    assert requests_made == [("2024-01-01", "2024-03-01", None)]
+    pd.testing.assert_frame_equal(bars, UPSTREAM.loc["2024-01-01":"2024-05-01"], check_freq=False)
+
+    cached, covered_from = bar_cache.load_bars("AAPL", 1, "day")
+    assert covered_from == pd.Timestamp("2024-01-01")
+    pd.testing.assert_frame_equal(cached, UPSTREAM.loc["2024-01-01":"2024-06-03"], check_freq=False)
+
+
+def test_limit_is_applied_to_cached_bars(requests_made):
+    _seed("2024-01-01", "2024-06-03")
+
+    bars = data_fetcher.fetch_stock_data("AAPL", limit=10, from_date="2024-02-01", to_date="2024-12-31")
+
+    assert requests_made == []
+    pd.testing.assert_frame_equal(bars, UPSTREAM.loc["2024-02-01":].iloc[:10], check_freq=False)
+
+
+def test_limit_requests_whole_range(requests_made):
+    _seed("2024-01-01", "2024-01-10")
+
+    bars = data_fetcher.fetch_stock_data("AAPL", limit=20, from_date="2024-01-01", to_date="2024-12-31")
+
+    assert requests_made == [("2024-01-01", "2024-12-31", 20)]
+    pd.testing.assert_frame_equal(bars, UPSTREAM.loc["2024-01-01":].iloc[:20], check_freq=False)
+
+
+def test_limited_head_that_misses_the_cache_is_not_saved(requests_made):
+    _seed("2024-06-03", "2024-07-01")
+
+    bars = data_fetcher.fetch_stock_data("AAPL", limit=5, from_date="2024-01-01", to_date="2024-07-01")
+
+    pd.testing.assert_frame_equal(bars, UPSTREAM.loc["2024-01-01":].iloc[:5], check_freq=False)
+    assert bar_cache.load_bars("AAPL", 1, "day")[1] == pd.Timestamp("2024-06-03")
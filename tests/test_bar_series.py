@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+import polygon.data_fetcher as data_fetcher
+from indicators.bar_series import BarSeries
+from benchmarks.common import random_walk_bars
+
+
+def test_round_trip_keeps_bars():
+    frame = random_walk_bars(500)
+
+    bars = BarSeries.from_frame(frame)
+
+    pd.testing.assert_frame_equal(bars.to_frame(), frame, check_freq=False)
+    pd.testing.assert_series_equal(bars["Close"], frame["Close"], check_freq=False)
+    assert len(bars) == 500 and "Volume" in bars and not bars.empty
+    assert bars.nbytes == 500 * 8 * 6
+
+
+def test_float32_halves_the_values():
+    frame = random_walk_bars(100)
+
+    bars = BarSeries.from_frame(frame, dtype=np.float32)
+
+    assert bars.values.dtype == np.float32
+    np.testing.assert_allclose(bars["Close"].to_numpy(), frame["Close"].to_numpy(), rtol=1e-6)
+
+
+def test_empty_frame():
+    bars = BarSeries.from_frame(pd.DataFrame())
+
+    assert bars.empty
+    assert bars.to_frame().empty
+
+
+def test_shared_arrays_are_read_only():
+    bars = BarSeries.from_frame(random_walk_bars(10))
+
+    with pytest.raises(ValueError):
+        bars.values[3, 0] = 0.0
+    with pytest.raises(ValueError):
+        bars["Close"].to_numpy()[0] = 0.0
+
+
+def test_frames_are_writable_and_do_not_touch_the_series():
+    frame = random_walk_bars(10)
+    bars = BarSeries.from_frame(frame)
+
+    result = bars.to_frame()
+    result.loc[result.index[3], "Close"] = -1.0
+    result["Close"] *= 2
+    result["SMA"] = result["Close"].rolling(3).mean()
+
+    assert result["Close"].iloc[3] == -2.0
+    pd.testing.assert_frame_equal(bars.to_frame(), frame, check_freq=False)
+
+
+def test_fetched_frames_can_be_modified(monkeypatch):
+    frame = random_walk_bars(50)
+    monkeypatch.setattr(data_fetcher, "_fetch_stock_data", lambda *args: (frame, []))
+    data_fetcher._polygon_requests.cache.clear()
+    args = ("AAPL", "minute", 1, None, "2000-01-03", "2000-01-04")
+
+    first = data_fetcher.fetch_stock_data(*args)
+    first.loc[first.index[0], "Close"] = 0.0
+    first["Close"] = first["Close"] + 1
+
+    # The next caller gets the cached bars unchanged
+    second = data_fetcher.fetch_stock_data(*args)
+    pd.testing.assert_frame_equal(second, frame, check_freq=False)
+    assert data_fetcher._polygon_requests.stats()["cache_hits"] >= 1
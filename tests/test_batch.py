@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+import indicators.batch as batch
+import indicators.compute as compute
+import indicators.kernels as kernels
+from benchmarks.common import random_walk_bars
+
+
+@pytest.fixture(params=["compiled", "numpy"])
+def ema_kernel(request, monkeypatch):
+    """
+    Runs the row EMAs through the Numba kernel and through the NumPy fallback.
+    """
+    if request.param == "compiled" and kernels._ema_rows_compiled is None:
+        pytest.skip("Numba is not installed")
+    if request.param == "numpy":
+        monkeypatch.setattr(kernels, "_ema_rows_compiled", None)
+
+
+@pytest.fixture
+def ragged():
+    """
+    Tickers with histories of different lengths, starting and ending on different dates.
+    """
+    bars = random_walk_bars(400, seed=7)
+    frames = {
+        "FULL": bars,
+        "LATE": random_walk_bars(400, seed=8).iloc[150:],
+        "EARLY": random_walk_bars(400, seed=9).iloc[:230],
+        "MIDDLE": random_walk_bars(400, seed=10).iloc[60:300],
+        "SHORT": random_walk_bars(400, seed=11).iloc[390:],
+        "EMPTY": pd.DataFrame(),
+    }
+    return frames, batch.align_frames(frames)
+
+
+def test_align_frames_places_bars_on_the_union_of_dates(ragged):
+    frames, (tickers, index, arrays) = ragged
+
+    assert tickers == ["FULL", "LATE", "EARLY", "MIDDLE", "SHORT"]
+    assert index.equals(frames["FULL"].index.rename("Date"))
+    late = arrays["Close"][tickers.index("LATE")]
+    assert np.isnan(late[:150]).all()
+    np.testing.assert_array_equal(late[150:], frames["LATE"]["Close"].to_numpy())
+
+
+# Batched indicator, per-ticker compute function and parameters to compare
+CASES = [
+    ("sma", compute.calculate_sma, (20,)),
+    ("ema", compute.calculate_ema, (12,)),
+    ("rsi", compute.calculate_rsi, (14,)),
+    ("rsi", compute.calculate_rsi, (14, "wilder")),
+    ("macd", compute.calculate_macd, (12, 26, 9)),
+    ("atr", compute.calculate_atr, (14,)),
+    ("atr", compute.calculate_atr, (5, "wilder")),
+    ("bollinger bands", compute.calculate_bollinger_bands, (20,)),
+    ("obv", compute.calculate_obv, ()),
+    ("vroc", compute.calculate_vroc, (14,)),
+]
+
+
+@pytest.mark.parametrize("name, function, params", CASES, ids=[" ".join(map(str, (case[0], *case[2]))) for case in CASES])
+def test_batch_matches_per_ticker_on_ragged_histories(ema_kernel, ragged, name, function, params):
+    frames, (tickers, index, arrays) = ragged
+
+    result = batch.compute_batch(arrays, [(name, *params)])[(name, *params)]
+    result = result if isinstance(result, tuple) else (result,)
+
+    for row, ticker in enumerate(tickers):
+        positions = index.get_indexer(frames[ticker].index)
+        expected = function(frames[ticker], *params)
+        expected = expected if isinstance(expected, tuple) else (expected,)
+        for actual, wanted in zip(result, expected):
+            np.testing.assert_allclose(
+                actual[row, positions], wanted.to_numpy(dtype=float), rtol=1e-9, atol=1e-9, equal_nan=True
+            )
+
+
+def test_failures_are_returned_per_indicator(ragged):
+    _, (_, _, arrays) = ragged
+
+    results = batch.compute_batch({"Close": arrays["Close"]}, ["rsi", "obv", ("rsi", 14, "ema")])
+
+    assert isinstance(results["obv"], compute.IndicatorError)
+    assert isinstance(results[("rsi", 14, "ema")], compute.IndicatorError)
+    assert results["rsi"].shape == arrays["Close"].shape
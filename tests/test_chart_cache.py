@@ -0,0 +1,83 @@
+import matplotlib
+import pytest
+import indicators.chart_cache as chart_cache
+import indicators.memo as memo
+import indicators.plot as plot
+import indicators.render_pool as render_pool
+from benchmarks.common import random_walk_bars
+
+matplotlib.use("Agg")
+
+
+def test_key_ignores_indicator_order_and_follows_the_bars():
+    data = random_walk_bars(50)
+    key = chart_cache.chart_key("aapl", "day", ["rsi", "sma"], "charles", data)
+
+    assert chart_cache.chart_key("AAPL", "day", ["sma", "rsi", "rsi"], "charles", data.copy()) == key
+
+    # A still forming last bar that moves changes the key, as does a new bar
+    updated = data.copy()
+    updated.iloc[-1, updated.columns.get_loc("Close")] += 0.01
+    assert chart_cache.chart_key("AAPL", "day", ["rsi", "sma"], "charles", updated) != key
+    assert chart_cache.chart_key("AAPL", "day", ["rsi", "sma"], "charles", random_walk_bars(51)) != key
+    assert chart_cache.chart_key("AAPL", "week", ["rsi", "sma"], "charles", data) != key
+
+
+def test_images_are_sized_by_their_bytes():
+    cache = memo.MemoCache(max_bytes=1_000, max_entries=10)
+
+    cache.set("small", (b"x" * 400, ()))
+    cache.set("other", (b"x" * 400, ()))
+    cache.set("third", (b"x" * 400, ()))
+
+    assert cache.stats()["entries"] == 2 and cache.stats()["nbytes"] == 800
+
+
+@pytest.fixture
+def shown(monkeypatch):
+    """
+    Records what the chart shows instead of sending it to Streamlit, and counts the renders, which run in the test process.
+    """
+    monkeypatch.setattr(chart_cache, "rendered_charts", memo.MemoCache())
+    monkeypatch.setattr(render_pool, "CHART_RENDER_WORKERS", 0)
+    shown = {"images": [], "warnings": [], "renders": 0}
+    monkeypatch.setattr(plot.st, "image", lambda image, **kwargs: shown["images"].append(image))
+    monkeypatch.setattr(plot.st, "warning", shown["warnings"].append)
+    monkeypatch.setattr(plot.st, "error", shown["warnings"].append)
+
+    render = plot.mpf.plot
+
+    def counted(*args, **kwargs):
+        shown["renders"] += 1
+        return render(*args, **kwargs)
+
+    monkeypatch.setattr(plot.mpf, "plot", counted)
+    return shown
+
+
+def test_repeated_chart_is_served_from_the_cache(shown):
+    data = random_walk_bars(60)
+
+    plot.plot_indicators("AAPL", data, ["sma", "rsi"], timespan="day")
+    plot.plot_indicators("AAPL", data.copy(), ["RSI", "SMA"], timespan="day")
+
+    assert shown["renders"] == 1
+    assert len(shown["images"]) == 2 and shown["images"][0] == shown["images"][1]
+    assert shown["images"][0].startswith(b"\x89PNG")
+
+
+def test_notices_are_shown_again_on_a_cache_hit(shown):
+    data = random_walk_bars(15)
+
+    plot.plot_indicators("AAPL", data, ["sma"], timespan="day")
+    plot.plot_indicators("AAPL", data, ["sma"], timespan="day")
+
+    assert shown["renders"] == 1
+    assert shown["warnings"] == ["Cannot plot SMA due to insufficient data"] * 2
+
+
+def test_changed_bars_are_rendered_again(shown):
+    plot.plot_indicators("AAPL", random_walk_bars(60), ["rsi"], timespan="day")
+    plot.plot_indicators("AAPL", random_walk_bars(61), ["rsi"], timespan="day")
+
+    assert shown["renders"] == 2
@@ -0,0 +1,121 @@
+import pytest
+import requests
+import polygon.client as client
+
+
+class _Clock:
+    """
+    Fake monotonic clock that advances only when slept on.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(client.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(client.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_bucket_allows_a_burst_then_waits_for_refill(clock):
+    bucket = client.TokenBucket(60)
+
+    # A full bucket serves its capacity without waiting
+    assert [bucket.acquire() for _ in range(60)] == [0.0] * 60
+
+    # The next token arrives after 1 second at 60 tokens per minute
+    assert bucket.acquire() == pytest.approx(1.0)
+    assert clock.now == pytest.approx(1001.0)
+
+
+def test_bucket_refills_with_elapsed_time_up_to_capacity(clock):
+    bucket = client.TokenBucket(6, capacity=3)
+    for _ in range(3):
+        bucket.acquire()
+
+    # 20 seconds at 6 tokens per minute refill 2 tokens
+    clock.now += 20
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(10.0)
+
+    # A long idle period never saves up more than the capacity
+    clock.now += 3600
+    assert [bucket.acquire() for _ in range(3)] == [0.0] * 3
+    assert bucket.acquire() == pytest.approx(10.0)
+
+
+def test_zero_rate_disables_throttling(clock):
+    bucket = client.TokenBucket(0)
+
+    assert all(bucket.acquire() == 0.0 for _ in range(100))
+    assert clock.slept == []
+
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+
+class _Session:
+    """
+    Fake session returning the queued responses or raising the queued errors in order.
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        self.calls.append((url, params))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_client_retries_throttled_and_failed_requests(clock):
+    polygon = client.PolygonClient(api_key="key", requests_per_minute=0)
+    throttled = _Response(429, {"Retry-After": "2"})
+    polygon.session = _Session(requests.ConnectionError("reset"), throttled, _Response(200))
+
+    response = polygon.get("/v2/reference/news", {"ticker": "AAPL"})
+
+    assert response.status_code == 200
+    assert polygon.session.calls[0] == (
+        "https://api.polygon.io/v2/reference/news", {"ticker": "AAPL", "apiKey": "key"}
+    )
+    assert polygon.stats()["retries"] == 2
+    assert throttled.closed and not response.closed
+    assert clock.slept[-1] == 2.0
+
+
+def test_client_gives_up_after_max_retries(clock):
+    polygon = client.PolygonClient(api_key="key", requests_per_minute=0, max_retries=1)
+    polygon.session = _Session(_Response(503), _Response(503))
+
+    with pytest.raises(requests.HTTPError):
+        polygon.get("/v2/reference/news")
+
+    assert polygon.stats()["failures"] == 1
+    assert len(polygon.session.calls) == 2
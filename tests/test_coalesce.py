@@ -0,0 +1,101 @@
+import threading
+import pytest
+import polygon.coalesce as coalesce
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(coalesce.time, "monotonic", lambda: now[0])
+    cache = coalesce.TTLCache(maxsize=4, ttl=10)
+
+    cache.set("a", 1)
+    now[0] += 9
+    assert cache.get("a") == (True, 1)
+    now[0] += 2
+    assert cache.get("a") == (False, None)
+    assert "a" not in cache.entries
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = coalesce.TTLCache(maxsize=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+
+
+def test_concurrent_calls_share_one_call():
+    flight = coalesce.SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch(value):
+        calls.append(value)
+        release.wait(5)
+        return [value]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", fetch, 1))) for _ in range(4)]
+    threads[0].start()
+    while not flight.calls:
+        pass
+    for thread in threads[1:]:
+        thread.start()
+    while flight.stats()["coalesced"] < 3:
+        pass
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results == [[1]] * 4
+
+    # The finished result is served from the cache
+    assert flight.do("key", fetch, 2) == [1]
+    assert flight.stats() == {"calls": 1, "cache_hits": 1, "coalesced": 3}
+
+
+def test_errors_and_empty_results_are_not_cached():
+    flight = coalesce.SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: []) == []
+    assert flight.do("key", lambda: [1]) == [1]
+    assert flight.stats()["calls"] == 3
+
+
+class _RacingCache(coalesce.TTLCache):
+    """
+    Cache whose first lookup misses while an identical call finishes and stores its result.
+    """
+
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+        self.lookups = 0
+
+    def get(self, key):
+        self.lookups += 1
+        if self.lookups == 1:
+            self.set(key, self.value)
+            return False, None
+        return super().get(key)
+
+
+def test_result_stored_after_the_first_cache_check_is_reused():
+    flight = coalesce.SingleFlight(_RacingCache(["cached"]))
+
+    def fetch():
+        raise AssertionError("the finished call's result should be reused")
+
+    assert flight.do("key", fetch) == ["cached"]
+    assert flight.stats() == {"calls": 0, "cache_hits": 1, "coalesced": 0}
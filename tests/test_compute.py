@@ -0,0 +1,37 @@
+import os
+import pickle
+import subprocess
+import sys
+import pandas as pd
+import indicators.calculations as calculations
+import indicators.compute as compute
+import indicators.graph as graph
+
+
+def test_graph_does_not_import_streamlit():
+    code = "import sys, indicators.graph; print('streamlit' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+
+    assert output.strip() == "False"
+
+
+def test_failures_are_returned_as_picklable_errors():
+    error = compute.calculate_rsi(pd.DataFrame({"Open": [1.0]}))
+
+    assert isinstance(error, compute.IndicatorError)
+    copy = pickle.loads(pickle.dumps(error))
+    assert (copy.indicator, copy.message) == (error.indicator, error.message)
+
+
+def test_adapter_shows_each_graph_error_once(monkeypatch):
+    shown = []
+    monkeypatch.setattr(calculations.st, "error", shown.append)
+    data = pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=pd.date_range("2024-01-01", periods=3))
+
+    # DMI and ADX both fail with the error of the missing High column
+    results = calculations.report_results(graph.compute_indicators(data, ["dmi", "adx", "rsi"]), data)
+
+    assert results["adx"] == [None]
+    assert results["rsi"][0] is not None
+    assert len(shown) == len(set(shown)) >= 1
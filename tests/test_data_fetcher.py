@@ -0,0 +1,107 @@
+import time
+import threading
+import pandas as pd
+import pytest
+import requests
+import polygon.data_fetcher as data_fetcher
+
+
+class _FailingClient:
+    """
+    Polygon client whose requests wait until released and then fail.
+    """
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.requests = 0
+
+    def get(self, url, params=None, stream=False):
+        self.requests += 1
+        self.release.wait(5)
+        raise requests.ConnectionError("connection refused")
+
+
+@pytest.fixture
+def failing_client(monkeypatch):
+    client = _FailingClient()
+    monkeypatch.setattr(data_fetcher, "get_client", lambda: client)
+    data_fetcher._polygon_requests.cache.clear()
+    return client
+
+
+@pytest.fixture
+def shown_errors(monkeypatch):
+    """
+    Collects the errors shown by st.error, per thread.
+    """
+    errors = {}
+    monkeypatch.setattr(
+        data_fetcher.st, "error", lambda message: errors.setdefault(threading.current_thread().name, []).append(message)
+    )
+    return errors
+
+
+def _call_concurrently(function, *args):
+    """
+    Calls a fetch function from two threads at once, the second one joining the first one's request.
+    """
+    results = {}
+
+    def run(name):
+        results[name] = function(*args)
+
+    coalesced = data_fetcher._polygon_requests.stats()["coalesced"]
+    leader = threading.Thread(target=run, args=("leader",), name="leader")
+    follower = threading.Thread(target=run, args=("follower",), name="follower")
+
+    # Start the follower once the leader's request is in flight, and wait until it joined the request
+    leader.start()
+    while not data_fetcher._polygon_requests.calls and leader.is_alive():
+        time.sleep(0.001)
+    follower.start()
+    while data_fetcher._polygon_requests.stats()["coalesced"] == coalesced and leader.is_alive():
+        time.sleep(0.001)
+
+    return leader, follower, results
+
+
+@pytest.mark.parametrize("fetch, args, empty", [
+    (data_fetcher.fetch_stock_news, ("AAPL",), []),
+    (data_fetcher.fetch_financials, ("AAPL",), []),
+])
+def test_coalesced_callers_all_see_the_error(failing_client, shown_errors, fetch, args, empty):
+    leader, follower, results = _call_concurrently(fetch, *args)
+    failing_client.release.set()
+    leader.join()
+    follower.join()
+
+    assert failing_client.requests == 1
+    assert results == {"leader": empty, "follower": empty}
+    assert len(shown_errors["leader"]) == 1
+    assert shown_errors["follower"] == shown_errors["leader"]
+
+
+def test_failed_stock_data_is_shown_to_coalesced_callers_and_not_cached(failing_client, shown_errors, monkeypatch):
+    monkeypatch.setattr(data_fetcher.bar_cache, "load_bars", lambda *args: (pd.DataFrame(), None))
+    args = ("AAPL", "minute", 1, None, "2024-01-02", "2024-01-03")
+
+    leader, follower, results = _call_concurrently(data_fetcher.fetch_stock_data, *args)
+    failing_client.release.set()
+    leader.join()
+    follower.join()
+
+    assert results["leader"].empty and results["follower"].empty
+    assert shown_errors["follower"] == shown_errors["leader"] == ["Error fetching stock data: connection refused"]
+
+    # The failure is not cached, the next call requests the bars again
+    data_fetcher.fetch_stock_data(*args)
+    assert failing_client.requests == 2
+
+
+def test_errors_are_collected_when_a_list_is_given(failing_client, shown_errors):
+    failing_client.release.set()
+    errors = []
+
+    assert data_fetcher.fetch_stock_news("AAPL", errors=errors) == []
+    assert errors == ["Error fetching stock news: connection refused"]
+    assert shown_errors == {}
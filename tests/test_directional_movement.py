@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+import pytest
+import indicators.compute as compute
+import indicators.streaming as streaming
+
+
+def _bars(n=500, seed=0):
+    """
+    Random walk OHLCV bars with a fixed seed.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = close + rng.normal(0, 0.5, n)
+    high = np.maximum(open_, close) + rng.random(n)
+    low = np.minimum(open_, close) - rng.random(n)
+    volume = rng.integers(100_000, 1_000_000, n).astype(float)
+
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+        index=pd.bdate_range("2022-01-03", periods=n, name="Date"),
+    )
+
+
+def _trend(n=60, step=1.0):
+    """
+    Bars whose high, low and close all move by the same step every bar.
+    """
+    base = 100 + step * np.arange(n)
+    return pd.DataFrame(
+        {"Open": base - 0.5, "High": base + 0.5, "Low": base - 0.5, "Close": base, "Volume": 1000.0},
+        index=pd.bdate_range("2022-01-03", periods=n, name="Date"),
+    )
+
+
+def _wilder_reference(data, period=14):
+    """
+    Textbook Wilder DMI and ADX as a plain loop, following Wilder's definitions as TA-Lib implements them:
+    true range and directional movement from the second bar, running sums seeded over the first period,
+    and the ADX seeded with the average of the first period DX values.
+    """
+    high, low, close = (data[column].to_numpy() for column in ("High", "Low", "Close"))
+    n = len(data)
+    plus_di = np.full(n, np.nan)
+    minus_di = np.full(n, np.nan)
+    adx = np.full(n, np.nan)
+
+    tr_sum = plus_sum = minus_sum = 0.0
+    dx_values = []
+    for i in range(1, n):
+        up_move = high[i] - high[i - 1]
+        down_move = low[i - 1] - low[i]
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        tr = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+
+        if i <= period:
+            tr_sum += tr
+            plus_sum += plus_dm
+            minus_sum += minus_dm
+            if i < period:
+                continue
+        else:
+            tr_sum += tr - tr_sum / period
+            plus_sum += plus_dm - plus_sum / period
+            minus_sum += minus_dm - minus_sum / period
+
+        plus_di[i] = 100 * plus_sum / tr_sum
+        minus_di[i] = 100 * minus_sum / tr_sum
+        dx = 100 * abs(plus_di[i] - minus_di[i]) / (plus_di[i] + minus_di[i])
+        dx_values.append(dx)
+
+        if len(dx_values) == period:
+            adx[i] = np.mean(dx_values)
+        elif len(dx_values) > period:
+            adx[i] = (adx[i - 1] * (period - 1) + dx) / period
+
+    return plus_di, minus_di, adx
+
+
+@pytest.mark.parametrize("smoothing", ["sma", "wilder"])
+def test_uptrend_has_only_positive_movement(smoothing):
+    # Every bar moves up by 1 with a true range of 1.5, so +DI is 100 / 1.5, -DI is 0 and the ADX is 100
+    data = _trend(step=1.0)
+    plus_di, minus_di = compute.calculate_dmi(data, 14, smoothing)
+    adx = compute.calculate_adx(data, 14, smoothing)
+
+    assert plus_di.iloc[-1] == pytest.approx(100 / 1.5)
+    assert minus_di.iloc[-1] == pytest.approx(0.0)
+    assert adx.iloc[-1] == pytest.approx(100.0)
+
+
+@pytest.mark.parametrize("smoothing", ["sma", "wilder"])
+def test_downtrend_has_only_negative_movement(smoothing):
+    data = _trend(step=-1.0)
+    plus_di, minus_di = compute.calculate_dmi(data, 14, smoothing)
+    adx = compute.calculate_adx(data, 14, smoothing)
+
+    assert plus_di.iloc[-1] == pytest.approx(0.0)
+    assert minus_di.iloc[-1] == pytest.approx(100 / 1.5)
+    assert adx.iloc[-1] == pytest.approx(100.0)
+
+
+def test_wilder_matches_reference():
+    data = _bars()
+    expected_plus, expected_minus, expected_adx = _wilder_reference(data)
+
+    plus_di, minus_di = compute.calculate_dmi(data, 14, "wilder")
+    adx = compute.calculate_adx(data, 14, "wilder")
+
+    np.testing.assert_allclose(plus_di.to_numpy(), expected_plus, rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(minus_di.to_numpy(), expected_minus, rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(adx.to_numpy(), expected_adx, rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("smoothing", ["sma", "wilder"])
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_indicators_stay_in_range(smoothing, seed):
+    data = _bars(seed=seed)
+    plus_di, minus_di = compute.calculate_dmi(data, 14, smoothing)
+    adx = compute.calculate_adx(data, 14, smoothing)
+
+    for values in (plus_di, minus_di, adx):
+        values = values.dropna()
+        assert len(values) > 0
+        assert values.between(0, 100).all()
+
+
+@pytest.mark.parametrize("smoothing", ["sma", "wilder"])
+def test_streaming_matches_batch(smoothing):
+    data = _bars()
+    plus_di, minus_di = compute.calculate_dmi(data, 14, smoothing)
+    adx = compute.calculate_adx(data, 14, smoothing)
+
+    dmi = streaming.StreamingDMI(14, smoothing)
+    streamed_dmi = [dmi.update(bar) for _, bar in data.iterrows()]
+    adx_indicator = streaming.StreamingADX(14, smoothing)
+    streamed_adx = [adx_indicator.update(bar) for _, bar in data.iterrows()]
+
+    np.testing.assert_allclose([value[0] for value in streamed_dmi], plus_di.to_numpy(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose([value[1] for value in streamed_dmi], minus_di.to_numpy(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(streamed_adx, adx.to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_streaming_wilder_survives_a_snapshot():
+    data = _bars(300, seed=3)
+    rows = [bar for _, bar in data.iterrows()]
+    engine = streaming.StreamingIndicatorEngine.from_names(["adx", "dmi", "atr", "rsi"], smoothing="wilder")
+    engine.warm_up(data.iloc[:20])
+
+    restored = streaming.StreamingIndicatorEngine.from_names(["adx", "dmi", "atr", "rsi"], smoothing="wilder")
+    restored.restore(engine.snapshot())
+    for bar in rows[20:]:
+        values = engine.update(bar)
+        assert restored.update(bar) == values
+
+    expected_adx = compute.calculate_adx(data, 14, "wilder").iloc[-1]
+    assert values["adx"] == pytest.approx(expected_adx, rel=1e-9)
+
+
+def test_unknown_smoothing_is_an_error():
+    with pytest.raises(ValueError):
+        streaming.StreamingADX(14, "ema")
+    assert isinstance(compute.calculate_adx(_bars(), 14, "ema"), compute.IndicatorError)
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import pytest
+import indicators.chart_cache as chart_cache
+import indicators.downsample as downsample
+import indicators.kernels as kernels
+import indicators.memo as memo
+import indicators.plot as plot
+from benchmarks.common import random_walk_bars
+
+
+@pytest.fixture(params=["compiled", "python"])
+def lttb(request, monkeypatch):
+    """
+    Runs LTTB through the Numba kernel and through the pure Python fallback.
+    """
+    if request.param == "compiled" and kernels._lttb_compiled is None:
+        pytest.skip("Numba is not installed")
+    if request.param == "python":
+        monkeypatch.setattr(kernels, "_lttb_compiled", None)
+    return kernels.lttb
+
+
+def _reference_lttb(values, threshold):
+    """
+    Largest-Triangle-Three-Buckets as published by Steinarsson, returning the chosen values.
+    """
+    n = len(values)
+    every = (n - 2) / (threshold - 2)
+    chosen = [values[0]]
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket, which is the last point for the last bucket
+        next_start = int(np.floor((i + 1) * every)) + 1
+        next_end = min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x = np.mean(np.arange(next_start, next_end))
+        avg_y = np.mean(values[next_start:next_end])
+
+        best, best_index = -1.0, None
+        for j in range(int(np.floor(i * every)) + 1, int(np.floor((i + 1) * every)) + 1):
+            area = abs((a - avg_x) * (values[j] - values[a]) - (a - j) * (avg_y - values[a])) * 0.5
+            if area > best:
+                best, best_index = area, j
+        chosen.append(values[best_index])
+        a = best_index
+
+    chosen.append(values[n - 1])
+    return np.array(chosen)
+
+
+@pytest.mark.parametrize("length, points, seed", [(10, 3, 0), (100, 10, 1), (1_000, 97, 2), (5_000, 500, 3)])
+def test_lttb_matches_the_reference(lttb, length, points, seed):
+    values = np.random.default_rng(seed).standard_normal(length).cumsum()
+
+    actual = lttb(values, downsample.bucket_starts(length, points))
+
+    np.testing.assert_array_equal(actual, _reference_lttb(values, points))
+
+
+def test_lttb_keeps_peaks_and_skips_nan(lttb):
+    values = np.sin(np.arange(2_000) / 50.0)
+    values[700] = 5.0
+    values[:230] = np.nan
+
+    actual = lttb(values, downsample.bucket_starts(len(values), 100))
+
+    # Buckets of the warm-up are NaN, the rest choose valid values and keep the spike
+    assert np.isnan(actual[:10]).all()
+    assert not np.isnan(actual[12:]).any()
+    assert np.nanmax(actual) == 5.0
+
+
+@pytest.mark.parametrize("length, points", [(10, 20), (1_000, 500), (1_001, 500), (6_000, 500), (777, 3)])
+def test_bucket_layouts(length, points):
+    lttb_starts = downsample.bucket_starts(length, points)
+    candle_starts = downsample.bucket_starts(length, points, uniform=True)
+
+    if length <= points:
+        np.testing.assert_array_equal(lttb_starts, np.arange(length))
+        np.testing.assert_array_equal(candle_starts, np.arange(length))
+        return
+
+    # LTTB keeps the first and the last bar as buckets of their own
+    assert len(lttb_starts) == points
+    assert lttb_starts[0] == 0 and lttb_starts[1] == 1 and lttb_starts[-1] == length - 1
+    assert (np.diff(lttb_starts) > 0).all()
+
+    # Candles are buckets of the same size ending with the last bar, only the first may be shorter
+    sizes = np.diff(np.append(candle_starts, length))
+    assert candle_starts[0] == 0 and len(candle_starts) <= points
+    assert (sizes[1:] == sizes[-1]).all() and 0 < sizes[0] <= sizes[-1]
+
+
+def test_bars_aggregate_like_resample():
+    data = random_walk_bars(1_003, seed=4)
+    starts = downsample.bucket_starts(len(data), 100, uniform=True)
+
+    actual = downsample.downsample_bars(data, starts)
+
+    groups = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(data))))
+    grouped = data.groupby(groups)
+    expected = pd.DataFrame(
+        {
+            "Open": grouped["Open"].first().to_numpy(),
+            "High": grouped["High"].max().to_numpy(),
+            "Low": grouped["Low"].min().to_numpy(),
+            "Close": grouped["Close"].last().to_numpy(),
+            "Volume": grouped["Volume"].sum().to_numpy(),
+        },
+        index=data.index[starts],
+    )
+    pd.testing.assert_frame_equal(actual, expected, check_freq=False)
+    assert downsample.downsample_bars(data, np.arange(len(data))) is data
+
+
+def test_results_are_downsampled_line_by_line():
+    data = random_walk_bars(600)
+    starts = downsample.bucket_starts(len(data), 60, uniform=True)
+    line = data["Close"].rename("Close")
+
+    upper, lower = downsample.downsample_result((line, line * 2), starts)
+
+    assert downsample.downsample_result(None, starts) is None
+    assert len(upper) == len(starts) and upper.name == "Close"
+    pd.testing.assert_index_equal(upper.index, data.index[starts])
+    np.testing.assert_allclose(lower, upper * 2)
+
+
+def test_point_budget():
+    assert downsample.point_budget("candle", 1_000) == 500
+    assert downsample.point_budget("line", 1_000) == 1_000
+    assert downsample.point_budget("renko", 1_000) == 1_000
+    assert downsample.point_budget("candle", 2) == 3
+
+
+def test_long_charts_draw_at_most_the_budget(monkeypatch):
+    drawn = []
+    monkeypatch.setattr(chart_cache, "rendered_charts", memo.MemoCache())
+    monkeypatch.setattr(plot.render_pool, "render_chart", lambda data, name, **kwargs: drawn.append(
+        (len(data), [len(addplot["data"]) for addplot in kwargs.get("addplot", [])])) or b"")
+    monkeypatch.setattr(plot.st, "image", lambda *args, **kwargs: None)
+    monkeypatch.setattr(plot.st, "warning", lambda *args: None)
+
+    plot.plot_indicators("AAPL", random_walk_bars(3_000), ["sma", "rsi"], timespan="day")
+
+    bars, lines = drawn[0]
+    assert bars <= downsample.point_budget("candle")
+    assert lines and all(length == bars for length in lines)
@@ -0,0 +1,51 @@
+import threading
+import pytest
+import polygon.fetch_pool as fetch_pool
+
+
+@pytest.fixture
+def shown_errors(monkeypatch):
+    """
+    Records the errors shown by st.error along with the thread that showed them.
+    """
+    shown = []
+    monkeypatch.setattr(fetch_pool.st, "error", lambda message: shown.append((message, threading.current_thread())))
+    return shown
+
+
+def test_errors_are_shown_in_request_order_on_the_calling_thread(shown_errors):
+    first_may_finish = threading.Event()
+
+    def slow(name, errors=None):
+        # Finish only after the second request has reported its error
+        first_may_finish.wait(5)
+        errors.append(f"{name} failed")
+        return name
+
+    def fast(name, errors=None):
+        errors.append(f"{name} failed")
+        first_may_finish.set()
+        return name
+
+    results = fetch_pool.fetch_concurrently({"first": (slow, "first"), "second": (fast, "second")})
+
+    assert results == {"first": "first", "second": "second"}
+    assert [message for message, _ in shown_errors] == ["first failed", "second failed"]
+    assert all(thread is threading.current_thread() for _, thread in shown_errors)
+
+
+def test_raising_request_does_not_affect_the_others(shown_errors):
+    def broken(errors=None):
+        raise ValueError("boom")
+
+    def working(value, errors=None):
+        return value
+
+    results = fetch_pool.fetch_concurrently({"news": (broken,), "stock data": (working, 42)})
+
+    assert results == {"news": None, "stock data": 42}
+    assert [message for message, _ in shown_errors] == ["Error fetching news: boom"]
+
+
+def test_no_requests():
+    assert fetch_pool.fetch_concurrently({}) == {}
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+import indicators.graph as graph
+from benchmarks.common import random_walk_bars
+
+
+@pytest.mark.parametrize("smoothing", ["sma", "wilder"])
+def test_plan_orders_dependencies_first_and_once(smoothing):
+    adx, dmi, atr = ("adx", 14, smoothing), ("dmi", 14, smoothing), ("atr", 14, smoothing)
+    order = graph.plan([adx, dmi, atr, ("macd", 12, 26, 9), ("ema", 12)])
+
+    assert len(order) == len(set(order))
+    assert order.index(("true range",)) < order.index(atr) < order.index(dmi) < order.index(adx)
+    assert order.index(("directional movement",)) < order.index(dmi)
+    assert order.index(("ema", 12)) < order.index(("macd", 12, 26, 9))
+    assert order.index(("ema", 26)) < order.index(("macd", 12, 26, 9))
+
+
+def test_shared_intermediates_are_computed_once(monkeypatch):
+    calls = []
+    for kind, function in list(graph.node_functions.items()):
+        def counted(data, *params, _kind=kind, _function=function, **inputs):
+            calls.append((_kind, *params))
+            return _function(data, *params, **inputs)
+        monkeypatch.setitem(graph.node_functions, kind, counted)
+
+    # Bank calls count once for each of their periods
+    for kind, function in list(graph.bank_functions.items()):
+        def counted_bank(data, periods, _kind=kind, _function=function):
+            calls.extend((_kind, period) for period in periods)
+            return _function(data, periods)
+        monkeypatch.setitem(graph.bank_functions, kind, counted_bank)
+
+    graph.compute_indicators(random_walk_bars(100), ["adx", "dmi", "atr", "macd", "ema"])
+
+    assert len(calls) == len(set(calls))
+    assert calls.count(("true range",)) == 1
+    assert calls.count(("ema", 12)) == 1
+
+
+def _assert_same(actual, expected):
+    if isinstance(expected, tuple):
+        for actual_part, expected_part in zip(actual, expected):
+            _assert_same(actual_part, expected_part)
+        return
+    np.testing.assert_allclose(np.asarray(actual, dtype=float), np.asarray(expected, dtype=float), equal_nan=True)
+
+
+@pytest.mark.parametrize("indicator", sorted(graph.indicator_nodes))
+def test_results_match_the_direct_calculations(indicator):
+    data = random_walk_bars(300, seed=2)
+
+    results = graph.compute_indicators(data, [indicator, "adx", "macd"])[indicator]
+
+    for node, result in zip(graph.indicator_nodes[indicator], results):
+        kind, *params = node
+        _assert_same(result, graph.node_functions[kind](data, *params))
+
+
+def test_unknown_indicators_are_ignored():
+    assert graph.compute_indicators(random_walk_bars(10), ["unknown"]) == {}
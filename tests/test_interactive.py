@@ -0,0 +1,115 @@
+import base64
+import json
+import numpy as np
+import pandas as pd
+import indicators.chart_cache as chart_cache
+import indicators.interactive as interactive
+import indicators.memo as memo
+import indicators.plot as plot
+from benchmarks.common import random_walk_bars
+
+
+def _decode_values(text):
+    """
+    Decodes values the way the chart page does.
+    """
+    return np.frombuffer(base64.b64decode(text), dtype="<f4")
+
+
+def _decode_timestamps(time, count):
+    """
+    Rebuilds the dates the way the chart page does, from the first date and the gaps between bars.
+    """
+    deltas = np.frombuffer(base64.b64decode(time["deltas"]), dtype="<i4")
+    seconds = time["start"] + np.concatenate(([0], np.cumsum(deltas, dtype=np.int64)))[:count]
+    return pd.to_datetime(seconds, unit="s")
+
+
+def test_values_round_trip_as_float32():
+    values = np.random.default_rng(0).standard_normal(1_000) * 1_000
+    values[:20] = np.nan
+
+    decoded = _decode_values(interactive.encode_values(values))
+
+    np.testing.assert_array_equal(decoded, values.astype(np.float32))
+    assert np.isnan(decoded[:20]).all()
+    assert _decode_values(interactive.encode_values([])).size == 0
+
+
+def test_timestamps_round_trip():
+    daily = pd.bdate_range("2015-01-01", "2024-12-31").as_unit("ns")
+    intraday = pd.date_range("2024-03-08 09:30", periods=500, freq="min").append(
+        pd.date_range("2024-03-11 09:30", periods=500, freq="min"))
+
+    for index in (daily, intraday, daily[:1]):
+        encoded = interactive.encode_timestamps(index)
+        pd.testing.assert_index_equal(_decode_timestamps(encoded, len(index)), pd.DatetimeIndex(index).as_unit("s"),
+                                      check_names=False)
+
+    assert interactive.encode_timestamps(pd.DatetimeIndex([])) == {"start": None, "deltas": ""}
+
+
+def test_payload_round_trip():
+    data = random_walk_bars(300)
+    line = data["Close"].rolling(20).mean()
+    series = [{"label": "SMA", "values": line, "panel": 0, "color": "blue", "dash": "solid", "type": "line"}]
+
+    payload = json.loads(interactive.chart_payload("AAPL", data, series, visible=100, volume=True))
+
+    assert payload["bars"] == 300 and payload["visible"] == 100 and payload["title"] == "AAPL"
+    pd.testing.assert_index_equal(_decode_timestamps(payload["time"], 300), data.index.as_unit("s"), check_names=False)
+    for column in ["Open", "High", "Low", "Close", "Volume"]:
+        np.testing.assert_array_equal(_decode_values(payload["columns"][column.lower()]),
+                                      data[column].to_numpy(dtype=np.float32))
+    np.testing.assert_array_equal(_decode_values(payload["series"][0]["values"]), line.to_numpy(dtype=np.float32))
+    assert payload["series"][0]["label"] == "SMA"
+
+    # Without volume the payload leaves it out, and the visible bars never exceed the bars
+    payload = json.loads(interactive.chart_payload("AAPL", data, [], visible=1_000))
+    assert "volume" not in payload["columns"] and payload["visible"] == 300
+
+
+def test_page_cannot_be_closed_by_the_payload():
+    payload = interactive.chart_payload("</script><script>alert(1)</script>", random_walk_bars(5), [])
+
+    html = interactive.chart_html(payload, height=321)
+
+    assert html.count("</script>") == 3
+    assert "height: 321px" in html and interactive.PLOTLY_JS_URL in html
+
+
+def test_series_take_styles_and_skip_empty_indicators():
+    data = random_walk_bars(100)
+    empty = pd.Series(np.nan, index=data.index)
+    results = {
+        "bollinger bands": [(data["Close"] + 1, data["Close"] - 1)],
+        "rsi": [data["Close"]],
+        "obv": [empty],
+    }
+    config = {"bollinger bands": {"color": "purple", "panel": 0}, "rsi": {"panel": 2}}
+
+    series, skipped = interactive.indicator_series(results, config, lambda line: not line.isna().all())
+
+    assert [line["label"] for line in series] == ["Upper Band", "Lower Band", "RSI"]
+    assert series[0]["color"] == "purple" and series[0]["dash"] == "dash" and series[0]["panel"] == 0
+    assert series[2]["panel"] == 2 and series[2]["dash"] == "solid"
+    assert skipped == ["obv"]
+
+
+def test_interactive_chart_is_built_once(monkeypatch):
+    pages = []
+    monkeypatch.setattr(chart_cache, "rendered_charts", memo.MemoCache())
+    monkeypatch.setattr(plot.components, "html", lambda html, height: pages.append(html))
+    monkeypatch.setattr(plot.st, "warning", lambda *args: None)
+    payload = interactive.chart_payload
+    built = []
+    monkeypatch.setattr(interactive, "chart_payload", lambda *args: built.append(args) or payload(*args))
+    data = random_walk_bars(3_000)
+
+    plot.plot_interactive_indicators("AAPL", data, ["rsi", "sma"], 120, "day")
+    plot.plot_interactive_indicators("AAPL", data, ["sma", "rsi"], 120, "day")
+
+    assert len(built) == 1 and len(pages) == 2 and pages[0] == pages[1]
+    title, sent, series, visible = built[0][:4]
+    assert len(sent) == plot.interactive_bars["day"] and visible == 120
+    assert all(len(line["values"]) == len(sent) for line in series)
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+import indicators.kernels as kernels
+from benchmarks.common import random_walk_bars
+from benchmarks.legacy import parabolic_sar_iloc
+
+
+@pytest.fixture(params=["compiled", "python"])
+def sar_kernel(request, monkeypatch):
+    """
+    Runs the Parabolic SAR through the Numba kernel and through the pure Python fallback.
+    """
+    if request.param == "compiled" and kernels._parabolic_sar_compiled is None:
+        pytest.skip("Numba is not installed")
+    if request.param == "python":
+        monkeypatch.setattr(kernels, "_parabolic_sar_compiled", None)
+    return kernels.parabolic_sar
+
+
+@pytest.mark.parametrize("bars, seed", [(1, 0), (2, 0), (1_000, 0), (5_000, 1), (5_000, 2)])
+def test_parabolic_sar_matches_iloc_loop(sar_kernel, bars, seed):
+    data = random_walk_bars(bars, seed)
+    expected = parabolic_sar_iloc(data).to_numpy()
+
+    sar = sar_kernel(data["High"].to_numpy(), data["Low"].to_numpy())
+
+    np.testing.assert_array_equal(sar, expected)
+
+
+@pytest.mark.parametrize("initial_af, max_af", [(0.01, 0.1), (0.05, 0.5)])
+def test_parabolic_sar_matches_iloc_loop_with_other_factors(sar_kernel, initial_af, max_af):
+    data = random_walk_bars(2_000, 3)
+    expected = parabolic_sar_iloc(data, initial_af, max_af).to_numpy()
+
+    sar = sar_kernel(data["High"].to_numpy(), data["Low"].to_numpy(), initial_af, max_af)
+
+    np.testing.assert_array_equal(sar, expected)
+
+
+def test_parabolic_sar_of_no_bars(sar_kernel):
+    assert len(sar_kernel(np.array([]), np.array([]))) == 0
+
+
+def _closes_with_gaps(bars, seed):
+    closes = random_walk_bars(bars, seed)["Close"].to_numpy().copy()
+    closes[[0, 40, 41, 300]] = np.nan
+    return closes
+
+
+def test_sma_bank_matches_rolling_means():
+    closes = _closes_with_gaps(2_000, 4)
+    periods = [1, 5, 20, 200, 5_000]
+
+    bank = kernels.sma_bank(closes, periods)
+
+    assert bank.shape == (2_000, len(periods))
+    for column, period in enumerate(periods):
+        expected = pd.Series(closes).rolling(window=period).mean().to_numpy()
+        np.testing.assert_allclose(bank[:, column], expected, rtol=1e-10, equal_nan=True)
+
+
+@pytest.fixture(params=["compiled", "pandas"])
+def ema_bank(request, monkeypatch):
+    """
+    Runs the EMA bank through the Numba kernel and through the pandas fallback.
+    """
+    if request.param == "compiled" and kernels._ema_bank_compiled is None:
+        pytest.skip("Numba is not installed")
+    if request.param == "pandas":
+        monkeypatch.setattr(kernels, "_ema_bank_compiled", None)
+    return kernels.ema_bank
+
+
+def test_ema_bank_matches_ewm(ema_bank):
+    closes = _closes_with_gaps(2_000, 5)
+    periods = [2, 12, 26, 200]
+
+    bank = ema_bank(closes, periods)
+
+    for column, period in enumerate(periods):
+        expected = pd.Series(closes).ewm(span=period, adjust=False).mean().to_numpy()
+        np.testing.assert_allclose(bank[:, column], expected, rtol=1e-10, equal_nan=True)
+
+
+def test_banks_of_no_bars(ema_bank):
+    assert kernels.sma_bank(np.array([]), [5]).shape == (0, 1)
+    assert ema_bank(np.array([]), [5]).shape == (0, 1)
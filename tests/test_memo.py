@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import pytest
+import indicators.calculations as calculations
+import indicators.graph as graph
+import indicators.memo as memo
+from indicators.bar_series import BarSeries
+from benchmarks.common import random_walk_bars
+
+
+@pytest.fixture
+def cache():
+    return memo.MemoCache(max_bytes=10_000, max_entries=3)
+
+
+def _counting(cache, name="close sum"):
+    """
+    Returns a memoized function summing the closes, and the list of the periods it actually computed.
+    """
+    computed = []
+
+    @memo.memoize(name, cache=cache)
+    def close_sum(data, period=1, offset=None):
+        computed.append(period)
+        return pd.Series(data["Close"].to_numpy() * period, index=data.index) + (0 if offset is None else offset)
+
+    return close_sum, computed
+
+
+def test_unchanged_bars_hit_and_appended_bars_miss(cache):
+    close_sum, computed = _counting(cache)
+    data = random_walk_bars(100)
+
+    first = close_sum(data, 2)
+    assert close_sum(data.copy(), 2) is first
+    assert close_sum(BarSeries.from_frame(data), 2) is first
+
+    # Appending a bar or changing one invalidates the entry
+    close_sum(random_walk_bars(101), 2)
+    changed = data.copy()
+    changed.iloc[50, changed.columns.get_loc("Close")] += 1
+    close_sum(changed, 2)
+
+    assert computed == [2, 2, 2]
+    assert cache.stats()["hits"] == 2
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    close_sum, computed = _counting(cache)
+    data = random_walk_bars(10)
+
+    for period in (1, 2, 3):
+        close_sum(data, period)
+    close_sum(data, 1)
+    close_sum(data, 4)
+
+    # Period 2 was the least recently used when the fourth entry arrived
+    close_sum(data, 1)
+    close_sum(data, 2)
+    assert computed == [1, 2, 3, 4, 2]
+    assert cache.stats()["evictions"] == 2
+    assert cache.stats()["entries"] == 3
+
+
+def test_memory_budget_evicts_and_skips_oversized_results(cache):
+    close_sum, computed = _counting(cache)
+
+    # A result holds 16 bytes per bar (values and index), 700 bars exceed the whole budget
+    close_sum(random_walk_bars(700), 1)
+    close_sum(random_walk_bars(700), 1)
+    assert computed == [1, 1] and cache.stats()["entries"] == 0
+
+    # Two results of 400 bars do not fit together
+    data = random_walk_bars(400)
+    close_sum(data, 1)
+    close_sum(data, 2)
+    close_sum(data, 1)
+    assert computed == [1, 1, 1, 2, 1]
+    assert cache.stats()["entries"] == 1 and cache.stats()["nbytes"] == 6_400
+
+
+def test_array_arguments_are_keyed_by_identity(cache):
+    close_sum, computed = _counting(cache)
+    data = random_walk_bars(10)
+    offset = pd.Series(1.0, index=data.index)
+
+    with_offset = close_sum(data, 1, offset=offset)
+    assert close_sum(data, 1, offset=offset) is with_offset
+
+    # A different intermediate is a different call, even with the same scalar parameters
+    other = close_sum(data, 1, offset=offset * 2)
+    assert close_sum(data, 1) is not with_offset
+    assert computed == [1, 1, 1]
+    np.testing.assert_allclose(other - with_offset, 1.0)
+
+
+def test_failed_calculations_are_not_cached(cache):
+    calls = []
+
+    @memo.memoize("broken", cache=cache)
+    def broken(data, period=1):
+        calls.append(period)
+        return None
+
+    broken(random_walk_bars(10))
+    broken(random_walk_bars(10))
+    assert calls == [1, 1]
+
+
+def test_bar_series_fingerprint_is_computed_once(monkeypatch):
+    bars = BarSeries.from_frame(random_walk_bars(50))
+    expected = memo.fingerprint(random_walk_bars(50))
+    computed = []
+    original = memo._fingerprint
+    monkeypatch.setattr(memo, "_fingerprint", lambda data: computed.append(1) or original(data))
+
+    assert memo.fingerprint(bars) == expected
+    assert memo.fingerprint(bars) == expected
+    assert computed == [1]
+
+
+def test_graph_rerun_reuses_results_with_intermediates(monkeypatch):
+    monkeypatch.setattr(memo, "indicator_memo", memo.MemoCache())
+    data = random_walk_bars(500, seed=6)
+
+    first = graph.compute_indicators(data, ["adx", "dmi", "atr"])
+    misses = memo.indicator_memo.stats()["misses"]
+    second = graph.compute_indicators(data.copy(), ["adx", "dmi", "atr"])
+
+    assert memo.indicator_memo.stats()["misses"] == misses
+    assert second["adx"][0] is first["adx"][0]
+
+    # ATR from another true range is not served from the entry of the shared one
+    true_range = calculations.calculate_true_range(data)
+    assert calculations.calculate_atr(data, 14, true_range=true_range * 2) is not first["atr"][0]
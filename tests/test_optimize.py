@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+import indicators.backtest as backtest
+import indicators.memo as memo
+import indicators.optimize as optimize
+from benchmarks.common import random_walk_bars
+
+
+@pytest.fixture
+def small_rsi(monkeypatch):
+    """
+    Shrinks the RSI grid to 5 periods x 2 x 2 thresholds.
+    """
+    strategy = dict(optimize.strategies["rsi"], grid={"period": [5, 9, 14, 21, 30], "lower": [25, 30], "upper": [70, 75]})
+    monkeypatch.setitem(optimize.strategies, "rsi", strategy)
+    return strategy
+
+
+def test_grid_groups_shared_parameters_and_skips_inverted_crossovers():
+    groups = optimize.grid_combinations(optimize.strategies["ema"])
+
+    assert all(len({(c["fast"], c["slow"]) for c in group}) == 1 for group in groups)
+    assert all(c["fast"] < c["slow"] for group in groups for c in group)
+    assert len(optimize.grid_combinations(optimize.strategies["rsi"])) == 46
+
+
+def test_rows_match_single_backtests(small_rsi):
+    data = random_walk_bars(1_000, seed=15)
+
+    table = optimize.optimize(data, "rsi", processes=1)
+
+    assert len(table) == 20
+    assert table["total_return"].is_monotonic_decreasing
+    best = table.iloc[0]
+    result = backtest.run_backtest(data, f"RSI({best['period']}) < {best['lower']}", f"RSI({best['period']}) > {best['upper']}")
+    assert best["total_return"] == pytest.approx(result["total_return"])
+    assert best["trades"] == result["trades"]
+
+
+def test_each_indicator_period_is_calculated_once(monkeypatch, small_rsi):
+    monkeypatch.setattr(memo, "indicator_memo", memo.MemoCache())
+
+    optimize.optimize(random_walk_bars(1_000, seed=16), "rsi", processes=1)
+
+    assert sum(key[1] == "rsi" for key in memo.indicator_memo.entries) == 5
+
+
+def test_pool_matches_serial(monkeypatch, small_rsi):
+    monkeypatch.setattr(optimize, "OPTIMIZE_MIN_PARALLEL_COMBINATIONS", 1)
+    data = random_walk_bars(1_000, seed=17)
+
+    serial = optimize.optimize(data, "rsi", processes=1)
+    pooled = optimize.optimize(data, "rsi", processes=2)
+
+    pd.testing.assert_frame_equal(pooled, serial)
+
+
+def test_unknown_strategy_or_no_bars():
+    with pytest.raises(ValueError):
+        optimize.optimize(random_walk_bars(10), "unknown")
+    with pytest.raises(ValueError):
+        optimize.optimize(pd.DataFrame(), "rsi")
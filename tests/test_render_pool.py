@@ -0,0 +1,104 @@
+import threading
+import time
+import pytest
+import indicators.render_pool as render_pool
+import indicators.rendering as rendering
+from benchmarks.common import random_walk_bars
+
+
+# The pool fixture replaces render_spec with _render_or_stall
+render_spec = render_pool.render_spec
+
+
+def _render_or_stall(spec):
+    """
+    Worker function that sleeps before rendering charts named "slow..." and stalls on charts named "stuck".
+    """
+    if spec["name"] == "stuck":
+        time.sleep(60)
+    if spec["name"].startswith("slow"):
+        time.sleep(float(spec["name"][4:]))
+    return render_spec(spec)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """
+    A fresh pool of 2 workers with 2 queue slots, rendering through _render_or_stall.
+    """
+    render_pool.shutdown()
+    monkeypatch.setattr(render_pool, "CHART_RENDER_WORKERS", 2)
+    monkeypatch.setattr(render_pool, "_slots", render_pool.threading.BoundedSemaphore(2))
+    monkeypatch.setattr(render_pool, "render_spec", _render_or_stall)
+    yield render_pool
+    render_pool.shutdown()
+
+
+def test_spec_renders_like_the_chart():
+    data = random_walk_bars(40)
+    addplot = [render_pool.mpf.make_addplot(data["Close"].rolling(5).mean(), color="blue")]
+
+    image, metrics = render_pool.render_spec(render_pool.chart_spec(data, "spec", type="candle", addplot=addplot))
+
+    assert image.startswith(b"\x89PNG")
+    assert metrics["name"] == "spec" and metrics["bars"] == 40 and not metrics["failed"]
+
+
+def test_no_workers_renders_in_the_calling_thread(monkeypatch):
+    monkeypatch.setattr(render_pool, "CHART_RENDER_WORKERS", 0)
+    monkeypatch.setattr(render_pool, "_get_pool", lambda: pytest.fail("the pool was started"))
+
+    assert render_pool.render_chart(random_walk_bars(40)).startswith(b"\x89PNG")
+
+
+def test_pool_renders_and_records_metrics(pool):
+    renders = rendering.stats()["renders"]
+
+    image = pool.render_chart(random_walk_bars(40), "pooled", timeout=60)
+
+    assert image.startswith(b"\x89PNG")
+    assert rendering.stats()["renders"] == renders + 1
+    assert rendering.recent_renders[-1]["name"] == "pooled"
+
+
+def test_full_queue_gives_up_after_the_timeout(pool):
+    for _ in range(2):
+        pool._slots.acquire()
+    try:
+        start = time.monotonic()
+        with pytest.raises(pool.RenderPoolBusy, match="queue stayed full"):
+            pool.render_chart(random_walk_bars(40), timeout=0.2)
+        assert time.monotonic() - start < 5
+    finally:
+        for _ in range(2):
+            pool._slots.release()
+
+
+def test_timed_out_render_frees_its_worker_and_slot(pool):
+    data = random_walk_bars(40)
+    pool.render_chart(data, timeout=60)
+
+    # Both stuck renders hold a worker and a slot until the pool is recycled
+    for _ in range(2):
+        with pytest.raises(pool.RenderPoolBusy, match="not rendered"):
+            pool.render_chart(data, "stuck", timeout=0.5)
+
+    start = time.monotonic()
+    assert pool.render_chart(data, timeout=30).startswith(b"\x89PNG")
+    assert time.monotonic() - start < 30
+
+
+def test_renders_sharing_a_recycled_pool_are_retried(pool):
+    data = random_walk_bars(40)
+    pool.render_chart(data, timeout=60)
+    images = []
+
+    # This render is running in the other worker while the stuck render's pool is recycled
+    thread = threading.Thread(target=lambda: images.append(pool.render_chart(data, "slow1", timeout=60)))
+    thread.start()
+    time.sleep(0.3)
+    with pytest.raises(pool.RenderPoolBusy):
+        pool.render_chart(data, "stuck", timeout=0.5)
+    thread.join()
+
+    assert len(images) == 1 and images[0].startswith(b"\x89PNG")
@@ -0,0 +1,64 @@
+import threading
+import matplotlib.pyplot as plt
+import pytest
+import indicators.rendering as rendering
+from benchmarks.common import random_walk_bars
+
+
+def test_render_returns_png_and_closes_its_figures():
+    open_before = plt.get_fignums()
+
+    image = rendering.render_chart(random_walk_bars(40), name="test", type="candle")
+
+    assert image.startswith(b"\x89PNG")
+    assert plt.get_fignums() == open_before
+    assert rendering.recent_renders[-1]["name"] == "test"
+    assert rendering.recent_renders[-1]["image_bytes"] == len(image)
+
+
+def test_failed_render_closes_its_figures(monkeypatch):
+    open_before = plt.get_fignums()
+    failures = rendering.stats()["failures"]
+
+    def failing_savefig(self, *args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(plt.Figure, "savefig", failing_savefig)
+
+    with pytest.raises(RuntimeError):
+        rendering.render_chart(random_walk_bars(40), name="failing")
+
+    assert plt.get_fignums() == open_before
+    assert rendering.stats()["failures"] == failures + 1
+    assert rendering.recent_renders[-1]["failed"]
+
+
+def test_figures_opened_elsewhere_are_kept():
+    figure = plt.figure()
+    try:
+        rendering.render_chart(random_walk_bars(40))
+        assert plt.fignum_exists(figure.number)
+    finally:
+        plt.close(figure)
+
+
+def test_concurrent_renders_do_not_leak_figures():
+    data = random_walk_bars(40)
+    open_before = plt.get_fignums()
+    images, errors = [], []
+
+    def render():
+        try:
+            images.append(rendering.render_chart(data, type="candle"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=render) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [] and len(images) == 4
+    assert plt.get_fignums() == open_before
+    assert rendering.stats()["open_figures"] == len(open_before)
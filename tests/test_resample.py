@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+import polygon.data_fetcher as data_fetcher
+import polygon.resample as resample
+
+
+def _daily_bars(seed=0):
+    """
+    Builds daily OHLCV bars on business days with a few missing sessions.
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2022-12-28", "2024-03-15", name="Date")
+    index = index.delete(rng.choice(len(index), 20, replace=False))
+    close = 100 + np.cumsum(rng.normal(0, 1, len(index)))
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 0.5, len(index)),
+        "High": close + 2,
+        "Low": close - 2,
+        "Close": close,
+        "Volume": rng.integers(1_000, 10_000, len(index)).astype(float),
+    }, index=index)
+
+
+def _reference(bars, rule, offset=None):
+    """
+    Resamples with pandas, labelling each bar with the start of its period and dropping empty periods.
+    """
+    resampled = bars.resample(rule).agg(resample.OHLCV_AGGREGATION).dropna(subset=["Open"])
+    if offset is not None:
+        resampled.index = resampled.index - offset
+    resampled.index.name = "Date"
+    return resampled
+
+
+@pytest.mark.parametrize("timespan, rule, offset", [
+    ("week", "W-SAT", pd.Timedelta(days=6)),
+    ("month", "MS", None),
+    ("quarter", "QS", None),
+    ("year", "YS", None),
+])
+def test_resample_matches_pandas(timespan, rule, offset):
+    bars = _daily_bars()
+
+    expected = _reference(bars, rule, offset)
+
+    pd.testing.assert_frame_equal(resample.resample_bars(bars, timespan), expected, check_freq=False)
+
+
+def test_hourly_bars_match_pandas():
+    index = pd.date_range("2024-01-02 09:30", "2024-01-02 15:59", freq="min", name="Date")
+    index = index.append(pd.date_range("2024-01-03 09:30", "2024-01-03 15:59", freq="min", name="Date"))
+    rng = np.random.default_rng(1)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, len(index)))
+    bars = pd.DataFrame(
+        {"Open": close, "High": close + 0.1, "Low": close - 0.1, "Close": close, "Volume": 10.0}, index=index
+    )
+
+    expected = _reference(bars, "h")
+
+    pd.testing.assert_frame_equal(resample.resample_bars(bars, "hour"), expected, check_freq=False)
+
+
+@pytest.mark.parametrize("timespan, start", [
+    ("week", "2024-03-03"),
+    ("month", "2024-03-01"),
+    ("quarter", "2024-01-01"),
+    ("year", "2024-01-01"),
+    ("day", "2024-03-06"),
+])
+def test_period_start(timespan, start):
+    assert resample.period_start("2024-03-06", timespan) == start
+
+
+def test_weekly_bars_are_built_from_daily_bars(monkeypatch):
+    bars = _daily_bars()
+    requested = []
+
+    def fetch(ticker, timespan, multiplier, limit, from_date, to_date, adjusted):
+        requested.append((timespan, from_date))
+        return bars.loc[from_date:to_date], []
+
+    monkeypatch.setattr(data_fetcher, "_fetch_stock_data", fetch)
+    data_fetcher._polygon_requests.cache.clear()
+
+    weekly = data_fetcher.fetch_stock_data("AAPL", "week", from_date="2023-03-08", to_date="2024-03-15")
+
+    # The daily bars start on the Sunday of the first week so that its bar is complete
+    assert requested == [("day", "2023-03-05")]
+    pd.testing.assert_frame_equal(
+        weekly, resample.resample_bars(bars.loc["2023-03-05":], "week"), check_freq=False
+    )
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+import indicators.compute as compute
+import indicators.rules as rules
+import indicators.screener as screener
+from benchmarks.common import random_walk_bars
+
+
+@pytest.mark.parametrize("rule", [
+    "__import__('os').system('true')",
+    "Close.__class__",
+    "SMA(Close) > 1",
+    "open('x') > 1",
+    "[Close][0] > 1",
+    "UNKNOWN(3) > 1",
+    "RSI(14) <",
+])
+def test_unsafe_or_invalid_rules_are_rejected(rule):
+    with pytest.raises(ValueError):
+        rules.parse_rule(rule)
+
+
+def test_rule_matches_the_compute_functions():
+    data = random_walk_bars(400, seed=12)
+    tree = rules.parse_rule("30 < rsi(14) < 70 and not Close > SMA(50) or MACD_HIST(12, 26, 9) > 0")
+
+    matches, terms = rules.evaluate_rule(tree, data)
+
+    rsi = compute.calculate_rsi(data, 14)
+    sma = compute.calculate_sma(data, 50)
+    histogram = compute.calculate_macd(data, 12, 26, 9)[2]
+    expected = ((rsi > 30) & (rsi < 70) & ~(data["Close"] > sma)) | (histogram > 0)
+    pd.testing.assert_series_equal(matches, expected, check_names=False)
+    assert list(terms) == ["RSI(14)", "Close", "SMA(50)", "MACD_HIST(12, 26, 9)"]
+    assert rules.rule_indicators(tree) == {"rsi", "sma", "macd"}
+
+
+@pytest.fixture
+def universe(monkeypatch):
+    """
+    Serves synthetic bars for 80 tickers, and a fetch error for the ticker FAIL.
+    """
+    def fetch_stock_data(ticker, timespan="day", from_date=None, errors=None):
+        if ticker == "FAIL":
+            errors.append("Error fetching data: 404")
+            return pd.DataFrame()
+        return random_walk_bars(300, seed=int(ticker[1:]))
+
+    monkeypatch.setattr(screener.fetch, "fetch_stock_data", fetch_stock_data)
+    return [f"T{number}" for number in range(80)] + ["FAIL"]
+
+
+def test_pool_and_inline_screens_agree(universe):
+    rule = "RSI(14) < 50 and Close > SMA(20)"
+
+    inline, inline_errors = screener.screen(universe, rule, processes=1)
+    pooled, pooled_errors = screener.screen(universe, rule, processes=2)
+
+    pd.testing.assert_frame_equal(pooled, inline)
+    assert inline_errors == pooled_errors == {"FAIL": "Error fetching data: 404"}
+    assert 0 < len(inline) < 80
+    assert list(inline.columns) == ["Date", "RSI(14)", "Close", "SMA(20)"]
+
+    # Every match holds on the ticker's last bar
+    for ticker, row in inline.iterrows():
+        data = random_walk_bars(300, seed=int(ticker[1:]))
+        assert row["RSI(14)"] == pytest.approx(compute.calculate_rsi(data, 14).iloc[-1])
+        assert row["RSI(14)"] < 50 and row["Close"] > row["SMA(20)"]
+
@@ -0,0 +1,83 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import indicators.calculations as calculations
+import indicators.streaming as streaming
+from benchmarks.common import random_walk_bars
+
+
+# Streaming indicator and the batch function it must agree with
+CASES = {
+    "sma": (streaming.StreamingSMA, calculations.calculate_sma),
+    "ema": (streaming.StreamingEMA, calculations.calculate_ema),
+    "rsi": (streaming.StreamingRSI, calculations.calculate_rsi),
+    "macd": (streaming.StreamingMACD, calculations.calculate_macd),
+    "adx": (streaming.StreamingADX, calculations.calculate_adx),
+    "atr": (streaming.StreamingATR, calculations.calculate_atr),
+    "bollinger bands": (streaming.StreamingBollingerBands, calculations.calculate_bollinger_bands),
+    "obv": (streaming.StreamingOBV, calculations.calculate_obv),
+    "dmi": (streaming.StreamingDMI, calculations.calculate_dmi),
+    "parabolic sar": (streaming.StreamingParabolicSAR, calculations.calculate_parabolic_sar),
+    "vroc": (streaming.StreamingVROC, calculations.calculate_vroc),
+}
+
+
+def _rows(data):
+    columns = ["Open", "High", "Low", "Close", "Volume"]
+    return [dict(zip(columns, row)) for row in zip(*(data[column].tolist() for column in columns))]
+
+
+def _batch_columns(result):
+    """
+    Returns the outputs of a batch indicator function as a list of arrays.
+    """
+    if isinstance(result, tuple):
+        return [np.asarray(series, dtype=float) for series in result]
+    return [np.asarray(result, dtype=float)]
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_streaming_matches_batch(name):
+    data = random_walk_bars(300, seed=4)
+    indicator_class, function = CASES[name]
+
+    indicator = indicator_class()
+    values = [indicator.update(bar) for bar in _rows(data)]
+    streamed = np.array(values, dtype=float).reshape(len(values), -1).T
+
+    for actual, expected in zip(streamed, _batch_columns(function(data))):
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("name", ["rsi", "atr", "dmi", "adx"])
+def test_streaming_wilder_matches_batch(name):
+    data = random_walk_bars(300, seed=6)
+    indicator_class, function = CASES[name]
+
+    indicator = indicator_class(14, "wilder")
+    values = [indicator.update(bar) for bar in _rows(data)]
+    streamed = np.array(values, dtype=float).reshape(len(values), -1).T
+
+    for actual, expected in zip(streamed, _batch_columns(function(data, 14, "wilder"))):
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_snapshot_restores_the_state():
+    data = random_walk_bars(200, seed=5)
+    rows = _rows(data)
+
+    engine = streaming.StreamingIndicatorEngine.from_names(list(CASES))
+    engine.warm_up(data.iloc[:150])
+    state = json.loads(json.dumps(engine.snapshot()))
+
+    restored = streaming.StreamingIndicatorEngine.from_names(list(CASES)).restore(state)
+    for bar in rows[150:]:
+        assert restored.update(bar) == engine.update(bar)
+
+
+def test_unknown_names_are_ignored():
+    engine = streaming.StreamingIndicatorEngine.from_names(["SMA", "unknown"])
+
+    assert list(engine.indicators) == ["sma"]
+    assert engine.warm_up(pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])) == {}
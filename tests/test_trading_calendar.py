@@ -0,0 +1,51 @@
+from datetime import date
+import pytest
+import indicators.plot as plot
+import polygon.trading_calendar as trading_calendar
+
+
+def test_holidays_match_the_published_nyse_calendars():
+    assert trading_calendar.nyse_holidays(2024) == {
+        date(2024, 1, 1), date(2024, 1, 15), date(2024, 2, 19), date(2024, 3, 29), date(2024, 5, 27),
+        date(2024, 6, 19), date(2024, 7, 4), date(2024, 9, 2), date(2024, 11, 28), date(2024, 12, 25),
+    }
+
+    # New Year's Day 2022 fell on a Saturday and was not observed, Juneteenth and Christmas moved to Monday
+    assert trading_calendar.nyse_holidays(2022) == {
+        date(2022, 1, 17), date(2022, 2, 21), date(2022, 4, 15), date(2022, 5, 30), date(2022, 6, 20),
+        date(2022, 7, 4), date(2022, 9, 5), date(2022, 11, 24), date(2022, 12, 26),
+    }
+    assert trading_calendar.is_trading_day(date(2021, 12, 31))
+
+
+def test_trading_days_back_skips_weekends_and_holidays():
+    # Good Friday 2024 and the weekend around it are skipped
+    assert trading_calendar.trading_days_back(date(2024, 4, 2), 3) == date(2024, 3, 28)
+    assert trading_calendar.trading_days_back(date(2024, 3, 30), 1) == date(2024, 3, 28)
+
+
+@pytest.mark.parametrize("timespan, bars, expected", [
+    ("day", 252, "2024-01-02"),
+    ("minute", 391, "2024-12-30"),
+    ("hour", 7, "2024-12-31"),
+    # Weekly bars start on Sundays, like Polygon's
+    ("week", 2, "2024-12-22"),
+    ("month", 12, "2024-01-01"),
+    ("quarter", 4, "2024-01-01"),
+    ("year", 2, "2023-01-01"),
+])
+def test_start_date_for_bars(timespan, bars, expected):
+    assert trading_calendar.start_date_for_bars(timespan, bars, "2024-12-31") == expected
+
+
+def test_chart_window_adds_the_largest_warmup(monkeypatch):
+    planned = []
+    monkeypatch.setattr(
+        plot.trading_calendar, "start_date_for_bars", lambda timespan, bars: planned.append((timespan, bars))
+    )
+
+    _, visible = plot.plan_chart_window(["RSI", "sma", "None", ""], "day")
+    plot.plan_chart_window([], "week")
+
+    assert visible == 252
+    assert planned == [("day", 252 + 199), ("week", 104)]